@@ -34,6 +34,37 @@ def create_app():
     app.config["SECRET_KEY"] = os.getenv("SECRET_KEY", "dev-secret-key")
     app.config["JWT_SECRET_KEY"] = os.getenv("JWT_SECRET_KEY", "jwt-secret")
 
+    # --- Question cache ---
+    # A local cache only sees this process's writes, so with several workers
+    # (WEB_CONCURRENCY, as read by gunicorn) it stays off unless chosen explicitly.
+    workers = int(os.getenv("WEB_CONCURRENCY") or "1")
+    app.config["QUESTION_CACHE_BACKEND"] = os.getenv(
+        "QUESTION_CACHE_BACKEND", "local" if workers <= 1 else "none"
+    )
+    app.config["QUESTION_CACHE_URL"] = os.getenv("QUESTION_CACHE_URL") or os.getenv("REDIS_URL")
+    app.config["QUESTION_CACHE_SIZE"] = int(os.getenv("QUESTION_CACHE_SIZE", "2048"))
+    app.config["QUESTION_CACHE_TTL"] = int(os.getenv("QUESTION_CACHE_TTL", "300"))
+
+    # --- Hot feed ranking (decayed by `flask decay-hot-scores`) ---
+    app.config["HOT_HALF_LIFE_HOURS"] = float(os.getenv("HOT_HALF_LIFE_HOURS", "24"))
+
+    # --- Write-behind vote buffer (off by default; see services/vote_buffer.py) ---
+    app.config["VOTE_BUFFER_ENABLED"] = os.getenv("VOTE_BUFFER_ENABLED", "false").lower() in ("1", "true", "yes")
+    app.config["VOTE_BUFFER_FLUSH_MS"] = int(os.getenv("VOTE_BUFFER_FLUSH_MS", "200"))
+    app.config["VOTE_BUFFER_MAX_PENDING"] = int(os.getenv("VOTE_BUFFER_MAX_PENDING", "10000"))
+
+    # --- Notification outbox (off by default; drained by `flask notifications-worker`) ---
+    app.config["NOTIFICATION_OUTBOX_ENABLED"] = os.getenv("NOTIFICATION_OUTBOX_ENABLED", "false").lower() in ("1", "true", "yes")
+    app.config["NOTIFICATION_WORKER_BATCH"] = int(os.getenv("NOTIFICATION_WORKER_BATCH", "100"))
+    app.config["NOTIFICATION_WORKER_POLL_MS"] = int(os.getenv("NOTIFICATION_WORKER_POLL_MS", "500"))
+    app.config["NOTIFICATION_MAX_ATTEMPTS"] = int(os.getenv("NOTIFICATION_MAX_ATTEMPTS", "5"))
+
+    # --- Similar-question index (built by `flask similarity-rebuild`) ---
+    app.config["SIMILARITY_INDEX_PATH"] = os.getenv(
+        "SIMILARITY_INDEX_PATH",
+        os.path.join(os.path.abspath(os.path.dirname(__file__)), "..", "instance", "similarity"),
+    )
+
     db.init_app(app)
     migrate.init_app(app, db)
     jwt.init_app(app)
@@ -45,6 +76,8 @@ def create_app():
             "https://moringadesk-gcvu.onrender.com",
             "https://moringadesk-gteo.onrender.com",
         ],
+        # Lets processes without client connections (the notifications worker) emit.
+        message_queue=os.getenv("SOCKETIO_MESSAGE_QUEUE"),
     )
     oauth.init_app(app)
     app.config.setdefault(
@@ -53,6 +86,10 @@ def create_app():
     )
     register_oauth_clients(app)
 
+    from .commands import register_commands
+
+    register_commands(app)
+
     # --- CORS ---
     CORS(
         app,
@@ -94,6 +131,19 @@ def create_app():
     app.register_blueprint(profile_bp, url_prefix="/profile")
     app.register_blueprint(blog_bp, url_prefix="/blog")
 
+    # --- v2 surface: the same views, answered with the compact envelope ---
+    from .utils.envelope import V2_BLUEPRINT_PREFIX
+
+    for blueprint, prefix in (
+        (problems_bp, "/problems"),
+        (solutions_bp, "/solutions"),
+        (tags_bp, "/tags"),
+        (notifications_bp, "/notifications"),
+    ):
+        app.register_blueprint(
+            blueprint, url_prefix=f"/v2{prefix}", name=f"{V2_BLUEPRINT_PREFIX}{blueprint.name}"
+        )
+
     # --- WebSocket events ---
     try:
         from . import events  # noqa: F401
@@ -0,0 +1,118 @@
+import sys
+
+import click
+
+
+def register_commands(app):
+    @app.cli.command("reconcile-counters")
+    @click.option("--dry-run", is_flag=True, help="Report drift without repairing it.")
+    def reconcile_counters(dry_run):
+        """Recompute engagement and unread-notification counters from source rows."""
+        from .services.engagement_counters import EngagementCounters
+        from .services.unread_counters import UnreadCounters
+
+        drift = EngagementCounters.reconcile(dry_run=dry_run)
+        users = UnreadCounters.reconcile(dry_run=dry_run)
+        verb = "Found" if dry_run else "Repaired"
+        click.echo(
+            f"{verb} drift on {drift['questions']} question(s) and {drift['solutions']} solution(s)."
+        )
+        click.echo(f"{verb} unread-notification drift on {users} user(s).")
+
+    @app.cli.command("decay-hot-scores")
+    @click.option(
+        "--recompute",
+        is_flag=True,
+        help="Rebuild every score from the engagement counters (backfill after upgrading).",
+    )
+    def decay_hot_scores(recompute):
+        """Decay question hot scores by the time elapsed since the last run."""
+        from .services.hot_ranking import HotRanking
+
+        if recompute:
+            count = HotRanking.recompute()
+            click.echo(f"Recomputed hot scores for {count} question(s).")
+            return
+        run = HotRanking.decay()
+        click.echo(f"Decayed {run.questions_updated} question(s) by a factor of {run.factor:.4f}.")
+
+    @app.cli.command("search-rebuild")
+    def search_rebuild():
+        """Rebuild the question full-text search index."""
+        from .services.search_service import SearchService
+
+        count = SearchService.rebuild()
+        click.echo(f"Indexed {count} question(s) with the {SearchService.backend().name} backend.")
+
+    @app.cli.command("similarity-rebuild")
+    def similarity_rebuild():
+        """Rebuild the similar-question TF-IDF index and save it to disk."""
+        from flask import current_app
+
+        from .services.similarity_service import SimilarityService
+
+        count = SimilarityService.rebuild()
+        path = current_app.config.get("SIMILARITY_INDEX_PATH") or "memory only"
+        click.echo(f"Indexed {count} question(s) for similarity ({path}).")
+
+    @app.cli.command("import-qa")
+    @click.argument("path", type=click.Path(allow_dash=True, dir_okay=False))
+    @click.option("--format", "fmt", type=click.Choice(["json", "ndjson", "csv"]), help="Defaults to the file extension.")
+    @click.option("--chunk-size", default=500, show_default=True, help="Rows per transaction.")
+    @click.option("--default-author", help="Email of the user credited when a row names no known author.")
+    def import_qa(path, fmt, chunk_size, default_author):
+        """Bulk-import historical questions, solutions and tags (no notifications)."""
+        from .models import User
+        from .services.qa_import import QAImporter, format_for_filename
+
+        fmt = fmt or format_for_filename(path)
+        if fmt is None:
+            raise click.UsageError("Cannot tell the format from the file name; pass --format.")
+        default_author_id = None
+        if default_author:
+            user = User.query.filter_by(email=default_author).first()
+            if user is None:
+                raise click.BadParameter(f"no user with email {default_author}", param_hint="--default-author")
+            default_author_id = user.id
+
+        # newline="" lets the csv module see quoted line breaks as data.
+        stream = sys.stdin if path == "-" else open(path, encoding="utf-8", newline="")
+        with stream:
+            report = QAImporter.run(stream, fmt, chunk_size=chunk_size, default_author_id=default_author_id)
+
+        click.echo(
+            f"Imported {report['questions']} question(s), {report['solutions']} solution(s) and "
+            f"{report['tags_created']} new tag(s) in {report['seconds']}s "
+            f"({report['rows_per_second'] or 0} rows/s)."
+        )
+        for error in report["errors"]:
+            click.echo(f"  line {error['line']}: {error['error']}", err=True)
+        if report["error_count"] > len(report["errors"]):
+            click.echo(f"  ... and {report['error_count'] - len(report['errors'])} more error(s)", err=True)
+        if report["error_count"]:
+            raise SystemExit(1)
+
+    @app.cli.command("notifications-worker")
+    @click.option("--batch-size", type=int, help="Events per transaction (default NOTIFICATION_WORKER_BATCH).")
+    @click.option("--poll-ms", type=int, help="Idle poll interval (default NOTIFICATION_WORKER_POLL_MS).")
+    @click.option("--once", is_flag=True, help="Drain the events that are due, then exit.")
+    def notifications_worker(batch_size, poll_ms, once):
+        """Create notifications and push unread counts from the notification outbox."""
+        from .services.notification_outbox import NotificationOutbox
+
+        def on_batch(stats):
+            click.echo(
+                f"Processed {stats['processed']} event(s), {stats['failed']} failed, {stats['skipped']} skipped, "
+                f"notified {stats['notified']} user(s); lag max {stats['max_lag_seconds']:.3f}s "
+                f"mean {stats['mean_lag_seconds']:.3f}s."
+            )
+
+        try:
+            NotificationOutbox.run(batch_size=batch_size, poll_ms=poll_ms, once=once, on_batch=on_batch)
+        except KeyboardInterrupt:
+            pass
+        metrics = NotificationOutbox.metrics()
+        click.echo(
+            f"Outbox: {metrics['pending']} pending (oldest {metrics['oldest_pending_seconds']:.1f}s), "
+            f"{metrics['failed']} failed."
+        )
@@ -14,6 +14,8 @@ from .report import Report
 from .audit_log import AuditLog
 from .blog_post import BlogPost
 from .feedback import Feedback
+from .hot_score_decay import HotScoreDecay
+from .notification_event import NotificationEvent
 
 __all__ = [
     "User",
@@ -32,4 +34,6 @@ __all__ = [
     "AuditLog",
     "BlogPost",
     "Feedback",
+    "HotScoreDecay",
+    "NotificationEvent",
 ]
@@ -10,7 +10,11 @@ class Follow(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
     # Unique constraint on user_id and question_id
-    __table_args__ = (db.UniqueConstraint('user_id', 'question_id', name='unique_user_question_follow'),)
+    __table_args__ = (
+        db.UniqueConstraint('user_id', 'question_id', name='unique_user_question_follow'),
+        # A question's followers, for the new-answer fan-out
+        db.Index('ix_follows_question_id_user_id', 'question_id', 'user_id'),
+    )
     
     def to_dict(self):
         """Convert follow to dictionary"""
@@ -0,0 +1,22 @@
+from datetime import datetime
+
+from .. import db
+
+
+class HotScoreDecay(db.Model):
+    """One run of the hot-score decay job; the latest row anchors the next run."""
+
+    __tablename__ = "hot_score_decays"
+
+    id = db.Column(db.Integer, primary_key=True)
+    ran_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False, index=True)
+    factor = db.Column(db.Float, nullable=False)
+    questions_updated = db.Column(db.Integer, nullable=False, default=0)
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "ran_at": self.ran_at.isoformat() if self.ran_at else None,
+            "factor": self.factor,
+            "questions_updated": self.questions_updated,
+        }
@@ -21,3 +21,14 @@ class Notification(db.Model):
             'is_read': self.is_read,
             'created_at': self.created_at.isoformat() if self.created_at else None
         }
+
+
+# Unread counts and mark-all-read filter on (user_id, is_read); the inbox pages
+# newest first, so its index matches ORDER BY created_at DESC, id DESC.
+db.Index('ix_notifications_user_id_is_read', Notification.user_id, Notification.is_read)
+db.Index(
+    'ix_notifications_user_id_created_at_id',
+    Notification.user_id,
+    Notification.created_at.desc(),
+    Notification.id.desc(),
+)
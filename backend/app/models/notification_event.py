@@ -0,0 +1,39 @@
+from datetime import datetime
+
+from .. import db
+
+
+class NotificationEvent(db.Model):
+    """A domain event waiting in the notification outbox (see NotificationOutbox).
+
+    Rows are written in the same transaction as the change they describe and
+    deleted by the worker once their notifications are committed. An event that
+    keeps failing is retried with backoff until it is marked ``failed_at``.
+    """
+
+    __tablename__ = "notification_events"
+    __table_args__ = (
+        # The worker claims due events in order: WHERE available_at <= now ORDER BY available_at, id
+        db.Index("ix_notification_events_available_at_id", "available_at", "id"),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    kind = db.Column(db.String(40), nullable=False)  # 'answer_created', 'vote_cast'
+    payload = db.Column(db.JSON, nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    available_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    attempts = db.Column(db.Integer, nullable=False, default=0, server_default="0")
+    last_error = db.Column(db.Text)
+    failed_at = db.Column(db.DateTime)
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "kind": self.kind,
+            "payload": self.payload,
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+            "available_at": self.available_at.isoformat() if self.available_at else None,
+            "attempts": self.attempts,
+            "last_error": self.last_error,
+            "failed_at": self.failed_at.isoformat() if self.failed_at else None,
+        }
@@ -3,6 +3,12 @@ from datetime import datetime
 
 class Question(db.Model):
     __tablename__ = 'questions'
+    __table_args__ = (
+        # Serves the newest-first feed and its keyset cursor
+        db.Index('ix_questions_created_at_id', 'created_at', 'id'),
+        # Serves sort=hot and its keyset cursor
+        db.Index('ix_questions_hot_score_id', 'hot_score', 'id'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
@@ -11,6 +17,15 @@ class Question(db.Model):
     problem_type = db.Column(db.String(20), nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    # Denormalized engagement counters, maintained by EngagementCounters
+    solutions_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    follows_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    vote_total = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    upvotes_total = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    downvotes_total = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    # Time-decayed activity, maintained by HotRanking; starts at a new question's own weight
+    hot_score = db.Column(db.Float, nullable=False, default=1.0, server_default='0')
     
     # Relationships
     solutions = db.relationship('Solution', backref='question', lazy=True, cascade='all, delete-orphan')
@@ -38,14 +53,11 @@ class Question(db.Model):
             'created_at': self.created_at.isoformat() if self.created_at else None,
             'updated_at': self.updated_at.isoformat() if self.updated_at else None,
             'author': self.author.to_dict() if self.author else None,
-            'solutions_count': len(self.solutions),
+            'solutions_count': self.solutions_count or 0,
             'tags': [tag.to_dict() for tag in self.tags],
-            'follows_count': len(self.follows)
+            'follows_count': self.follows_count or 0
         }
     
     def get_vote_count(self):
         """Get total vote count for all solutions"""
-        total_votes = 0
-        for solution in self.solutions:
-            total_votes += solution.get_vote_count()
-        return total_votes
\ No newline at end of file
+        return self.vote_total or 0
\ No newline at end of file
@@ -7,8 +7,12 @@ class QuestionTag(db.Model):
     question_id = db.Column(db.Integer, db.ForeignKey('questions.id'), nullable=False)
     tag_id = db.Column(db.Integer, db.ForeignKey('tags.id'), nullable=False)
     
-    # Unique constraint on question_id and tag_id
-    __table_args__ = (db.UniqueConstraint('question_id', 'tag_id', name='unique_question_tag'),)
+    __table_args__ = (
+        # Unique constraint on question_id and tag_id
+        db.UniqueConstraint('question_id', 'tag_id', name='unique_question_tag'),
+        # Serves tag filters and per-tag counts without touching the table
+        db.Index('ix_question_tags_tag_id_question_id', 'tag_id', 'question_id'),
+    )
     
     def to_dict(self):
         """Convert question_tag to dictionary"""
@@ -9,8 +9,12 @@ class RelatedQuestion(db.Model):
     related_question_id = db.Column(db.Integer, db.ForeignKey('questions.id'), nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
-    # Unique constraint on question_id and related_question_id
-    __table_args__ = (db.UniqueConstraint('question_id', 'related_question_id', name='unique_related_question'),)
+    # Unique constraint on question_id and related_question_id; the second index
+    # serves lookups from the other end of a link.
+    __table_args__ = (
+        db.UniqueConstraint('question_id', 'related_question_id', name='unique_related_question'),
+        db.Index('ix_related_questions_related_question_id_question_id', 'related_question_id', 'question_id'),
+    )
     
     def to_dict(self):
         """Convert related_question to dictionary"""
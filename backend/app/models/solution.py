@@ -3,6 +3,11 @@ from datetime import datetime
 
 class Solution(db.Model):
     __tablename__ = 'solutions'
+    __table_args__ = (
+        # Serve a thread's solutions by score / by date and their keyset cursors
+        db.Index('ix_solutions_question_id_score_id', 'question_id', 'score', 'id'),
+        db.Index('ix_solutions_question_id_created_at_id', 'question_id', 'created_at', 'id'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     question_id = db.Column(db.Integer, db.ForeignKey('questions.id'), nullable=False)
@@ -10,23 +15,27 @@ class Solution(db.Model):
     content = db.Column(db.Text, nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    # Denormalized vote counters, maintained by EngagementCounters
+    upvotes = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    downvotes = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    # Net votes (upvotes - downvotes), stored so sort=score is an index scan
+    score = db.Column(db.Integer, nullable=False, default=0, server_default='0')
     
     # Relationships
     votes = db.relationship('Vote', backref='solution', lazy=True, cascade='all, delete-orphan')
     
     def get_vote_count(self):
         """Get net vote count (upvotes - downvotes)"""
-        upvotes = len([v for v in self.votes if v.vote_type == 'up'])
-        downvotes = len([v for v in self.votes if v.vote_type == 'down'])
-        return upvotes - downvotes
+        return self.get_upvotes() - self.get_downvotes()
     
     def get_upvotes(self):
         """Get number of upvotes"""
-        return len([v for v in self.votes if v.vote_type == 'up'])
+        return self.upvotes or 0
     
     def get_downvotes(self):
         """Get number of downvotes"""
-        return len([v for v in self.votes if v.vote_type == 'down'])
+        return self.downvotes or 0
     
     def to_dict(self):
         """Convert solution to dictionary"""
@@ -12,6 +12,8 @@ class User(db.Model):
     role = db.Column(db.String(20), default='student')  # ✅ default student
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    # Unread notifications, maintained by UnreadCounters
+    unread_notifications = db.Column(db.Integer, nullable=False, default=0, server_default='0')
     
     # Relationships
     questions = db.relationship('Question', backref='author', lazy=True)
@@ -1,5 +1,7 @@
+import io
+from datetime import datetime
 from functools import wraps
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response, request, jsonify, stream_with_context
 from flask_jwt_extended import jwt_required, get_jwt_identity
 
 from .. import db
@@ -10,6 +12,14 @@ from ..models.faq import FAQ
 from ..models.report import Report
 from ..models.audit_log import AuditLog
 from ..services import AdminDashboardService, FeedbackService
+from ..services.corpus_export import CorpusExport, parse_since
+from ..services.duplicate_service import DuplicateService
+from ..services.engagement_counters import EngagementCounters
+from ..services.notification_outbox import NotificationOutbox
+from ..services.qa_import import IMPORT_CHUNK_SIZE, IMPORT_FORMATS, QAImporter, format_for_mimetype
+from ..services.question_cache import QuestionCache
+from ..services.search_service import SearchService
+from ..services.similarity_service import SimilarityService
 
 admin_bp = Blueprint("admin", __name__)
 
@@ -56,6 +66,8 @@ def update_user(user_id):
     role = data.get("role")
     if role in ["student", "admin"]:
         user.role = role
+        # Cached question payloads embed their authors.
+        QuestionCache.invalidate_all()
         db.session.commit()
         return jsonify({"message": "User updated successfully", "user": user.to_dict()}), 200
 
@@ -71,6 +83,7 @@ def delete_user(user_id):
         return jsonify({"error": "User not found"}), 404
 
     db.session.delete(user)
+    QuestionCache.invalidate_all()
     db.session.commit()
     return jsonify({"message": "User deleted successfully"}), 200
 
@@ -93,6 +106,66 @@ def get_all_questions():
     }), 200
 
 
+@admin_bp.route("/export", methods=["GET"])
+@jwt_required()
+@admin_required
+def export_corpus():
+    """Stream every question with its solutions as NDJSON.
+
+    ``updated_since`` (ISO 8601) limits the export to rows changed since then;
+    pass the previous response's ``X-Export-Started-At`` for incremental pulls.
+    The body is gzipped when the client accepts it.
+    """
+    updated_since = None
+    if request.args.get("updated_since"):
+        try:
+            updated_since = parse_since(request.args["updated_since"])
+        except ValueError:
+            return jsonify({"error": "updated_since must be an ISO 8601 timestamp"}), 400
+
+    started_at = datetime.utcnow()
+    compress = "gzip" in request.accept_encodings
+    chunks = CorpusExport.iter_chunks(CorpusExport.iter_lines(updated_since), compress=compress)
+    response = Response(stream_with_context(chunks), mimetype="application/x-ndjson")
+    response.headers["X-Export-Started-At"] = started_at.isoformat() + "Z"
+    response.headers["Content-Disposition"] = "attachment; filename=questions.ndjson"
+    response.headers["Cache-Control"] = "no-store"
+    response.vary.add("Accept-Encoding")
+    if compress:
+        response.headers["Content-Encoding"] = "gzip"
+    return response
+
+
+@admin_bp.route("/import", methods=["POST"])
+@jwt_required()
+@admin_required
+def import_corpus():
+    """Bulk-import questions and solutions from the request body.
+
+    The body is read as a stream in JSON, NDJSON (the export format) or CSV,
+    picked by ``?format=`` or the Content-Type. ``default_author`` (an email)
+    credits rows with no known author. Responds with the import report.
+    """
+    fmt = request.args.get("format") or format_for_mimetype(request.mimetype)
+    if fmt not in IMPORT_FORMATS:
+        return jsonify({"error": f"format must be one of: {', '.join(IMPORT_FORMATS)}"}), 400
+    try:
+        chunk_size = int(request.args.get("chunk_size", IMPORT_CHUNK_SIZE))
+    except ValueError:
+        return jsonify({"error": "chunk_size must be an integer"}), 400
+
+    default_author_id = None
+    if request.args.get("default_author"):
+        author = User.query.filter_by(email=request.args["default_author"]).first()
+        if author is None:
+            return jsonify({"error": "default_author does not match a user"}), 400
+        default_author_id = author.id
+
+    stream = io.TextIOWrapper(request.stream, encoding="utf-8", newline="")
+    report = QAImporter.run(stream, fmt, chunk_size=chunk_size, default_author_id=default_author_id)
+    return jsonify(report), 200
+
+
 @admin_bp.route("/questions/<int:question_id>", methods=["DELETE"])
 @jwt_required()
 @admin_required
@@ -101,8 +174,12 @@ def delete_question(question_id):
     if not question:
         return jsonify({"error": "Question not found"}), 404
 
+    SearchService.remove_question(question.id)
+    QuestionCache.invalidate(question.id)
     db.session.delete(question)
     db.session.commit()
+    SimilarityService.remove_question(question_id)
+    DuplicateService.remove_question(question_id)
     return jsonify({"message": "Question deleted successfully"}), 200
 
 
@@ -115,6 +192,7 @@ def delete_solution(solution_id):
     if not solution:
         return jsonify({"error": "Solution not found"}), 404
 
+    EngagementCounters.solution_deleted(solution)
     db.session.delete(solution)
     db.session.commit()
     return jsonify({"message": "Solution deleted successfully"}), 200
@@ -135,6 +213,14 @@ def get_stats():
     }), 200
 
 
+@admin_bp.route("/notifications/outbox", methods=["GET"])
+@jwt_required()
+@admin_required
+def notification_outbox_metrics():
+    """Backlog of the notification outbox: pending and failed events and the oldest pending age."""
+    return jsonify(NotificationOutbox.metrics()), 200
+
+
 @admin_bp.route("/dashboard", methods=["GET"])
 @jwt_required()
 @admin_required
@@ -10,6 +10,7 @@ from flask_jwt_extended import create_access_token, jwt_required, get_jwt_identi
 
 from .. import db, oauth
 from ..models.user import User
+from ..services.question_cache import QuestionCache
 
 
 auth_bp = Blueprint("auth", __name__)
@@ -186,6 +187,7 @@ def _get_or_create_user(name, email):
     if user:
         if name and user.name != name:
             user.name = name
+            QuestionCache.invalidate_all()
         return user, False
 
     user = User(name=name or email.split("@")[0], email=email, role="student")
@@ -5,6 +5,7 @@ from flask_jwt_extended import jwt_required, get_jwt_identity
 
 from ..models import User
 from ..services import BlogService
+from ..utils.http_cache import is_fresh, not_modified, strong_etag, with_validators
 
 blog_bp = Blueprint("blog", __name__)
 
@@ -60,7 +61,18 @@ def get_post(identifier):
     if not post:
         return jsonify({"error": "Post not found"}), 404
     include_body = request.args.get("include", "full") != "summary"
-    return jsonify({"item": post.to_dict(include_body=include_body)}), 200
+
+    # Drafts are only visible to admins, so keep them out of shared caches.
+    private = not post.is_published()
+    etag = strong_etag("post", post.id, post.updated_at, include_body)
+    if is_fresh(etag, post.updated_at):
+        return not_modified(etag, post.updated_at, private=private)
+    return with_validators(
+        (jsonify({"item": post.to_dict(include_body=include_body)}), 200),
+        etag,
+        post.updated_at,
+        private=private,
+    )
 
 
 @blog_bp.route("/posts", methods=["POST"])
@@ -1,6 +1,7 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from ..services import FAQService
+from ..utils.http_cache import is_fresh, not_modified, strong_etag, with_validators
 
 faqs_bp = Blueprint('faqs', __name__)
 
@@ -47,12 +48,17 @@ def create_faq():
 @faqs_bp.route('/<int:faq_id>', methods=['GET'])
 def get_faq(faq_id):
     """Get a single FAQ"""
+    updated_at = FAQService.get_faq_updated_at(faq_id)
+    etag = strong_etag('faq', faq_id, updated_at)
+    if updated_at is not None and is_fresh(etag, updated_at):
+        return not_modified(etag, updated_at)
+
     result = FAQService.get_faq_by_id(faq_id)
     
     if not result:
         return jsonify({'error': 'FAQ not found'}), 404
     
-    return jsonify(result), 200
+    return with_validators((jsonify(result), 200), etag, updated_at)
 
 @faqs_bp.route('/<int:faq_id>', methods=['PUT'])
 @jwt_required()
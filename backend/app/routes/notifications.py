@@ -1,6 +1,7 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from ..services import NotificationService
+from ..utils.envelope import envelope
 
 notifications_bp = Blueprint('notifications', __name__)
 
@@ -14,7 +15,7 @@ def get_notifications():
     unread_only = request.args.get('unread_only', False, type=bool)
     
     result = NotificationService.get_user_notifications(user_id, page, per_page, unread_only)
-    return jsonify(result), 200
+    return envelope(result['items'], result['meta'], legacy=result)
 
 @notifications_bp.route('/unread-count', methods=['GET'])
 @jwt_required()
@@ -22,7 +23,7 @@ def get_unread_count():
     """Get count of unread notifications"""
     user_id = get_jwt_identity()
     result = NotificationService.get_unread_count(user_id)
-    return jsonify(result), 200
+    return envelope(result, legacy=result)
 
 @notifications_bp.route('/<int:notification_id>/read', methods=['PUT'])
 @jwt_required()
@@ -30,7 +31,9 @@ def mark_notification_read(notification_id):
     """Mark a notification as read"""
     user_id = get_jwt_identity()
     result, status_code = NotificationService.mark_notification_read(notification_id, user_id)
-    return jsonify(result), status_code
+    if status_code >= 400:
+        return jsonify(result), status_code
+    return envelope(result, status=status_code, legacy=result)
 
 @notifications_bp.route('/read-all', methods=['PUT'])
 @jwt_required()
@@ -38,4 +41,4 @@ def mark_all_notifications_read():
     """Mark all notifications as read"""
     user_id = get_jwt_identity()
     result, status_code = NotificationService.mark_all_notifications_read(user_id)
-    return jsonify(result), status_code
+    return envelope(result, status=status_code, legacy=result)
@@ -2,24 +2,41 @@ from flask import Blueprint, request, jsonify, current_app
 from flask_jwt_extended import jwt_required, get_jwt_identity
 
 from ..services import QuestionService, SolutionService
+from ..services.field_selection import InvalidFieldSelection
+from ..services.pagination import InvalidCursor
+from ..services.question_service import SORT_ORDERS, TAG_MATCH_MODES
+from ..services.solution_service import SOLUTION_SORTS
+from ..utils.envelope import envelope
+from ..utils.id_list import InvalidIdList, parse_id_list
+from ..utils.http_cache import is_fresh, not_modified, strong_etag, with_validators
 
 problems_bp = Blueprint("problems", __name__)
 
 # ---------- Helpers ----------
+# Each helper takes the canonical data and knows its v1 shape; v2 callers get
+# {"data", "meta"} from utils.envelope instead.
 def ok_item(item, status=200):
     if isinstance(item, dict):
         payload = {"item": item}
         payload.update(item)
     else:
         payload = {"item": item}
-    return jsonify(payload), status
+    return envelope(item, status=status, legacy=payload)
 
 
 def ok_items(items, meta=None, status=200):
     payload = {"items": items, "meta": meta or {}}
     if isinstance(items, list):
         payload["questions"] = items
-    return jsonify(payload), status
+    return envelope(items, meta or {}, status=status, legacy=payload)
+
+
+def ok_wrapped(item, status=200):
+    return envelope(item, status=status, legacy={"item": item})
+
+
+def ok_payload(payload, status=200):
+    return envelope(payload, status=status, legacy=payload)
 
 
 def err(message, status=400):
@@ -30,13 +47,27 @@ def err(message, status=400):
 @problems_bp.route("", methods=["GET"])
 @jwt_required(optional=True)
 def get_problems():
-    """Get paginated list of problems"""
+    """Get paginated list of problems, or the problems named by ``?ids=``"""
+    if "ids" in request.args:
+        return get_problems_by_ids()
+
     page = request.args.get("page", 1, type=int)
     per_page = request.args.get("per_page", 10, type=int)
     problem_type = request.args.get("problem_type")
     search = request.args.get("search")
     created_by = request.args.get("created_by", type=int)
+    cursor = request.args.get("cursor")
     current_user_id = get_jwt_identity()
+    sort = request.args.get("sort", "newest")
+    if sort not in SORT_ORDERS:
+        return err(f"sort must be one of: {', '.join(SORT_ORDERS)}", 400)
+    tag_match = request.args.get("tag_match", "any")
+    if tag_match not in TAG_MATCH_MODES:
+        return err(f"tag_match must be one of: {', '.join(TAG_MATCH_MODES)}", 400)
+    try:
+        tags = QuestionService.parse_tags(request.args.get("tags"))
+    except ValueError as exc:
+        return err(str(exc), 400)
 
     try:
         result = QuestionService.get_questions(
@@ -46,8 +77,23 @@ def get_problems():
             search=search,
             current_user_id=current_user_id,
             created_by=created_by,
+            cursor=cursor,
+            selection=QuestionService.selection(request.args),
+            tags=tags,
+            tag_match=tag_match,
+            sort=sort,
         )
 
+        if isinstance(result, dict) and cursor is not None:
+            items = result.get("items") or []
+            meta = {
+                "per_page": result.get("per_page", per_page),
+                "count": len(items),
+                "next_cursor": result.get("next_cursor"),
+                "has_more": result.get("has_more", False),
+            }
+            return ok_items(items, meta)
+
         if isinstance(result, dict):
             items = result.get("items") or result.get("questions") or []
             meta = {
@@ -65,11 +111,29 @@ def get_problems():
 
         return ok_items([], {"current_page": page, "per_page": per_page, "count": 0})
 
+    except (InvalidCursor, InvalidFieldSelection) as exc:
+        return err(str(exc), 400)
     except Exception:
         current_app.logger.exception("GET /problems failed")
         return err("Internal server error", 500)
 
 
+def get_problems_by_ids():
+    try:
+        ids = parse_id_list(request.args.get("ids"))
+        items, missing = QuestionService.get_questions_by_ids(
+            ids,
+            current_user_id=get_jwt_identity(),
+            selection=QuestionService.selection(request.args),
+        )
+    except (InvalidIdList, InvalidFieldSelection) as exc:
+        return err(str(exc), 400)
+    except Exception:
+        current_app.logger.exception("GET /problems?ids= failed")
+        return err("Internal server error", 500)
+    return ok_items(items, {"count": len(items), "requested": len(ids), "missing": missing})
+
+
 @problems_bp.route("", methods=["POST"])
 @jwt_required()
 def create_problem():
@@ -95,16 +159,91 @@ def create_problem():
         return err("Internal server error", 500)
 
 
+@problems_bp.route("/similar", methods=["GET"])
+@jwt_required(optional=True)
+def find_similar_problems():
+    """Questions similar to a draft title/description (ask dialog)."""
+    title = (request.args.get("title") or "").strip()
+    if not title:
+        return err("title is required", 400)
+    limit = request.args.get("limit", 5, type=int)
+    try:
+        items = QuestionService.find_similar_questions(
+            title,
+            request.args.get("description", ""),
+            limit=limit,
+            current_user_id=get_jwt_identity(),
+        )
+        return ok_items(items, {"count": len(items), "limit": limit})
+    except Exception:
+        current_app.logger.exception("GET /problems/similar failed")
+        return err("Internal server error", 500)
+
+
+@problems_bp.route("/duplicates", methods=["POST"])
+@jwt_required(optional=True)
+def preview_duplicates():
+    """Likely duplicates of a draft question, checked before it is posted."""
+    data = request.get_json(silent=True) or {}
+    title = (data.get("title") or "").strip()
+    if not title:
+        return err("title is required", 400)
+    try:
+        limit = int(data.get("limit", 5))
+    except (TypeError, ValueError):
+        return err("limit must be an integer", 400)
+    try:
+        items = QuestionService.find_duplicate_questions(
+            title,
+            data.get("description") or "",
+            limit=limit,
+            current_user_id=get_jwt_identity(),
+        )
+        return ok_items(items, {"count": len(items), "limit": limit})
+    except Exception:
+        current_app.logger.exception("POST /problems/duplicates failed")
+        return err("Internal server error", 500)
+
+
+@problems_bp.route("/<int:question_id>/similar", methods=["GET"])
+@jwt_required(optional=True)
+def similar_problems(question_id):
+    limit = request.args.get("limit", 5, type=int)
+    try:
+        items = QuestionService.get_similar_questions(
+            question_id, limit=limit, current_user_id=get_jwt_identity()
+        )
+        if items is None:
+            return err("Problem not found", 404)
+        return ok_items(items, {"count": len(items), "limit": limit})
+    except Exception:
+        current_app.logger.exception("GET /problems/%s/similar failed", question_id)
+        return err("Internal server error", 500)
+
+
 @problems_bp.route("/<int:question_id>", methods=["GET"])
 @jwt_required(optional=True)
 def get_problem(question_id):
     """Get a single problem"""
     try:
         current_user_id = get_jwt_identity()
-        result = QuestionService.get_question_by_id(question_id, current_user_id=current_user_id)
+        private = current_user_id is not None
+        selection = QuestionService.selection(request.args, detail=True)
+        # The viewer's unflushed votes are overlaid on the body, so they are part of it.
+        buffered = sorted(SolutionService._buffered_votes(current_user_id).items())
+        validator = QuestionService.cache_validator(question_id)
+        etag = strong_etag("problem", question_id, *validator, current_user_id, buffered, selection.signature)
+        if is_fresh(etag):
+            return not_modified(etag, private=private)
+
+        result = QuestionService.get_question_by_id(
+            question_id, current_user_id=current_user_id, selection=selection, validator=validator
+        )
         if not result:
             return err("Problem not found", 404)
-        return ok_item(result)
+        return with_validators(ok_item(result), etag, private=private)
+    except InvalidFieldSelection as exc:
+        return err(str(exc), 400)
     except Exception:
         current_app.logger.exception("GET /problems/<id> failed")
         return err("Internal server error", 500)
@@ -135,7 +274,7 @@ def delete_problem(question_id):
         if status_code >= 400:
             message = payload.get("error") if isinstance(payload, dict) else "Failed to delete"
             return err(message, status_code)
-        return jsonify(payload), status_code
+        return ok_payload(payload, status_code)
     except Exception:
         current_app.logger.exception("DELETE /problems/<id> failed")
         return err("Internal server error", 500)
@@ -146,15 +285,49 @@ def delete_problem(question_id):
 def list_solutions(question_id):
     page = request.args.get("page", 1, type=int)
     per_page = request.args.get("per_page", 10, type=int)
+    sort = request.args.get("sort", "oldest")
+    if sort not in SOLUTION_SORTS:
+        return err(f"sort must be one of: {', '.join(SOLUTION_SORTS)}", 400)
+    cursor = request.args.get("cursor")
     current_user_id = get_jwt_identity()
+    private = current_user_id is not None
     try:
+        selection = SolutionService.selection(request.args)
+        buffered = sorted(SolutionService._buffered_votes(current_user_id).items())
+        # Every solution write bumps its question's version, so it validates the list too.
+        etag = strong_etag(
+            "solutions",
+            question_id,
+            *QuestionService.cache_validator(question_id),
+            current_user_id,
+            buffered,
+            page,
+            per_page,
+            sort,
+            cursor,
+            selection.signature,
+        )
+        if is_fresh(etag):
+            return not_modified(etag, private=private)
+
         result = SolutionService.get_solutions_by_question(
             question_id,
             page=page,
             per_page=per_page,
             current_user_id=current_user_id,
+            selection=selection,
+            sort=sort,
+            cursor=cursor,
         )
-        return jsonify(result), 200
+        if cursor is not None:
+            meta = {key: result[key] for key in ("per_page", "next_cursor", "has_more")}
+        else:
+            meta = {key: result[key] for key in ("current_page", "pages", "per_page", "total")}
+        return with_validators(
+            envelope(result["items"], meta, legacy=result), etag, private=private
+        )
+    except (InvalidCursor, InvalidFieldSelection) as exc:
+        return err(str(exc), 400)
     except Exception:
         current_app.logger.exception("GET /problems/%s/solutions failed", question_id)
         return err("Internal server error", 500)
@@ -170,7 +343,7 @@ def create_solution(question_id):
         if status_code >= 400:
             message = payload.get("error") if isinstance(payload, dict) else "Unable to create solution"
             return err(message, status_code)
-        return jsonify({"item": payload}), status_code
+        return ok_wrapped(payload, status_code)
     except Exception:
         current_app.logger.exception("POST /problems/%s/solutions failed", question_id)
         return err("Internal server error", 500)
@@ -180,10 +353,16 @@ def create_solution(question_id):
 @jwt_required(optional=True)
 def get_solution(question_id, solution_id):
     current_user_id = get_jwt_identity()
-    result = SolutionService.get_solution_by_id(solution_id, current_user_id=current_user_id)
+    try:
+        selection = SolutionService.selection(request.args)
+    except InvalidFieldSelection as exc:
+        return err(str(exc), 400)
+    result = SolutionService.get_solution_by_id(
+        solution_id, current_user_id=current_user_id, selection=selection
+    )
     if not result or result.get("question_id") != question_id:
         return err("Solution not found", 404)
-    return jsonify({"item": result}), 200
+    return ok_wrapped(result)
 
 
 @problems_bp.route("/<int:question_id>/solutions/<int:solution_id>", methods=["PUT"])
@@ -197,7 +376,7 @@ def update_solution(question_id, solution_id):
         return err(message, status_code)
     if payload.get("question_id") != question_id:
         return err("Solution not found", 404)
-    return jsonify({"item": payload}), status_code
+    return ok_wrapped(payload, status_code)
 
 
 @problems_bp.route("/<int:question_id>/solutions/<int:solution_id>", methods=["DELETE"])
@@ -208,7 +387,7 @@ def delete_solution(question_id, solution_id):
     if status_code >= 400:
         message = payload.get("error") if isinstance(payload, dict) else "Unable to delete solution"
         return err(message, status_code)
-    return jsonify(payload), status_code
+    return ok_payload(payload, status_code)
 
 
 @problems_bp.route("/<int:question_id>/follow", methods=["POST"])
@@ -220,7 +399,7 @@ def follow_problem(question_id):
         if status_code >= 400:
             message = payload.get("error") if isinstance(payload, dict) else "Unable to follow"
             return err(message, status_code)
-        return jsonify(payload), status_code
+        return ok_payload(payload, status_code)
     except Exception:
         current_app.logger.exception("POST /problems/%s/follow failed", question_id)
         return err("Internal server error", 500)
@@ -235,7 +414,7 @@ def unfollow_problem(question_id):
         if status_code >= 400:
             message = payload.get("error") if isinstance(payload, dict) else "Unable to unfollow"
             return err(message, status_code)
-        return jsonify(payload), status_code
+        return ok_payload(payload, status_code)
     except Exception:
         current_app.logger.exception("DELETE /problems/%s/follow failed", question_id)
         return err("Internal server error", 500)
@@ -249,7 +428,7 @@ def link_related(question_id, related_question_id):
         if status_code >= 400:
             message = payload.get("error") if isinstance(payload, dict) else "Unable to link questions"
             return err(message, status_code)
-        return jsonify(payload), status_code
+        return ok_payload(payload, status_code)
     except Exception:
         current_app.logger.exception(
             "POST /problems/%s/related/%s failed", question_id, related_question_id
@@ -1,9 +1,10 @@
 from flask import Blueprint, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from sqlalchemy.orm import joinedload
 
-from ..models import User, Question, Solution
+from ..models import User
 from ..services import QuestionService, SolutionService
+from ..services.loader_profiles import loader_options
+from ..services.serialization_memo import SerializationMemo
 
 profile_bp = Blueprint('profile', __name__)
 
@@ -13,20 +14,10 @@ profile_bp = Blueprint('profile', __name__)
 def get_profile(user_id):
     """Retrieve a user's public profile along with their questions and answers."""
     current_user_id = get_jwt_identity()
+    buffered = SolutionService._buffered_votes(current_user_id)
 
     user = (
-        User.query.options(
-            joinedload(User.questions)
-            .joinedload(Question.tags),
-            joinedload(User.questions)
-            .joinedload(Question.solutions),
-            joinedload(User.questions)
-            .joinedload(Question.follows),
-            joinedload(User.solutions)
-            .joinedload(Solution.votes),
-            joinedload(User.solutions)
-            .joinedload(Solution.author),
-        )
+        User.query.options(*loader_options("profile"))
         .filter_by(id=user_id)
         .first()
     )
@@ -34,17 +25,22 @@ def get_profile(user_id):
     if not user:
         return jsonify({'error': 'User not found'}), 404
 
+    followed_ids = QuestionService._followed_ids([q.id for q in user.questions], current_user_id)
+
     questions = [
-        QuestionService._serialize_question(q, include_answers=False, current_user_id=current_user_id)
+        QuestionService._serialize_question(
+            q, include_answers=False, current_user_id=current_user_id, followed_ids=followed_ids
+        )
         for q in sorted(user.questions, key=lambda item: (item.created_at.timestamp() if item.created_at else 0), reverse=True)
     ]
 
-    answers = [
-        SolutionService._serialize_solution(s, current_user_id=current_user_id)
-        for s in sorted(user.solutions, key=lambda item: (item.created_at.timestamp() if item.created_at else 0), reverse=True)
-    ]
+    answers = SolutionService._serialize_page(
+        sorted(user.solutions, key=lambda item: (item.created_at.timestamp() if item.created_at else 0), reverse=True),
+        current_user_id,
+        buffered=buffered,
+    )
 
-    profile_data = user.to_dict()
+    profile_data = dict(SerializationMemo.user(user))
     profile_data.update({
         'questions_count': len(questions),
         'answers_count': len(answers),
@@ -3,6 +3,8 @@ from flask import Blueprint, request, jsonify, current_app
 from flask_jwt_extended import jwt_required, get_jwt_identity
 
 from ..services import SolutionService, VoteService
+from ..services.field_selection import InvalidFieldSelection
+from ..utils.id_list import InvalidIdList, parse_id_list
 
 
 solutions_bp = Blueprint("solutions", __name__)
@@ -19,16 +21,41 @@ def err(message, status=400):
     return jsonify({"error": message}), status
 
 
+@solutions_bp.route("", methods=["GET"])
+@jwt_required(optional=True)
+def get_solutions_by_ids():
+    """Get the solutions named by ``?ids=``, in that order"""
+    try:
+        ids = parse_id_list(request.args.get("ids"))
+        items, missing = SolutionService.get_solutions_by_ids(
+            ids,
+            current_user_id=get_jwt_identity(),
+            selection=SolutionService.selection(request.args),
+        )
+        return ok(items, {"count": len(items), "requested": len(ids), "missing": missing})
+    except (InvalidIdList, InvalidFieldSelection) as exc:
+        return err(str(exc), 400)
+    except Exception:
+        current_app.logger.exception("GET /solutions?ids= failed")
+        return err("Internal server error", 500)
+
+
 @solutions_bp.route("/<int:solution_id>", methods=["GET"])
 @jwt_required(optional=True)
 def get_solution(solution_id):
     """Get a single solution"""
     try:
         current_user_id = get_jwt_identity()
-        result = SolutionService.get_solution_by_id(solution_id, current_user_id=current_user_id)
+        result = SolutionService.get_solution_by_id(
+            solution_id,
+            current_user_id=current_user_id,
+            selection=SolutionService.selection(request.args),
+        )
         if not result:
             return err("Solution not found", 404)
         return ok(result)
+    except InvalidFieldSelection as exc:
+        return err(str(exc), 400)
     except Exception:
         current_app.logger.exception("GET /solutions/%s failed", solution_id)
         return err("Internal server error", 500)
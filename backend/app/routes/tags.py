@@ -1,10 +1,16 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, current_app
+from flask_jwt_extended import jwt_required, get_jwt_identity
 from sqlalchemy import func
 from marshmallow import ValidationError
 
 from .. import db
 from ..models.tag import Tag
 from ..schemas.tag_schema import TagSchema
+from ..services import QuestionService
+from ..services.field_selection import InvalidFieldSelection
+from ..services.pagination import InvalidCursor
+from ..utils.envelope import envelope
+from ..utils.http_cache import is_fresh, not_modified, strong_etag, with_validators
 
 
 tags_bp = Blueprint('tags', __name__)
@@ -27,6 +33,12 @@ def list_tags():
     except Exception:
         page, per_page = 1, 20
 
+    # Tags are only ever added, so (count, max id) changes exactly when the set does.
+    tag_count, max_id = db.session.query(func.count(Tag.id), func.max(Tag.id)).one()
+    etag = strong_etag('tags', tag_count, max_id, q, page, per_page)
+    if is_fresh(etag):
+        return not_modified(etag)
+
     query = Tag.query
     if q:
         like = f"%{q.lower()}%"
@@ -41,14 +53,50 @@ def list_tags():
         'per_page': pagination.per_page,
         'total': pagination.total,
     }
-    return jsonify({
+    return with_validators(envelope(items, meta, legacy={
         'items': items,
         'tags': items,
         'meta': meta,
         'page': pagination.page,
         'per_page': pagination.per_page,
         'total': pagination.total,
-    })
+    }), etag)
+
+
+@tags_bp.get('/<string:name>/questions')
+@jwt_required(optional=True)
+def list_tag_questions(name):
+    """Questions carrying a tag, newest first, with keyset pagination.
+    Query params:
+      - cursor: ``meta.next_cursor`` from the previous page (omit for the first)
+      - per_page: items per page (default 20, max 100)
+    """
+    per_page = request.args.get('per_page', 20, type=int)
+    try:
+        result = QuestionService.get_questions_by_tag(
+            name,
+            cursor=request.args.get('cursor', ''),
+            per_page=per_page,
+            current_user_id=get_jwt_identity(),
+            selection=QuestionService.selection(request.args),
+        )
+    except (InvalidCursor, InvalidFieldSelection) as exc:
+        return jsonify({'error': str(exc)}), 400
+    except Exception:
+        current_app.logger.exception('GET /tags/%s/questions failed', name)
+        return jsonify({'error': 'Internal server error'}), 500
+
+    if result is None:
+        return jsonify({'error': 'Tag not found'}), 404
+    items = result['items']
+    meta = {
+        'tag': name.strip().lower(),
+        'per_page': result['per_page'],
+        'count': len(items),
+        'next_cursor': result['next_cursor'],
+        'has_more': result['has_more'],
+    }
+    return envelope(items, meta, legacy={'items': items, 'questions': items, 'meta': meta})
 
 
 @tags_bp.post('')
@@ -65,9 +113,9 @@ def create_tag():
     name = validated['name'].strip().lower()
     existing = Tag.query.filter(func.lower(Tag.name) == name).first()
     if existing:
-        return jsonify({'tag': existing.to_dict()}), 200
+        return envelope(existing.to_dict(), legacy={'tag': existing.to_dict()})
 
     tag = Tag(name=name)
     db.session.add(tag)
     db.session.commit()
-    return jsonify({'tag': tag.to_dict()}), 201
+    return envelope(tag.to_dict(), status=201, legacy={'tag': tag.to_dict()})
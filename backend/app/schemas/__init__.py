@@ -8,6 +8,7 @@ from .notification_schema import NotificationSchema
 from .subscription_schema import SubscriptionCreateSchema
 from .blog_post_schema import BlogPostSchema, BlogPostCreateSchema
 from .feedback_schema import FeedbackSchema, FeedbackCreateSchema, FeedbackUpdateSchema
+from .import_schema import QAImportQuestionSchema, QAImportSolutionSchema
 
 __all__ = [
     'UserSchema', 'UserRegistrationSchema', 'UserLoginSchema',
@@ -19,5 +20,6 @@ __all__ = [
     'NotificationSchema',
     'SubscriptionCreateSchema',
     'BlogPostSchema', 'BlogPostCreateSchema',
-    'FeedbackSchema', 'FeedbackCreateSchema', 'FeedbackUpdateSchema'
+    'FeedbackSchema', 'FeedbackCreateSchema', 'FeedbackUpdateSchema',
+    'QAImportQuestionSchema', 'QAImportSolutionSchema'
 ]
@@ -0,0 +1,30 @@
+from marshmallow import EXCLUDE, Schema, fields, validate
+
+
+class QAImportSolutionSchema(Schema):
+    class Meta:
+        unknown = EXCLUDE
+
+    content = fields.Str(required=True, validate=validate.Length(min=1))
+    author_email = fields.Email()
+    user_id = fields.Int()
+    created_at = fields.DateTime()
+    # Standalone solution rows (CSV) point at a question from the same import
+    # by its ``ref``, or at an existing question by id.
+    question_ref = fields.Str()
+    question_id = fields.Int()
+
+
+class QAImportQuestionSchema(Schema):
+    class Meta:
+        unknown = EXCLUDE
+
+    ref = fields.Str()
+    title = fields.Str(required=True, validate=validate.Length(min=1, max=200))
+    description = fields.Str(required=True, validate=validate.Length(min=1))
+    problem_type = fields.Str(required=True, validate=validate.OneOf(['language', 'stage', 'technical', 'logical']))
+    tags = fields.List(fields.Str(validate=validate.Length(min=1, max=50)))
+    author_email = fields.Email()
+    user_id = fields.Int()
+    created_at = fields.DateTime()
+    solutions = fields.List(fields.Nested(QAImportSolutionSchema))
@@ -78,11 +78,14 @@ class AdminDashboardService:
         )
 
         question_query = (
-            QuestionService._base_query()
+            QuestionService._base_query("dashboard")
             .order_by(Question.created_at.desc())
             .limit(limit_questions)
         )
         question_rows = question_query.all()
+        followed_ids = QuestionService._followed_ids(
+            [row.id for row in question_rows], current_user_id
+        )
         serialized_questions = []
         featured_count = 0
         bounty_count = 0
@@ -90,7 +93,10 @@ class AdminDashboardService:
 
         for row in question_rows:
             item = QuestionService._serialize_question(
-                row, include_answers=False, current_user_id=current_user_id
+                row,
+                include_answers=False,
+                current_user_id=current_user_id,
+                followed_ids=followed_ids,
             )
             if item.get("is_featured"):
                 featured_count += 1
@@ -100,12 +106,22 @@ class AdminDashboardService:
                 following_count += 1
             serialized_questions.append(item)
 
-        tag_rows = (
-            db.session.query(Tag.name, func.count(QuestionTag.id).label("count"))
-            .join(QuestionTag, QuestionTag.tag_id == Tag.id)
-            .group_by(Tag.id)
-            .order_by(func.count(QuestionTag.id).desc())
+        # Count on question_tags alone (an index-only scan of tag_id, question_id),
+        # then look up the names of the six winners.
+        tag_counts = (
+            db.session.query(
+                QuestionTag.tag_id.label("tag_id"),
+                func.count(QuestionTag.question_id).label("count"),
+            )
+            .group_by(QuestionTag.tag_id)
+            .order_by(func.count(QuestionTag.question_id).desc())
             .limit(6)
+            .subquery()
+        )
+        tag_rows = (
+            db.session.query(Tag.name, tag_counts.c.count)
+            .join(tag_counts, tag_counts.c.tag_id == Tag.id)
+            .order_by(tag_counts.c.count.desc(), Tag.name.asc())
             .all()
         )
         popular_tags = [
@@ -171,7 +187,7 @@ class AdminDashboardService:
             )
 
         recent_rows = (
-            QuestionService._base_query()
+            QuestionService._base_query("dashboard")
             .order_by(Question.updated_at.desc())
             .limit(5)
             .all()
@@ -182,7 +198,7 @@ class AdminDashboardService:
                 {
                     "id": row.id,
                     "title": row.title,
-                    "answers": len(getattr(row, "solutions", [])),
+                    "answers": row.solutions_count or 0,
                     "updated_at": row.updated_at.isoformat() if row.updated_at else None,
                     "time_ago": AdminDashboardService._format_timeago(row.updated_at),
                 }
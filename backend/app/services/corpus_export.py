@@ -0,0 +1,115 @@
+"""Streaming NDJSON export of the question/solution corpus.
+
+Questions are read with ``yield_per`` (a server-side cursor where the driver
+supports one), and each batch pulls its tags, solutions and authors with one
+``IN`` query per relation, so memory stays bounded by the batch size whatever
+the corpus size. Each line is one question with its solutions embedded.
+
+``updated_since`` selects questions whose own row or any of whose solutions
+changed at or after that time. Votes, answers and follows all touch the
+question row through EngagementCounters, tag edits and answers imported onto
+existing questions touch it explicitly, so the result covers them too.
+Deleted questions are not reported.
+"""
+
+import json
+import zlib
+from datetime import datetime, timezone
+
+from sqlalchemy import exists, or_
+from sqlalchemy.orm import joinedload, selectinload
+
+from ..models import Question, Solution
+
+EXPORT_BATCH_SIZE = 500
+EXPORT_FORMAT_VERSION = 1
+
+
+def _iso(value):
+    return value.isoformat() if value else None
+
+
+def parse_since(raw):
+    """Parse an ISO 8601 ``updated_since`` into naive UTC (how timestamps are stored)."""
+    value = datetime.fromisoformat(raw.strip().replace("Z", "+00:00"))
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+class CorpusExport:
+    @staticmethod
+    def _query(updated_since=None):
+        query = Question.query.options(
+            joinedload(Question.author),
+            selectinload(Question.tags),
+            selectinload(Question.solutions).joinedload(Solution.author),
+        )
+        if updated_since is not None:
+            changed_solution = exists().where(
+                Solution.question_id == Question.id, Solution.updated_at >= updated_since
+            )
+            query = query.filter(or_(Question.updated_at >= updated_since, changed_solution))
+        return query.order_by(Question.id)
+
+    @staticmethod
+    def _record(question):
+        solutions = sorted(question.solutions, key=lambda solution: solution.id)
+        return {
+            "v": EXPORT_FORMAT_VERSION,
+            "id": question.id,
+            "title": question.title,
+            "description": question.description,
+            "problem_type": question.problem_type,
+            "user_id": question.user_id,
+            "author_name": question.author.name if question.author else None,
+            "created_at": _iso(question.created_at),
+            "updated_at": _iso(question.updated_at),
+            "tags": sorted(tag.name for tag in question.tags),
+            "solutions_count": question.solutions_count,
+            "follows_count": question.follows_count,
+            "upvotes_total": question.upvotes_total,
+            "downvotes_total": question.downvotes_total,
+            "vote_total": question.vote_total,
+            "solutions": [
+                {
+                    "id": solution.id,
+                    "user_id": solution.user_id,
+                    "author_name": solution.author.name if solution.author else None,
+                    "content": solution.content,
+                    "created_at": _iso(solution.created_at),
+                    "updated_at": _iso(solution.updated_at),
+                    "upvotes": solution.get_upvotes(),
+                    "downvotes": solution.get_downvotes(),
+                    "vote_count": solution.get_vote_count(),
+                }
+                for solution in solutions
+            ],
+        }
+
+    @staticmethod
+    def iter_lines(updated_since=None, batch_size=EXPORT_BATCH_SIZE):
+        """Yield one encoded NDJSON line per question, oldest id first."""
+        for question in CorpusExport._query(updated_since).yield_per(batch_size):
+            record = CorpusExport._record(question)
+            yield (json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
+
+    @staticmethod
+    def iter_chunks(lines, compress=False, chunk_size=64 * 1024):
+        """Group ``lines`` into ~``chunk_size`` writes, gzipping them on the fly if asked."""
+        compressor = zlib.compressobj(6, zlib.DEFLATED, 31) if compress else None
+        buffer, size = [], 0
+        for line in lines:
+            buffer.append(line)
+            size += len(line)
+            if size >= chunk_size:
+                chunk = b"".join(buffer)
+                buffer, size = [], 0
+                chunk = compressor.compress(chunk) if compressor else chunk
+                if chunk:
+                    yield chunk
+        tail = b"".join(buffer)
+        if compressor:
+            tail = compressor.compress(tail) + compressor.flush()
+        if tail:
+            yield tail
@@ -0,0 +1,176 @@
+"""MinHash/LSH index for spotting likely duplicate questions at ask time.
+
+Each question is reduced to a set of word shingles (words and adjacent word
+pairs of its title and description) and summarized by a ``NUM_PERM``-value
+MinHash signature; the fraction of equal values between two signatures
+estimates the Jaccard similarity of their shingle sets. Signatures are split
+into ``BANDS`` bands of ``ROWS`` values and every band is hashed into a bucket,
+so a lookup reads ``BANDS`` buckets and only compares against the questions
+that share at least one of them. With 16 bands of 4 rows a pair at Jaccard 0.5
+collides with probability ~0.64 and a pair at 0.7 with ~0.99.
+
+The index is built from the database on first use, kept current by question
+writes in this process, and caught up with questions created by other workers
+by comparing against ``max(questions.id)``.
+"""
+
+import re
+import threading
+import zlib
+
+import numpy as np
+from flask import current_app
+from sqlalchemy import func
+
+from .. import db
+from ..models import Question
+
+NUM_PERM = 64
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+DUPLICATE_THRESHOLD = 0.5
+
+_MERSENNE_PRIME = np.uint64((1 << 31) - 1)
+_rng = np.random.default_rng(20240611)
+# Fixed seed: signatures must agree across processes and restarts.
+_PERM_A = _rng.integers(1, int(_MERSENNE_PRIME), size=NUM_PERM, dtype=np.uint64)
+_PERM_B = _rng.integers(0, int(_MERSENNE_PRIME), size=NUM_PERM, dtype=np.uint64)
+
+_WORD = re.compile(r"[a-z0-9][a-z0-9+#]*")
+_STOPWORDS = frozenset(
+    """
+    a an and are as at be but by can do does for from has have how i if in is it
+    its me my of on or so that the this to was what when where which why with
+    """.split()
+)
+
+
+def _shingles(title, description=""):
+    words = [
+        word
+        for word in _WORD.findall(f"{title or ''} {description or ''}".lower())
+        if word not in _STOPWORDS
+    ]
+    shingles = set(words)
+    shingles.update(f"{first} {second}" for first, second in zip(words, words[1:]))
+    return shingles
+
+
+def signature(title, description=""):
+    """MinHash signature of the question text; None when it has no usable words."""
+    shingles = _shingles(title, description)
+    if not shingles:
+        return None
+    hashes = np.fromiter(
+        (zlib.crc32(shingle.encode("utf-8")) for shingle in shingles),
+        dtype=np.uint64,
+        count=len(shingles),
+    )
+    # a < 2^31 and hash < 2^32 keep a*hash + b inside uint64.
+    permuted = (np.outer(_PERM_A, hashes) + _PERM_B[:, None]) % _MERSENNE_PRIME
+    return permuted.min(axis=1).astype(np.uint32)
+
+
+class MinHashIndex:
+    def __init__(self):
+        self.signatures = {}
+        self.buckets = [{} for _ in range(BANDS)]
+        self.max_question_id = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _bands(sig):
+        return [sig[band * ROWS:(band + 1) * ROWS].tobytes() for band in range(BANDS)]
+
+    def add(self, question_id, sig):
+        with self._lock:
+            self._discard(question_id)
+            self.max_question_id = max(self.max_question_id, question_id)
+            if sig is None:
+                return
+            self.signatures[question_id] = sig
+            for band, key in enumerate(self._bands(sig)):
+                self.buckets[band].setdefault(key, set()).add(question_id)
+
+    def remove(self, question_id):
+        with self._lock:
+            self._discard(question_id)
+
+    def _discard(self, question_id):
+        sig = self.signatures.pop(question_id, None)
+        if sig is None:
+            return
+        for band, key in enumerate(self._bands(sig)):
+            bucket = self.buckets[band].get(key)
+            if bucket is not None:
+                bucket.discard(question_id)
+                if not bucket:
+                    del self.buckets[band][key]
+
+    def query(self, sig, limit=5, threshold=DUPLICATE_THRESHOLD, exclude=()):
+        """``(question_id, estimated_jaccard)`` pairs at or above ``threshold``, best first."""
+        if sig is None:
+            return []
+        with self._lock:
+            candidates = set()
+            for band, key in enumerate(self._bands(sig)):
+                candidates.update(self.buckets[band].get(key, ()))
+            candidates.difference_update(exclude)
+            scored = [
+                (question_id, float(np.count_nonzero(self.signatures[question_id] == sig)) / NUM_PERM)
+                for question_id in candidates
+            ]
+        matches = [match for match in scored if match[1] >= threshold]
+        matches.sort(key=lambda match: (-match[1], -match[0]))
+        return matches[:limit]
+
+    def __len__(self):
+        return len(self.signatures)
+
+
+class DuplicateService:
+    MAX_RESULTS = 10
+
+    @staticmethod
+    def _documents(min_id=0):
+        query = (
+            db.session.query(Question.id, Question.title, Question.description)
+            .filter(Question.id > min_id)
+            .order_by(Question.id)
+        )
+        for question_id, title, description in query.yield_per(1000):
+            yield question_id, signature(title, description)
+
+    @staticmethod
+    def index():
+        """The app's index: built on first use, then caught up with newer questions."""
+        index = current_app.extensions.get("question_duplicates")
+        if index is None:
+            index = MinHashIndex()
+            current_app.extensions["question_duplicates"] = index
+
+        newest = db.session.query(func.max(Question.id)).scalar() or 0
+        if newest > index.max_question_id:
+            for question_id, sig in DuplicateService._documents(index.max_question_id):
+                index.add(question_id, sig)
+        return index
+
+    @staticmethod
+    def index_question(question):
+        """Add or refresh ``question``; a no-op until the index has been built."""
+        index = current_app.extensions.get("question_duplicates")
+        if index is not None:
+            index.add(question.id, signature(question.title, question.description))
+
+    @staticmethod
+    def remove_question(question_id):
+        index = current_app.extensions.get("question_duplicates")
+        if index is not None:
+            index.remove(question_id)
+
+    @staticmethod
+    def find(title, description="", limit=5, exclude=()):
+        limit = max(1, min(limit, DuplicateService.MAX_RESULTS))
+        return DuplicateService.index().query(
+            signature(title, description), limit=limit, exclude=exclude
+        )
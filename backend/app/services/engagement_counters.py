@@ -0,0 +1,210 @@
+from sqlalchemy import func, or_, select, update
+
+from .. import db
+from ..models import Follow, Question, Solution, Vote
+from .hot_ranking import ANSWER_WEIGHT, FOLLOW_WEIGHT, VOTE_WEIGHT, HotRanking
+from .question_cache import QuestionCache
+
+
+def _vote_delta(previous, current):
+    """Return the (upvote, downvote) change for a vote moving previous -> current."""
+    up = (current == "up") - (previous == "up")
+    down = (current == "down") - (previous == "down")
+    return up, down
+
+
+class EngagementCounters:
+    """Keeps the denormalized counters on questions and solutions in step.
+
+    Every helper issues a relative ``UPDATE ... SET col = col + n`` inside the
+    caller's transaction, so the counter moves atomically with the write that
+    caused it, heats up the question's ``hot_score`` (see HotRanking) and
+    marks the question's cached payload stale. ``reconcile`` recomputes the
+    counters from the source tables.
+
+    Unlike HotRanking and UnreadCounters, these updates deliberately let
+    ``onupdate`` bump ``updated_at``: the counters are part of the exported
+    record, and ``CorpusExport``'s ``updated_since`` only finds a question
+    whose votes or follows changed through that bump. The admin panel's
+    recent-activity list relies on it too.
+    """
+
+    @staticmethod
+    def solution_created(question_id):
+        QuestionCache.invalidate(question_id)
+        db.session.execute(
+            update(Question)
+            .where(Question.id == question_id)
+            .values(
+                solutions_count=Question.solutions_count + 1,
+                hot_score=HotRanking.heated(ANSWER_WEIGHT),
+            )
+        )
+
+    @staticmethod
+    def solution_deleted(solution):
+        upvotes = solution.upvotes or 0
+        downvotes = solution.downvotes or 0
+        QuestionCache.invalidate(solution.question_id)
+        db.session.execute(
+            update(Question)
+            .where(Question.id == solution.question_id)
+            .values(
+                solutions_count=Question.solutions_count - 1,
+                upvotes_total=Question.upvotes_total - upvotes,
+                downvotes_total=Question.downvotes_total - downvotes,
+                vote_total=Question.vote_total - (upvotes - downvotes),
+                hot_score=HotRanking.heated(-ANSWER_WEIGHT),
+            )
+        )
+
+    @staticmethod
+    def vote_changed(solution_id, question_id, previous, current):
+        """Apply a vote transition; ``previous``/``current`` are 'up', 'down' or None."""
+        up, down = _vote_delta(previous, current)
+        if not up and not down:
+            return
+        QuestionCache.invalidate(question_id)
+        db.session.execute(
+            update(Solution)
+            .where(Solution.id == solution_id)
+            .values(
+                upvotes=Solution.upvotes + up,
+                downvotes=Solution.downvotes + down,
+                score=Solution.score + (up - down),
+            )
+        )
+        db.session.execute(
+            update(Question)
+            .where(Question.id == question_id)
+            .values(
+                upvotes_total=Question.upvotes_total + up,
+                downvotes_total=Question.downvotes_total + down,
+                vote_total=Question.vote_total + (up - down),
+                hot_score=HotRanking.heated(VOTE_WEIGHT * (up - down)),
+            )
+        )
+
+    @staticmethod
+    def vote_applied(solution_id, previous, current):
+        """``vote_changed`` for callers that hold no rows (the vote fast path).
+
+        Returns the solution's (question_id, user_id, upvotes, downvotes) after
+        the change plus the question author, read back with ``RETURNING``, or
+        None when the solution does not exist.
+        """
+        up, down = _vote_delta(previous, current)
+        solution = db.session.execute(
+            update(Solution)
+            .where(Solution.id == solution_id)
+            .values(
+                upvotes=Solution.upvotes + up,
+                downvotes=Solution.downvotes + down,
+                score=Solution.score + (up - down),
+            )
+            .returning(Solution.question_id, Solution.user_id, Solution.upvotes, Solution.downvotes)
+        ).first()
+        if solution is None:
+            return None
+        QuestionCache.invalidate(solution.question_id)
+        question_author = db.session.execute(
+            update(Question)
+            .where(Question.id == solution.question_id)
+            .values(
+                upvotes_total=Question.upvotes_total + up,
+                downvotes_total=Question.downvotes_total + down,
+                vote_total=Question.vote_total + (up - down),
+                hot_score=HotRanking.heated(VOTE_WEIGHT * (up - down)),
+            )
+            .returning(Question.user_id)
+        ).scalar()
+        return solution, question_author
+
+    @staticmethod
+    def follow_changed(question_id, delta):
+        QuestionCache.invalidate(question_id)
+        db.session.execute(
+            update(Question)
+            .where(Question.id == question_id)
+            .values(
+                follows_count=Question.follows_count + delta,
+                hot_score=HotRanking.heated(FOLLOW_WEIGHT * delta),
+            )
+        )
+
+    @staticmethod
+    def _vote_count(vote_type):
+        return (
+            select(func.count(Vote.id))
+            .where(Vote.solution_id == Solution.id, Vote.vote_type == vote_type)
+            .scalar_subquery()
+        )
+
+    @staticmethod
+    def _question_vote_count(vote_type):
+        return (
+            select(func.count(Vote.id))
+            .join(Solution, Solution.id == Vote.solution_id)
+            .where(Solution.question_id == Question.id, Vote.vote_type == vote_type)
+            .scalar_subquery()
+        )
+
+    @staticmethod
+    def reconcile(dry_run=False):
+        """Recompute every counter in bulk and repair drifted rows.
+
+        Returns the number of drifted solutions and questions found.
+        """
+        solution_upvotes = EngagementCounters._vote_count("up")
+        solution_downvotes = EngagementCounters._vote_count("down")
+        solution_expected = {
+            "upvotes": solution_upvotes,
+            "downvotes": solution_downvotes,
+            "score": solution_upvotes - solution_downvotes,
+        }
+        solution_drift = or_(
+            *[getattr(Solution, name) != expr for name, expr in solution_expected.items()]
+        )
+        drifted_solutions = db.session.execute(
+            select(func.count(Solution.id)).where(solution_drift)
+        ).scalar()
+        if drifted_solutions and not dry_run:
+            db.session.execute(
+                update(Solution).where(solution_drift).values(**solution_expected),
+                execution_options={"synchronize_session": False},
+            )
+
+        upvotes_total = EngagementCounters._question_vote_count("up")
+        downvotes_total = EngagementCounters._question_vote_count("down")
+        question_expected = {
+            "solutions_count": select(func.count(Solution.id))
+            .where(Solution.question_id == Question.id)
+            .scalar_subquery(),
+            "follows_count": select(func.count(Follow.id))
+            .where(Follow.question_id == Question.id)
+            .scalar_subquery(),
+            "upvotes_total": upvotes_total,
+            "downvotes_total": downvotes_total,
+            "vote_total": upvotes_total - downvotes_total,
+        }
+        question_drift = or_(
+            *[getattr(Question, name) != expr for name, expr in question_expected.items()]
+        )
+        drifted_questions = db.session.execute(
+            select(func.count(Question.id)).where(question_drift)
+        ).scalar()
+        if drifted_questions and not dry_run:
+            db.session.execute(
+                update(Question).where(question_drift).values(**question_expected),
+                execution_options={"synchronize_session": False},
+            )
+
+        if (drifted_solutions or drifted_questions) and not dry_run:
+            QuestionCache.invalidate_all()
+
+        if dry_run:
+            db.session.rollback()
+        else:
+            db.session.commit()
+
+        return {"solutions": drifted_solutions, "questions": drifted_questions}
@@ -125,6 +125,11 @@ class FAQService:
         faq = FAQ.query.get(faq_id)
         return faq.to_dict() if faq else None
 
+    @staticmethod
+    def get_faq_updated_at(faq_id):
+        """Return the FAQ's ``updated_at`` (None if missing) without loading the row."""
+        return db.session.query(FAQ.updated_at).filter(FAQ.id == faq_id).scalar()
+
     @staticmethod
     def update_faq(faq_id, data, user_id):
         faq = FAQ.query.get(faq_id)
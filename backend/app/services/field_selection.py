@@ -0,0 +1,62 @@
+"""``?fields=`` and ``?expand=`` handling for question and solution payloads.
+
+``expand`` names the relations to embed and, when present, replaces the
+endpoint's default set (``expand=`` embeds none). ``fields`` keeps only the
+listed top-level keys. A relation that is not expanded, or whose keys are all
+projected away, is not loaded at all, so sparse requests skip its queries.
+"""
+
+# Payload keys produced by each relation. ``tags`` is not expandable; it is
+# loaded whenever the ``tags`` key is wanted.
+RELATION_KEYS = {
+    "author": ("author", "authorName"),
+    "answers": ("answers",),
+    "related": ("related_questions",),
+    "tags": ("tags",),
+}
+ALWAYS_LOADED = ("tags",)
+
+
+class InvalidFieldSelection(ValueError):
+    """Raised when ``expand`` names a relation the endpoint cannot embed."""
+
+
+def _split(value):
+    if value is None:
+        return None
+    return [part.strip() for part in value.split(",") if part.strip()]
+
+
+class FieldSelection:
+    def __init__(self, fields=None, expand=None, default_expand=(), allowed_expand=(), required=("id",)):
+        self.fields = frozenset(fields).union(required) if fields is not None else None
+        self.expand = frozenset(default_expand if expand is None else expand)
+        self.is_default = fields is None and self.expand == frozenset(default_expand)
+
+        unknown = self.expand.difference(allowed_expand)
+        if unknown:
+            raise InvalidFieldSelection(f"Cannot expand: {', '.join(sorted(unknown))}")
+
+    @classmethod
+    def from_args(cls, args, **options):
+        return cls(_split(args.get("fields")), _split(args.get("expand")), **options)
+
+    def includes(self, key):
+        return self.fields is None or key in self.fields
+
+    def wants(self, relation):
+        """True when ``relation`` has to be loaded to build the payload."""
+        if relation not in self.expand and relation not in ALWAYS_LOADED:
+            return False
+        return any(self.includes(key) for key in RELATION_KEYS[relation])
+
+    def project(self, payload):
+        if self.fields is None:
+            return payload
+        return {key: value for key, value in payload.items() if key in self.fields}
+
+    @property
+    def signature(self):
+        """Stable description of the selection, for cache validators."""
+        fields = ",".join(sorted(self.fields)) if self.fields is not None else "*"
+        return f"{fields};{','.join(sorted(self.expand))}"
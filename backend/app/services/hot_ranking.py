@@ -0,0 +1,129 @@
+"""Time-decayed "hot" ranking for the question feed.
+
+``questions.hot_score`` is a sum of activity weights, each decayed by half
+every ``HOT_HALF_LIFE_HOURS``. Activity adds its weight with a relative
+``UPDATE`` inside the transaction that caused it (see EngagementCounters), and
+``flask decay-hot-scores`` periodically multiplies every score by
+``0.5 ** (elapsed / half_life)`` since the previous run. Multiplying all rows
+by the same factor never reorders them, so between runs the feed stays
+consistent; it only lets fresh activity outweigh old activity. Reading the
+feed is then one range scan of ``ix_questions_hot_score_id``.
+"""
+
+from datetime import datetime
+
+from flask import current_app
+from sqlalchemy import bindparam, case, func, update
+
+from .. import db
+from ..models import HotScoreDecay, Question
+from .question_cache import QuestionCache
+
+# Weights of the events that heat a question up.
+QUESTION_WEIGHT = 1.0
+ANSWER_WEIGHT = 2.0
+FOLLOW_WEIGHT = 1.0
+VOTE_WEIGHT = 1.0
+
+# Scores that decay below this are snapped to zero so the job stops touching them.
+HOT_FLOOR = 1e-3
+
+
+class HotRanking:
+    @staticmethod
+    def heated(weight):
+        """Column expression for ``hot_score + weight``, never below zero."""
+        raised = Question.hot_score + weight
+        return case((raised < 0, 0.0), else_=raised)
+
+    @staticmethod
+    def half_life_seconds():
+        return float(current_app.config.get("HOT_HALF_LIFE_HOURS", 24)) * 3600
+
+    @staticmethod
+    def decay(now=None):
+        """Decay every positive score by the time elapsed since the previous run.
+
+        The first run only records its time. Returns the HotScoreDecay row.
+        """
+        now = now or datetime.utcnow()
+        last = db.session.query(func.max(HotScoreDecay.ran_at)).scalar()
+        elapsed = (now - last).total_seconds() if last else 0.0
+        factor = 0.5 ** (max(elapsed, 0.0) / HotRanking.half_life_seconds())
+
+        updated = 0
+        if factor < 1.0:
+            decayed = Question.hot_score * factor
+            updated = db.session.execute(
+                update(Question)
+                .where(Question.hot_score > 0)
+                .values(
+                    hot_score=case((decayed < HOT_FLOOR, 0.0), else_=decayed),
+                    # Decay is not an edit; keep Last-Modified where it was.
+                    updated_at=Question.updated_at,
+                ),
+                execution_options={"synchronize_session": False},
+            ).rowcount
+            if updated:
+                QuestionCache.invalidate()
+
+        run = HotScoreDecay(ran_at=now, factor=factor, questions_updated=updated)
+        db.session.add(run)
+        db.session.commit()
+        return run
+
+    @staticmethod
+    def _initial_score(question, now, half_life):
+        weight = (
+            QUESTION_WEIGHT
+            + ANSWER_WEIGHT * (question.solutions_count or 0)
+            + FOLLOW_WEIGHT * (question.follows_count or 0)
+            + VOTE_WEIGHT * max(question.vote_total or 0, 0)
+        )
+        age = max((now - (question.created_at or now)).total_seconds(), 0.0)
+        score = weight * 0.5 ** (age / half_life)
+        return score if score >= HOT_FLOOR else 0.0
+
+    @staticmethod
+    def recompute(now=None, batch_size=1000):
+        """Rebuild every score from the engagement counters, as if all activity had
+        happened when the question was asked. Used to backfill after upgrading.
+        """
+        now = now or datetime.utcnow()
+        half_life = HotRanking.half_life_seconds()
+        columns = (
+            Question.id,
+            Question.created_at,
+            Question.solutions_count,
+            Question.follows_count,
+            Question.vote_total,
+        )
+
+        total, last_id = 0, 0
+        while True:
+            batch = (
+                db.session.query(*columns)
+                .filter(Question.id > last_id)
+                .order_by(Question.id)
+                .limit(batch_size)
+                .all()
+            )
+            if not batch:
+                break
+            table = Question.__table__
+            db.session.execute(
+                update(table)
+                .where(table.c.id == bindparam("question_id"))
+                .values(hot_score=bindparam("score"), updated_at=table.c.updated_at),
+                [
+                    {"question_id": row.id, "score": HotRanking._initial_score(row, now, half_life)}
+                    for row in batch
+                ],
+            )
+            total += len(batch)
+            last_id = batch[-1].id
+
+        db.session.add(HotScoreDecay(ran_at=now, factor=1.0, questions_updated=total))
+        QuestionCache.invalidate()
+        db.session.commit()
+        return total
@@ -0,0 +1,124 @@
+"""Named eager-loading profiles for question read paths.
+
+Each profile loads exactly the relations its serializer touches, using
+``selectinload`` for collections (one extra ``IN`` query per relation instead of
+a cartesian join) and ``joinedload`` only for many-to-one references.
+
+When ``STRICT_LOADER_PROFILES`` is enabled (the test suite turns it on) every
+level of a profile also gets ``raiseload("*", sql_only=True)``, so a serializer
+that reaches for a relation outside its profile fails loudly instead of quietly
+issuing a lazy load per row.
+"""
+
+from flask import current_app, has_app_context
+from sqlalchemy.orm import joinedload, raiseload, selectinload
+
+from ..models import Question, Solution, User
+
+
+def _strict():
+    return has_app_context() and current_app.config.get("STRICT_LOADER_PROFILES", False)
+
+
+def _seal(option):
+    """Forbid lazy SQL below ``option`` when strict mode is on."""
+    if _strict():
+        return option.raiseload("*", sql_only=True)
+    return option
+
+
+def _question_card(path):
+    """Relations rendered on a question card (list rows, related links).
+
+    Engagement counts come from the counter columns, so no collection beyond
+    tags is needed.
+    """
+    return [
+        _seal(path.joinedload(Question.author)),
+        _seal(path.selectinload(Question.tags)),
+    ]
+
+
+def _question_relations(author=True, tags=True, answers=False, related=False):
+    options = []
+    if author:
+        options.append(_seal(joinedload(Question.author)))
+    if tags:
+        options.append(_seal(selectinload(Question.tags)))
+    if answers:
+        options.append(_seal(selectinload(Question.solutions).joinedload(Solution.author)))
+        options.append(_seal(selectinload(Question.solutions)))
+    if related:
+        options.append(_seal(selectinload(Question.related_questions)))
+        options.append(_seal(selectinload(Question.related_to)))
+        options += _question_card(selectinload(Question.related_questions))
+        options += _question_card(selectinload(Question.related_to))
+    return options
+
+
+def _list_profile():
+    return _question_relations()
+
+
+def _detail_profile():
+    return _question_relations(answers=True, related=True)
+
+
+def _dashboard_profile():
+    # The dashboard renders list cards and the recent-activity answer counts,
+    # both of which are covered by the list profile and the counter columns.
+    return _list_profile()
+
+
+def _profile_profile():
+    """User-rooted: the profile page lists a user's questions and answers."""
+    return [
+        _seal(selectinload(User.questions).selectinload(Question.tags)),
+        _seal(selectinload(User.questions)),
+        _seal(selectinload(User.solutions)),
+    ]
+
+
+PROFILES = {
+    "list": _list_profile,
+    "detail": _detail_profile,
+    "dashboard": _dashboard_profile,
+    "profile": _profile_profile,
+}
+
+
+def _sealed(options):
+    if _strict():
+        options.append(raiseload("*", sql_only=True))
+    return options
+
+
+def loader_options(profile):
+    """Return the loader options for ``profile``, sealed at the root in strict mode."""
+    try:
+        build = PROFILES[profile]
+    except KeyError:
+        raise ValueError(f"Unknown loader profile: {profile}") from None
+    return _sealed(build())
+
+
+def solution_options(author=True):
+    """Solution read paths: the author at most.
+
+    ``my_vote`` comes from one batched lookup per page, so ``Solution.votes``
+    is never loaded; strict mode makes any access to it raise.
+    """
+    options = [_seal(joinedload(Solution.author))] if author else []
+    return _sealed(options)
+
+
+def selection_options(selection):
+    """Ad-hoc question profile loading only what a FieldSelection asks for."""
+    return _sealed(
+        _question_relations(
+            author=selection.wants("author"),
+            tags=selection.wants("tags"),
+            answers=selection.wants("answers"),
+            related=selection.wants("related"),
+        )
+    )
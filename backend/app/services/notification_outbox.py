@@ -0,0 +1,237 @@
+"""Transactional outbox for notifications.
+
+With ``NOTIFICATION_OUTBOX_ENABLED`` the write paths stop fanning out
+notifications inline. ``create_solution`` and ``vote_solution`` add one
+``notification_events`` row (``answer_created`` / ``vote_cast``) in the same
+transaction as the answer or vote, so the event is durable exactly when the
+write is, and the request returns as soon as it commits.
+
+``flask notifications-worker`` drains the outbox: it claims due events in
+``id`` order (``FOR UPDATE SKIP LOCKED`` where supported, so several workers
+can run), runs each kind's handler to create the notifications, deletes the
+events and commits, all in one transaction per batch, then pushes the unread
+counts for everyone notified by the batch. If a batch fails it is rolled back
+and retried event by event, each event re-claimed under its own lock so one
+another worker took in the meantime is skipped; an event whose handler raises
+is retried with exponential backoff and set aside (``failed_at``) after
+``NOTIFICATION_MAX_ATTEMPTS`` attempts.
+
+Each batch reports how long its events waited (lag); ``NotificationOutbox.metrics``
+reports the backlog. Handlers are registered per kind in ``HANDLERS`` and
+return the ids of the users they notified.
+"""
+
+import time
+from datetime import datetime, timedelta
+
+from flask import current_app
+from sqlalchemy import delete, func, insert, select, update
+
+from .. import db
+from ..models import NotificationEvent
+
+ANSWER_CREATED = "answer_created"
+VOTE_CAST = "vote_cast"
+
+MAX_BACKOFF_SECONDS = 300
+
+
+def _answer_created(payload):
+    from .solution_service import SolutionService
+
+    return SolutionService._notify_new_answer(
+        payload["question_id"], payload["question_author_id"], payload["solution_id"], payload["author_id"]
+    )
+
+
+def _vote_cast(payload):
+    from .vote_service import VoteService
+
+    return VoteService._create_upvote_notifications(
+        payload["solution_author_id"], payload["question_author_id"], payload["voter_id"], payload["vote_id"]
+    )
+
+
+# kind -> handler(payload) that creates the notifications and returns who was notified.
+HANDLERS = {
+    ANSWER_CREATED: _answer_created,
+    VOTE_CAST: _vote_cast,
+}
+
+
+class NotificationOutbox:
+    @staticmethod
+    def enabled():
+        return bool(current_app.config.get("NOTIFICATION_OUTBOX_ENABLED"))
+
+    @staticmethod
+    def publish(kind, **payload):
+        """Queue one event in the current transaction; it is visible to the worker on commit."""
+        db.session.add(NotificationEvent(kind=kind, payload=payload))
+
+    @staticmethod
+    def publish_many(kind, payloads):
+        """Queue several events of one kind with a single executemany."""
+        if payloads:
+            db.session.execute(
+                insert(NotificationEvent.__table__), [{"kind": kind, "payload": payload} for payload in payloads]
+            )
+
+    @staticmethod
+    def process_batch(limit=None):
+        """Handle up to ``limit`` due events; returns the batch's stats.
+
+        Stats: ``claimed``, ``processed``, ``failed``, ``skipped`` (taken by
+        another worker during a one-by-one retry), ``notified`` (users whose
+        unread count was pushed) and ``max_lag_seconds`` / ``mean_lag_seconds``
+        (time from publish to commit for the processed events).
+        """
+        limit = limit or int(current_app.config.get("NOTIFICATION_WORKER_BATCH", 100))
+        events = NotificationOutbox._claim(limit)
+        stats = {"claimed": len(events), "processed": 0, "failed": 0, "skipped": 0, "notified": 0,
+                 "max_lag_seconds": 0.0, "mean_lag_seconds": 0.0}
+        if not events:
+            db.session.rollback()
+            return stats
+
+        published = {event.id: event.created_at for event in events}
+        try:
+            notified = NotificationOutbox._handle(events)
+            db.session.commit()
+            processed, failed = list(published), 0
+        except Exception:
+            db.session.rollback()
+            current_app.logger.exception(
+                "Notification batch failed; retrying %d event(s) one by one", len(published)
+            )
+            notified, processed, failed = NotificationOutbox._handle_one_by_one(list(published))
+
+        finished = datetime.utcnow()
+        lags = [(finished - published[event_id]).total_seconds() for event_id in processed]
+        stats.update(
+            processed=len(processed),
+            failed=failed,
+            skipped=len(published) - len(processed) - failed,
+            notified=len(notified),
+            max_lag_seconds=max(lags, default=0.0),
+            mean_lag_seconds=sum(lags) / len(lags) if lags else 0.0,
+        )
+        if notified:
+            from .solution_service import SolutionService
+
+            SolutionService._push_unread_updates(notified)
+        return stats
+
+    @staticmethod
+    def run(batch_size=None, poll_ms=None, once=False, on_batch=None, should_stop=None):
+        """Drain the outbox, then poll every ``poll_ms``; ``once`` returns when nothing is due."""
+        batch_size = batch_size or int(current_app.config.get("NOTIFICATION_WORKER_BATCH", 100))
+        poll_ms = poll_ms if poll_ms is not None else int(current_app.config.get("NOTIFICATION_WORKER_POLL_MS", 500))
+        while not (should_stop and should_stop()):
+            stats = NotificationOutbox.process_batch(batch_size)
+            if stats["claimed"] and on_batch:
+                on_batch(stats)
+            db.session.remove()
+            if stats["claimed"] < batch_size:
+                if once:
+                    return
+                time.sleep(poll_ms / 1000)
+
+    @staticmethod
+    def metrics():
+        """Backlog gauges: pending and failed events, and the age of the oldest pending one."""
+        pending, oldest = db.session.execute(
+            select(func.count(), func.min(NotificationEvent.created_at)).where(NotificationEvent.failed_at.is_(None))
+        ).one()
+        failed = db.session.execute(
+            select(func.count()).where(NotificationEvent.failed_at.is_not(None))
+        ).scalar()
+        return {
+            "pending": pending,
+            "failed": failed,
+            "oldest_pending_seconds": (datetime.utcnow() - oldest).total_seconds() if oldest else 0.0,
+        }
+
+    @staticmethod
+    def _claim(limit):
+        return (
+            NotificationEvent.query.filter(
+                NotificationEvent.failed_at.is_(None),
+                NotificationEvent.available_at <= datetime.utcnow(),
+            )
+            .order_by(NotificationEvent.available_at, NotificationEvent.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+            .all()
+        )
+
+    @staticmethod
+    def _reclaim(event_id):
+        """Lock one event again; None if it is gone, set aside, or held by another worker."""
+        return (
+            NotificationEvent.query.filter(
+                NotificationEvent.id == event_id, NotificationEvent.failed_at.is_(None)
+            )
+            .populate_existing()
+            .with_for_update(skip_locked=True)
+            .one_or_none()
+        )
+
+    @staticmethod
+    def _handle(events):
+        notified = set()
+        for event in events:
+            handler = HANDLERS.get(event.kind)
+            if handler is None:
+                raise LookupError(f"No notification handler for {event.kind!r}")
+            notified |= handler(event.payload)
+        table = NotificationEvent.__table__
+        db.session.execute(delete(table).where(table.c.id.in_([event.id for event in events])))
+        return notified
+
+    @staticmethod
+    def _handle_one_by_one(event_ids):
+        notified, processed, failed = set(), [], 0
+        for event_id in event_ids:
+            # The failed batch's rollback released its locks; another worker
+            # may have claimed or finished any of these events since.
+            event = NotificationOutbox._reclaim(event_id)
+            if event is None:
+                db.session.rollback()
+                continue
+            try:
+                notified |= NotificationOutbox._handle([event])
+                db.session.commit()
+                processed.append(event_id)
+            except Exception as exc:
+                db.session.rollback()
+                failed += NotificationOutbox._record_failure(event_id, exc)
+        return notified, processed, failed
+
+    @staticmethod
+    def _record_failure(event_id, exc):
+        """Schedule a retry with exponential backoff, or set the event aside after the last attempt.
+
+        Returns False, recording nothing, if another worker has since taken the event.
+        """
+        max_attempts = int(current_app.config.get("NOTIFICATION_MAX_ATTEMPTS", 5))
+        event = NotificationOutbox._reclaim(event_id)
+        if event is None:
+            db.session.rollback()
+            return False
+        attempts = event.attempts + 1
+        now = datetime.utcnow()
+        values = {"attempts": attempts, "last_error": f"{type(exc).__name__}: {exc}"[:1000]}
+        if attempts >= max_attempts:
+            values["failed_at"] = now
+            current_app.logger.error(
+                "Notification event %s (%s) failed %d times; giving up", event_id, event.kind, attempts
+            )
+        else:
+            values["available_at"] = now + timedelta(seconds=min(2 ** attempts, MAX_BACKOFF_SECONDS))
+            current_app.logger.warning(
+                "Notification event %s (%s) failed (attempt %d): %s", event_id, event.kind, attempts, exc
+            )
+        db.session.execute(update(NotificationEvent).where(NotificationEvent.id == event_id).values(**values))
+        db.session.commit()
+        return True
@@ -0,0 +1,68 @@
+"""Per-type rendering of notification messages and links.
+
+A notification only stores ``type`` and ``reference_id``; its message and
+``actionUrl`` come from the row it references. A renderer handles one or more
+types in two steps: ``load`` resolves the reference ids of a whole page with a
+single IN query, and ``render`` fills one payload from what was loaded.
+``NotificationService`` groups a page by type before calling them, so a page
+costs one query per type present, however many rows it has.
+
+New kinds of notification register a renderer with ``register_renderer``;
+types without one keep the generic title as their message.
+"""
+
+from sqlalchemy import select
+
+from .. import db
+from ..models import Question, Solution, Vote
+
+
+class AnswerRenderer:
+    """``answer`` / ``new_answer``: reference_id is the new solution."""
+
+    types = ("answer", "new_answer")
+
+    def load(self, reference_ids):
+        rows = db.session.execute(
+            select(Solution.id, Solution.question_id, Question.title)
+            .outerjoin(Question, Question.id == Solution.question_id)
+            .where(Solution.id.in_(reference_ids))
+        )
+        return {row.id: row for row in rows}
+
+    def render(self, payload, row):
+        payload["message"] = f"New answer on {row.title or 'your question'}"
+        payload["actionUrl"] = f"/questions/{row.question_id}"
+
+
+class VoteRenderer:
+    """``vote``: reference_id is the vote on the recipient's answer."""
+
+    types = ("vote",)
+
+    def load(self, reference_ids):
+        rows = db.session.execute(
+            select(Vote.id, Solution.question_id)
+            .join(Solution, Solution.id == Vote.solution_id)
+            .where(Vote.id.in_(reference_ids))
+        )
+        return {row.id: row for row in rows}
+
+    def render(self, payload, row):
+        payload["message"] = "Your answer received a new vote"
+        payload["actionUrl"] = f"/questions/{row.question_id}"
+
+
+# type -> renderer
+RENDERERS = {}
+
+
+def register_renderer(renderer):
+    """Render ``renderer.types`` with ``renderer``, replacing any earlier registration."""
+    for notification_type in renderer.types:
+        RENDERERS[notification_type] = renderer
+    return renderer
+
+
+register_renderer(AnswerRenderer())
+register_renderer(VoteRenderer())
@@ -1,32 +1,38 @@
+from sqlalchemy import update
+
 from .. import db
-from ..models import Notification, Solution, Question, Vote
+from ..models import Notification
+from .notification_renderers import RENDERERS
+from .unread_counters import UnreadCounters
 
 
 class NotificationService:
     @staticmethod
     def _serialize(notification):
-        base = notification.to_dict()
-        base["read"] = notification.is_read
-        base["title"] = (notification.type or "notification").replace("_", " ").title()
-        base["message"] = base["title"]
-        base["actionUrl"] = None
-
-        if notification.type in {"answer", "new_answer"}:
-            solution = Solution.query.get(notification.reference_id)
-            if solution:
-                question = Question.query.get(solution.question_id)
-                question_title = question.title if question else "your question"
-                base["message"] = f"New answer on {question_title}"
-                base["actionUrl"] = f"/questions/{solution.question_id}"
-        elif notification.type == "vote":
-            vote = Vote.query.get(notification.reference_id)
-            if vote:
-                solution = Solution.query.get(vote.solution_id)
-                if solution:
-                    base["message"] = "Your answer received a new vote"
-                    base["actionUrl"] = f"/questions/{solution.question_id}"
-
-        return base
+        return NotificationService._serialize_page([notification])[0]
+
+    @staticmethod
+    def _serialize_page(notifications):
+        """Serialize notifications, resolving their references with one query per renderer."""
+        reference_ids = {}
+        for notification in notifications:
+            renderer = RENDERERS.get(notification.type)
+            if renderer is not None:
+                reference_ids.setdefault(renderer, set()).add(notification.reference_id)
+        loaded = {renderer: renderer.load(ids) for renderer, ids in reference_ids.items()}
+
+        items = []
+        for notification in notifications:
+            base = notification.to_dict()
+            base["read"] = notification.is_read
+            base["title"] = (notification.type or "notification").replace("_", " ").title()
+            base["message"] = base["title"]
+            base["actionUrl"] = None
+            renderer = RENDERERS.get(notification.type)
+            if renderer is not None and notification.reference_id in loaded[renderer]:
+                renderer.render(base, loaded[renderer][notification.reference_id])
+            items.append(base)
+        return items
 
     @staticmethod
     def get_user_notifications(user_id, page=1, per_page=10, unread_only=False):
@@ -36,10 +42,10 @@ class NotificationService:
         if unread_only:
             query = query.filter_by(is_read=False)
 
-        query = query.order_by(Notification.created_at.desc())
+        query = query.order_by(Notification.created_at.desc(), Notification.id.desc())
         notifications = db.paginate(query, page=page, per_page=per_page, error_out=False)
 
-        items = [NotificationService._serialize(n) for n in notifications.items]
+        items = NotificationService._serialize_page(notifications.items)
         meta = {
             "current_page": notifications.page,
             "pages": notifications.pages,
@@ -59,14 +65,22 @@ class NotificationService:
     @staticmethod
     def mark_notification_read(notification_id, user_id):
         """Mark a notification as read"""
-        notification = Notification.query.filter_by(
-            id=notification_id, user_id=user_id
-        ).first()
-
-        if not notification:
+        # Only an unread row changes, so a repeated request cannot decrement twice.
+        marked = db.session.execute(
+            update(Notification)
+            .where(
+                Notification.id == notification_id,
+                Notification.user_id == user_id,
+                Notification.is_read.is_(False),
+            )
+            .values(is_read=True),
+            execution_options={"synchronize_session": False},
+        ).rowcount
+        if not marked and not Notification.query.filter_by(id=notification_id, user_id=user_id).first():
+            db.session.rollback()
             return {"error": "Notification not found"}, 404
 
-        notification.is_read = True
+        UnreadCounters.read(user_id, marked)
         db.session.commit()
 
         NotificationService._push_unread_update(user_id)
@@ -75,7 +89,10 @@ class NotificationService:
     @staticmethod
     def mark_all_notifications_read(user_id):
         """Mark all notifications as read for a user"""
-        Notification.query.filter_by(user_id=user_id, is_read=False).update({"is_read": True})
+        marked = Notification.query.filter_by(user_id=user_id, is_read=False).update(
+            {"is_read": True}, synchronize_session=False
+        )
+        UnreadCounters.read(user_id, marked)
         db.session.commit()
 
         NotificationService._push_unread_update(user_id)
@@ -83,9 +100,13 @@ class NotificationService:
 
     @staticmethod
     def get_unread_count(user_id):
-        """Get count of unread notifications"""
-        count = Notification.query.filter_by(user_id=user_id, is_read=False).count()
-        return {"unread_count": count}
+        """Get count of unread notifications (the user's maintained counter)"""
+        return {"unread_count": UnreadCounters.get(user_id)}
+
+    @staticmethod
+    def get_unread_counts(user_ids):
+        """Map each of ``user_ids`` to its unread count with one primary-key lookup per chunk."""
+        return UnreadCounters.get_many(user_ids)
 
     @staticmethod
     def _push_unread_update(user_id):
@@ -0,0 +1,81 @@
+"""Keyset (cursor) pagination helpers.
+
+A cursor is an opaque, URL-safe token holding the sort-key values of the last
+row on the previous page. The next page is fetched with a range predicate on
+those values, so page 500 costs the same index range scan as page 1 and no
+COUNT(*) is ever issued.
+"""
+
+import base64
+import binascii
+import json
+from datetime import datetime
+
+from sqlalchemy import and_, or_
+
+
+class InvalidCursor(ValueError):
+    """Raised when a client sends a cursor this endpoint did not issue."""
+
+
+def _encode_value(value):
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    return value
+
+
+def _decode_value(value):
+    if isinstance(value, dict) and "dt" in value:
+        return datetime.fromisoformat(value["dt"])
+    return value
+
+
+def encode_cursor(values):
+    payload = json.dumps([_encode_value(value) for value in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token, size):
+    """Decode ``token`` into ``size`` sort-key values; raise InvalidCursor otherwise."""
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        if not isinstance(values, list) or len(values) != size:
+            raise ValueError
+        return [_decode_value(value) for value in values]
+    except (ValueError, TypeError, binascii.Error, UnicodeError):
+        raise InvalidCursor("Invalid cursor") from None
+
+
+def _after(keys, values):
+    """Predicate selecting rows strictly after ``values`` in ``keys`` order."""
+    clauses = []
+    for index, (column, descending) in enumerate(keys):
+        equal_prefix = [keys[i][0] == values[i] for i in range(index)]
+        step = column < values[index] if descending else column > values[index]
+        clauses.append(and_(*equal_prefix, step))
+    return or_(*clauses)
+
+
+def keyset_page(query, keys, cursor=None, per_page=10):
+    """Fetch one page of ``query`` ordered by ``keys``.
+
+    ``keys`` is a list of ``(column, descending)`` pairs whose last entry must
+    be unique (normally the primary key) so the order is total. Returns
+    ``(rows, next_cursor)``; ``next_cursor`` is None on the last page.
+    """
+    if cursor:
+        values = decode_cursor(cursor, len(keys))
+        query = query.filter(_after(keys, values))
+
+    query = query.order_by(
+        *[column.desc() if descending else column.asc() for column, descending in keys]
+    )
+    rows = query.limit(per_page + 1).all()
+
+    next_cursor = None
+    if len(rows) > per_page:
+        rows = rows[:per_page]
+        last = rows[-1]
+        next_cursor = encode_cursor([getattr(last, column.key) for column, _ in keys])
+    return rows, next_cursor
@@ -0,0 +1,408 @@
+"""Bulk import of historical questions, solutions and tags.
+
+Input is streamed and processed in chunks: each chunk is validated, its
+authors and tags are resolved with one ``IN`` query per kind (new tags are
+created in one statement), and its questions, question_tags and solutions
+are written with one executemany each inside a single transaction. Nothing
+goes through ``create_question``/``create_solution``, so no notifications,
+serialization or per-row commits happen; the search index is fed per chunk
+and the list caches are invalidated when each chunk commits. The similarity
+and duplicate indexes catch up on their own (they track the highest indexed
+id).
+
+Three formats are accepted:
+
+* ``ndjson`` - one question object per line, the shape ``GET /admin/export``
+  produces (extra fields such as ids and counters are ignored).
+* ``json`` - an array of the same objects, or ``{"items": [...]}``.
+* ``csv`` - one row per question (``kind=question``) or solution
+  (``kind=solution``). Tags are ``|``-separated; solution rows point at a
+  question row's ``ref`` through ``question_ref`` or at an existing question
+  through ``question_id``.
+
+Authors are matched by ``author_email`` first, then ``user_id``, then the
+import's default author. Imported questions start cold (``hot_score`` 0):
+they are history, not new activity.
+"""
+
+import csv
+import json
+import time
+from datetime import datetime, timezone
+
+from marshmallow import ValidationError
+from sqlalchemy import bindparam, insert, select, update
+
+from .. import db
+from ..models import Question, QuestionTag, Solution, Tag, User
+from ..schemas import QAImportQuestionSchema, QAImportSolutionSchema
+from .question_cache import QuestionCache
+from .search_service import SearchService
+
+IMPORT_FORMATS = ("json", "ndjson", "csv")
+IMPORT_CHUNK_SIZE = 500
+MAX_CHUNK_SIZE = 5000
+# The report lists this many errors; the rest are only counted.
+MAX_REPORTED_ERRORS = 100
+
+_FORMAT_BY_EXTENSION = {".json": "json", ".ndjson": "ndjson", ".jsonl": "ndjson", ".csv": "csv"}
+_FORMAT_BY_MIMETYPE = {
+    "application/json": "json",
+    "application/x-ndjson": "ndjson",
+    "application/jsonl": "ndjson",
+    "text/csv": "csv",
+}
+_READ_SIZE = 64 * 1024
+
+_question_schema = QAImportQuestionSchema()
+_solution_schema = QAImportSolutionSchema()
+
+
+def format_for_filename(filename):
+    """The import format implied by a file extension, or None."""
+    for extension, name in _FORMAT_BY_EXTENSION.items():
+        if filename.lower().endswith(extension):
+            return name
+    return None
+
+
+def format_for_mimetype(mimetype):
+    return _FORMAT_BY_MIMETYPE.get((mimetype or "").lower())
+
+
+class ImportAborted(Exception):
+    """The input cannot be read any further (e.g. a malformed JSON array)."""
+
+
+def _naive_utc(value):
+    if value is not None and value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def _iter_ndjson(stream):
+    for line_number, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            yield line_number, json.loads(line)
+        except ValueError as exc:
+            yield line_number, exc
+
+
+def _iter_json(stream):
+    """Yield the objects of a top-level JSON array without reading it whole."""
+    decoder = json.JSONDecoder()
+    buffer, position, item, eof = "", 0, 0, False
+    started = wrapped = False
+
+    def fill():
+        nonlocal buffer, position, eof
+        chunk = stream.read(_READ_SIZE)
+        buffer = buffer[position:] + chunk
+        position = 0
+        eof = not chunk
+
+    while True:
+        while position < len(buffer) and buffer[position] in " \t\r\n,":
+            position += 1
+        if position >= len(buffer):
+            if eof:
+                raise ImportAborted("unexpected end of JSON input")
+            fill()
+            continue
+        char = buffer[position]
+        if not started:
+            if char == "{" and not wrapped:
+                # {"items": [...]}: skip ahead to the array.
+                start = buffer.find("[", position)
+                if start < 0:
+                    if eof:
+                        raise ImportAborted('expected a JSON array or {"items": [...]}')
+                    fill()
+                    continue
+                position, wrapped = start, True
+                continue
+            if char != "[":
+                raise ImportAborted('expected a JSON array or {"items": [...]}')
+            position += 1
+            started = True
+            continue
+        if char == "]":
+            return
+        try:
+            value, end = decoder.raw_decode(buffer, position)
+        except ValueError:
+            if eof:
+                raise ImportAborted(f"malformed JSON after item {item}")
+            fill()
+            continue
+        if end == len(buffer) and not eof:
+            # A number or literal may continue in the next read.
+            fill()
+            continue
+        item += 1
+        position = end
+        yield item, value
+
+
+def _iter_csv(stream):
+    reader = csv.DictReader(stream)
+    for row in reader:
+        record = {key: value.strip() for key, value in row.items() if key and value and value.strip()}
+        if "tags" in record:
+            record["tags"] = [name for name in record["tags"].split("|") if name.strip()]
+        yield reader.line_num, record
+
+
+READERS = {"json": _iter_json, "ndjson": _iter_ndjson, "csv": _iter_csv}
+
+
+class QAImporter:
+    def __init__(self, chunk_size=IMPORT_CHUNK_SIZE, default_author_id=None):
+        self.chunk_size = max(1, min(int(chunk_size), MAX_CHUNK_SIZE))
+        self.default_author_id = default_author_id
+        self.questions = 0
+        self.solutions = 0
+        self.tags_created = 0
+        self.error_count = 0
+        self.errors = []
+        self._users_by_email = {}
+        self._known_user_ids = set()
+        self._tag_ids = {}
+        self._refs = {}
+
+    # ---- Entry points ----
+    @staticmethod
+    def run(stream, fmt, chunk_size=IMPORT_CHUNK_SIZE, default_author_id=None):
+        """Import a text ``stream`` in format ``fmt``; returns the report dict."""
+        if fmt not in READERS:
+            raise ValueError(f"format must be one of: {', '.join(IMPORT_FORMATS)}")
+        importer = QAImporter(chunk_size=chunk_size, default_author_id=default_author_id)
+        started = time.perf_counter()
+        try:
+            chunk = []
+            for line, record in READERS[fmt](stream):
+                chunk.append((line, record))
+                if len(chunk) >= importer.chunk_size:
+                    importer._import_chunk(chunk)
+                    chunk = []
+            if chunk:
+                importer._import_chunk(chunk)
+        except (ImportAborted, csv.Error, UnicodeDecodeError) as exc:
+            importer._error(None, f"input aborted: {exc}")
+        return importer._report(fmt, time.perf_counter() - started)
+
+    def _report(self, fmt, seconds):
+        rows = self.questions + self.solutions
+        return {
+            "format": fmt,
+            "questions": self.questions,
+            "solutions": self.solutions,
+            "tags_created": self.tags_created,
+            "error_count": self.error_count,
+            "errors": self.errors,
+            "seconds": round(seconds, 3),
+            "rows_per_second": round(rows / seconds, 1) if seconds > 0 else None,
+        }
+
+    def _error(self, line, message):
+        self.error_count += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"line": line, "error": message})
+
+    # ---- Chunk processing ----
+    def _validate(self, chunk):
+        questions, solutions = [], []
+        for line, record in chunk:
+            if isinstance(record, Exception):
+                self._error(line, f"invalid JSON: {record}")
+                continue
+            if not isinstance(record, dict):
+                self._error(line, "expected an object")
+                continue
+            kind = record.get("kind") or ("solution" if "content" in record and "title" not in record else "question")
+            schema = _solution_schema if kind == "solution" else _question_schema
+            try:
+                data = schema.load(record)
+            except ValidationError as exc:
+                self._error(line, json.dumps(exc.messages, sort_keys=True))
+                continue
+            if kind == "solution":
+                if "question_ref" not in data and "question_id" not in data:
+                    self._error(line, "solution needs question_ref or question_id")
+                    continue
+                solutions.append((line, data))
+            else:
+                questions.append((line, data))
+        return questions, solutions
+
+    def _resolve_users(self, records):
+        emails = {data["author_email"] for data in records if "author_email" in data}
+        emails -= self._users_by_email.keys()
+        if emails:
+            rows = db.session.execute(select(User.email, User.id).where(User.email.in_(emails)))
+            self._users_by_email.update(rows.all())
+        user_ids = {data["user_id"] for data in records if "user_id" in data} - self._known_user_ids
+        if user_ids:
+            self._known_user_ids.update(db.session.scalars(select(User.id).where(User.id.in_(user_ids))))
+
+    def _author_id(self, line, data):
+        if "author_email" in data:
+            user_id = self._users_by_email.get(data["author_email"])
+            if user_id is None:
+                self._error(line, f"unknown author_email {data['author_email']}")
+            return user_id
+        if "user_id" in data and data["user_id"] in self._known_user_ids:
+            return data["user_id"]
+        if self.default_author_id is not None:
+            return self.default_author_id
+        self._error(line, "no author: give author_email or user_id, or set a default author")
+        return None
+
+    def _resolve_tags(self, names):
+        missing = set(names) - self._tag_ids.keys()
+        if not missing:
+            return
+        self._tag_ids.update(db.session.execute(select(Tag.name, Tag.id).where(Tag.name.in_(missing))).all())
+        new = sorted(missing - self._tag_ids.keys())
+        if new:
+            db.session.execute(insert(Tag.__table__), [{"name": name} for name in new])
+            self._tag_ids.update(db.session.execute(select(Tag.name, Tag.id).where(Tag.name.in_(new))).all())
+            self.tags_created += len(new)
+
+    def _resolve_question_ids(self, solutions):
+        wanted = {data["question_id"] for _, data in solutions if "question_ref" not in data}
+        if not wanted:
+            return set()
+        return set(db.session.scalars(select(Question.id).where(Question.id.in_(wanted))))
+
+    def _import_chunk(self, chunk):
+        questions, standalone = self._validate(chunk)
+        nested = [solution for _, data in questions for solution in data.get("solutions", ())]
+        self._resolve_users([data for _, data in questions] + [data for _, data in standalone] + nested)
+
+        now = datetime.utcnow()
+        question_rows, question_tags, pending_solutions, chunk_refs = [], [], [], set()
+        for line, data in questions:
+            user_id = self._author_id(line, data)
+            if user_id is None:
+                continue
+            ref = data.get("ref")
+            if ref is not None and (ref in self._refs or ref in chunk_refs):
+                self._error(line, f"duplicate ref {ref}")
+                continue
+            if ref is not None:
+                chunk_refs.add(ref)
+            created_at = _naive_utc(data.get("created_at")) or now
+            answers = []
+            for solution in data.get("solutions", ()):
+                author_id = self._author_id(line, solution)
+                if author_id is not None:
+                    answers.append(self._solution_row(solution, author_id, created_at))
+            question_rows.append({
+                "user_id": user_id,
+                "title": data["title"],
+                "description": data["description"],
+                "problem_type": data["problem_type"],
+                "created_at": created_at,
+                "updated_at": created_at,
+                "solutions_count": len(answers),
+                "hot_score": 0.0,
+            })
+            tags = sorted({name.strip().lower() for name in data.get("tags", ()) if name.strip()})
+            question_tags.append(tags)
+            pending_solutions.append((ref, answers))
+
+        existing_ids = self._resolve_question_ids(standalone)
+        try:
+            self._resolve_tags({name for tags in question_tags for name in tags})
+            question_ids = []
+            if question_rows:
+                table = Question.__table__
+                result = db.session.execute(
+                    insert(table).returning(table.c.id, sort_by_parameter_order=True), question_rows
+                )
+                question_ids = list(result.scalars())
+
+            solution_rows, refs = [], {}
+            for question_id, (ref, answers), tags in zip(question_ids, pending_solutions, question_tags):
+                if ref is not None:
+                    refs[ref] = question_id
+                for answer in answers:
+                    answer["question_id"] = question_id
+                solution_rows += answers
+            tag_rows = [
+                {"question_id": question_id, "tag_id": self._tag_ids[name]}
+                for question_id, tags in zip(question_ids, question_tags)
+                for name in tags
+            ]
+            answered = {}
+            for line, data in standalone:
+                if "question_ref" in data:
+                    question_id = refs.get(data["question_ref"], self._refs.get(data["question_ref"]))
+                else:
+                    question_id = data["question_id"] if data["question_id"] in existing_ids else None
+                if question_id is None:
+                    reference = data.get("question_ref", data.get("question_id"))
+                    self._error(line, f"unknown question {reference}")
+                    continue
+                author_id = self._author_id(line, data)
+                if author_id is None:
+                    continue
+                row = self._solution_row(data, author_id, now)
+                row["question_id"] = question_id
+                solution_rows.append(row)
+                # Questions from this chunk included: their rows only counted nested answers.
+                answered[question_id] = answered.get(question_id, 0) + 1
+
+            if tag_rows:
+                db.session.execute(insert(QuestionTag.__table__), tag_rows)
+            if solution_rows:
+                db.session.execute(insert(Solution.__table__), solution_rows)
+            if answered:
+                new_ids = set(question_ids)
+                # Questions created by this chunk keep their historical updated_at;
+                # older ones gained answers now, so incremental exports pick them up.
+                self._count_answers({q: n for q, n in answered.items() if q in new_ids})
+                self._count_answers({q: n for q, n in answered.items() if q not in new_ids}, touched_at=now)
+            SearchService.index_new_questions(
+                [{"id": question_id, **row} for question_id, row in zip(question_ids, question_rows)]
+            )
+            QuestionCache.invalidate(*answered)
+            db.session.commit()
+        except Exception as exc:
+            db.session.rollback()
+            # Tag ids created inside the rolled-back transaction are gone.
+            self._tag_ids = {}
+            first, last = chunk[0][0], chunk[-1][0]
+            self._error(first, f"chunk {first}-{last} rolled back: {exc.__class__.__name__}: {exc}")
+            return
+
+        self._refs.update(refs)
+        self.questions += len(question_ids)
+        self.solutions += len(solution_rows)
+
+    @staticmethod
+    def _solution_row(data, user_id, default_created_at):
+        created_at = _naive_utc(data.get("created_at")) or default_created_at
+        return {"user_id": user_id, "content": data["content"], "created_at": created_at, "updated_at": created_at}
+
+    @staticmethod
+    def _count_answers(answered, touched_at=None):
+        """Bump solutions_count on questions that gained answers from their own import rows.
+
+        ``updated_at`` is set to ``touched_at``, or kept as it is without one.
+        """
+        if not answered:
+            return
+        table = Question.__table__
+        db.session.execute(
+            update(table)
+            .where(table.c.id == bindparam("question_id"))
+            .values(
+                solutions_count=table.c.solutions_count + bindparam("added"),
+                updated_at=table.c.updated_at if touched_at is None else touched_at,
+            ),
+            [{"question_id": question_id, "added": added} for question_id, added in answered.items()],
+        )
@@ -0,0 +1,300 @@
+"""Cache of serialized question payloads.
+
+Entries hold the viewer-independent JSON body of a question (or of a list
+page); ``is_following`` and ``my_vote`` are overlaid per request with the
+existing batched lookups, so one cached body serves every viewer.
+
+Keys embed version counters instead of being deleted on write: a global
+generation, a list version, and one version per question. Writes record the
+question ids they touched with ``QuestionCache.invalidate``; once the
+transaction commits the matching counters are bumped, so readers never cache a
+body built from uncommitted data under a fresh version. Questions that link to
+a touched question are bumped too, since their related cards embed it.
+
+``QUESTION_CACHE_BACKEND`` selects ``local`` (in-process LRU, the default),
+``redis`` (shared between workers, via ``QUESTION_CACHE_URL``) or ``none``.
+A local store only hears about its own process's commits: writes made by other
+workers or by CLI commands (``reconcile-counters``, ``import-qa``,
+``decay-hot-scores``) bump the counters of the process that made them. Question
+bodies are then keyed on a database validator as well and never go stale, but
+list pages can lag such writes by up to ``QUESTION_CACHE_TTL``. That is why
+``create_app`` defaults to ``none`` when ``WEB_CONCURRENCY`` asks for more than
+one worker; use ``redis`` to cache across processes.
+
+With ``none`` no bodies are kept but the version counters still are, since
+they double as HTTP validators (see ``QuestionCache.validator``). If Redis
+stops answering, reads fall through to the database with one-off versions
+(nothing is served or revalidated from the cache) and a lost bump expires the
+whole generation once Redis is reachable again.
+"""
+
+import hashlib
+import json
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+from flask import current_app, has_app_context
+from sqlalchemy import event, or_, select
+from sqlalchemy.orm import Session
+
+from .. import db
+from ..models import RelatedQuestion
+
+GENERATION_KEY = "questions:generation"
+LIST_VERSION_KEY = "questions:lists"
+_ALL = "*"
+_PENDING = "question_cache_pending"
+
+
+def _version_seed():
+    # Counters start at the current time so a counter that is lost (restart,
+    # eviction in a shared store) never comes back at a value an old entry used.
+    return int(time.time() * 1000)
+
+
+class LocalCacheStore:
+    """Thread-safe in-process LRU with a TTL. Counters are never evicted."""
+
+    # Only this process's writes move the counters.
+    shared = False
+
+    def __init__(self, max_entries=2048, ttl=300):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        # Counters are per process, so validators built from them must be too.
+        self.instance = uuid.uuid4().hex[:12]
+        self._entries = OrderedDict()
+        self._counters = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        if not self.max_entries:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def versions(self, names):
+        with self._lock:
+            return [self._counters.setdefault(name, _version_seed()) for name in names]
+
+    def bump(self, names):
+        with self._lock:
+            for name in names:
+                self._counters[name] = self._counters.get(name, _version_seed()) + 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class RedisCacheStore:
+    """Shared store so every worker sees the same entries and versions.
+
+    ``redis.from_url`` connects lazily, so an outage only shows up on use;
+    every method degrades instead of raising (see the module docstring).
+    """
+
+    instance = "shared"
+    shared = True
+
+    def __init__(self, url, ttl=300):
+        import redis
+
+        self.ttl = ttl
+        self._client = redis.Redis.from_url(url)
+        self._errors = redis.RedisError
+        # Set when a bump could not be written: entries of the current
+        # generation may be stale, so the next reachable read expires them.
+        self._lost_bump = False
+
+    def _unavailable(self, action, exc):
+        current_app.logger.warning("Shared question cache unavailable (%s failed: %s)", action, exc)
+
+    def get(self, key):
+        try:
+            value = self._client.get(key)
+        except self._errors as exc:
+            self._unavailable("get", exc)
+            return None
+        return value.decode("utf-8") if value is not None else None
+
+    def set(self, key, value):
+        try:
+            self._client.set(key, value, ex=self.ttl)
+        except self._errors as exc:
+            self._unavailable("set", exc)
+
+    def versions(self, names):
+        try:
+            if self._lost_bump:
+                self._client.incr(GENERATION_KEY)
+                self._lost_bump = False
+            values = self._client.mget(names)
+            missing = [name for name, value in zip(names, values) if value is None]
+            if missing:
+                seed = _version_seed()
+                pipe = self._client.pipeline()
+                for name in missing:
+                    pipe.set(name, seed, nx=True)
+                pipe.execute()
+                values = self._client.mget(names)
+        except self._errors as exc:
+            self._unavailable("versions", exc)
+            # Versions no entry or ETag was ever built from.
+            return [f"unavailable-{uuid.uuid4().hex}" for _ in names]
+        return [int(value) for value in values]
+
+    def bump(self, names):
+        seed = _version_seed()
+        pipe = self._client.pipeline()
+        for name in names:
+            pipe.set(name, seed, nx=True)
+            pipe.incr(name)
+        try:
+            pipe.execute()
+        except self._errors as exc:
+            # Runs after the database commit: never fail the request over it.
+            self._lost_bump = True
+            current_app.logger.error("Could not expire cached questions %s: %s", names, exc)
+
+    def clear(self):
+        pass
+
+
+def _build_store(app):
+    backend = app.config.get("QUESTION_CACHE_BACKEND", "local")
+    ttl = app.config.get("QUESTION_CACHE_TTL", 300)
+    if backend == "none":
+        return LocalCacheStore(max_entries=0, ttl=ttl)
+    if backend == "redis":
+        url = app.config.get("QUESTION_CACHE_URL")
+        try:
+            if not url:
+                raise ValueError("QUESTION_CACHE_URL is not set")
+            return RedisCacheStore(url, ttl=ttl)
+        except (ImportError, ValueError) as exc:
+            app.logger.warning("Shared question cache unavailable (%s); using local cache", exc)
+    return LocalCacheStore(max_entries=app.config.get("QUESTION_CACHE_SIZE", 2048), ttl=ttl)
+
+
+def _question_version_key(question_id):
+    return f"question:{question_id}:version"
+
+
+class QuestionCache:
+    @staticmethod
+    def store():
+        extensions = current_app.extensions
+        if "question_cache" not in extensions:
+            extensions["question_cache"] = _build_store(current_app)
+        return extensions["question_cache"]
+
+    @staticmethod
+    def _load(key, build):
+        store = QuestionCache.store()
+        cached = store.get(key)
+        if cached is not None:
+            return json.loads(cached)
+        value = build()
+        if value is not None:
+            store.set(key, json.dumps(value, separators=(",", ":")))
+        return value
+
+    @staticmethod
+    def question(question_id, build, validator=None):
+        """Return the cached body for ``question_id``, calling ``build()`` on a miss.
+
+        ``validator`` (e.g. one read from the database) is folded into the key,
+        so an entry is never served once it has moved, whoever made the write.
+        """
+        _, generation, version = QuestionCache.validator(question_id)
+        key = f"question:{question_id}:{generation}:{version}"
+        if validator is not None:
+            key += ":" + hashlib.sha1(repr(tuple(validator)).encode("utf-8")).hexdigest()
+        return QuestionCache._load(key, build)
+
+    @staticmethod
+    def validator(question_id):
+        """Opaque tuple that changes whenever the question's payload may change."""
+        store = QuestionCache.store()
+        generation, version = store.versions([GENERATION_KEY, _question_version_key(question_id)])
+        return store.instance, generation, version
+
+    @staticmethod
+    def question_list(params, build):
+        """Return the cached list page for ``params`` (a JSON-able dict)."""
+        store = QuestionCache.store()
+        generation, version = store.versions([GENERATION_KEY, LIST_VERSION_KEY])
+        digest = hashlib.sha1(
+            json.dumps(params, sort_keys=True, default=str).encode("utf-8")
+        ).hexdigest()
+        return QuestionCache._load(f"questions:{generation}:{version}:{digest}", build)
+
+    @staticmethod
+    def invalidate(*question_ids):
+        """Mark questions as changed; their entries expire when the session commits."""
+        pending = db.session.info.setdefault(_PENDING, set())
+        pending.update(question_id for question_id in question_ids if question_id is not None)
+        # Every question change can move list pages (counts, order, membership).
+        pending.add(LIST_VERSION_KEY)
+
+    @staticmethod
+    def invalidate_all():
+        """Expire every entry on commit (author renames, bulk repairs)."""
+        db.session.info.setdefault(_PENDING, set()).add(_ALL)
+
+
+@event.listens_for(Session, "before_commit")
+def _expand_related(session):
+    pending = session.info.get(_PENDING)
+    question_ids = [key for key in pending or () if isinstance(key, int)]
+    if not question_ids:
+        return
+    rows = session.execute(
+        select(RelatedQuestion.question_id, RelatedQuestion.related_question_id).where(
+            or_(
+                RelatedQuestion.question_id.in_(question_ids),
+                RelatedQuestion.related_question_id.in_(question_ids),
+            )
+        )
+    )
+    for question_id, related_question_id in rows:
+        pending.update((question_id, related_question_id))
+
+
+@event.listens_for(Session, "after_commit")
+def _bump_versions(session):
+    pending = session.info.pop(_PENDING, None)
+    if not pending or not has_app_context():
+        return
+    store = QuestionCache.store()
+    if _ALL in pending:
+        store.bump([GENERATION_KEY])
+        store.clear()
+        return
+    store.bump(
+        [key if isinstance(key, str) else _question_version_key(key) for key in pending]
+    )
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_pending(session, previous_transaction):
+    if previous_transaction.parent is None:
+        session.info.pop(_PENDING, None)
@@ -1,53 +1,97 @@
-from sqlalchemy import or_
-from sqlalchemy.orm import joinedload
+from datetime import datetime
 
 from .. import db
 from ..models.question import Question
 from ..models.tag import Tag
 from ..models.user import User
 from ..models.follow import Follow
+from ..models.question_tag import QuestionTag
 from ..models.related_question import RelatedQuestion
 from ..models.solution import Solution
 from ..schemas.question_schema import QuestionCreateSchema
 from marshmallow import ValidationError
-
+from sqlalchemy import case, false, func, or_, select
+from sqlalchemy.orm import aliased, selectinload
+
+from .duplicate_service import DuplicateService
+from .engagement_counters import EngagementCounters
+from .field_selection import FieldSelection
+from .loader_profiles import loader_options, selection_options
+from .pagination import keyset_page
+from .question_cache import QuestionCache
+from .search_service import SearchService
+from .serialization_memo import SerializationMemo
+from .similarity_service import SimilarityService
 from .solution_service import SolutionService
+from .vote_buffer import VoteBuffer
+
+MAX_CURSOR_PAGE_SIZE = 100
+MAX_TAG_FILTERS = 10
+TAG_MATCH_MODES = ("any", "all")
+
+# Newest-first feed order; id breaks ties so the keyset order is total.
+FEED_KEYS = [(Question.created_at, True), (Question.id, True)]
+# sort=hot: hottest first, served by ix_questions_hot_score_id.
+HOT_KEYS = [(Question.hot_score, True), (Question.id, True)]
+SORT_ORDERS = ("newest", "hot")
+
+# Relations ``?expand=`` may name, and what list and detail reads embed by default.
+QUESTION_EXPANSIONS = ("author", "answers", "related")
+LIST_EXPAND = ("author",)
+DETAIL_EXPAND = QUESTION_EXPANSIONS
 
 
 class QuestionService:
     @staticmethod
-    def _base_query():
-        return Question.query.options(
-            joinedload(Question.author),
-            joinedload(Question.tags),
-            joinedload(Question.solutions).joinedload(Solution.author),
-            joinedload(Question.solutions).joinedload(Solution.votes),
-            joinedload(Question.follows),
-            joinedload(Question.related_questions).joinedload(Question.author),
-            joinedload(Question.related_questions).joinedload(Question.tags),
-            joinedload(Question.related_questions).joinedload(Question.follows),
-            joinedload(Question.related_questions).joinedload(Question.solutions),
-            joinedload(Question.related_to).joinedload(Question.author),
-            joinedload(Question.related_to).joinedload(Question.tags),
-            joinedload(Question.related_to).joinedload(Question.follows),
-            joinedload(Question.related_to).joinedload(Question.solutions),
+    def _base_query(profile="detail"):
+        return Question.query.options(*loader_options(profile))
+
+    @staticmethod
+    def selection(args=None, detail=False):
+        """Parse ``?fields=``/``?expand=`` for question reads; raises InvalidFieldSelection."""
+        return FieldSelection.from_args(
+            args or {},
+            default_expand=DETAIL_EXPAND if detail else LIST_EXPAND,
+            allowed_expand=QUESTION_EXPANSIONS,
+        )
+
+    @staticmethod
+    def _followed_ids(question_ids, user_id):
+        """Return the subset of ``question_ids`` that ``user_id`` follows, in one query."""
+        user_id = SolutionService._user_id(user_id)
+        if user_id is None or not question_ids:
+            return set()
+        rows = (
+            db.session.query(Follow.question_id)
+            .filter(Follow.user_id == user_id, Follow.question_id.in_(question_ids))
+            .all()
         )
+        return {question_id for (question_id,) in rows}
 
     @staticmethod
-    def _serialize_question(question, include_answers=False, current_user_id=None):
-        tags = [tag.name for tag in getattr(question, "tags", [])]
-        author = question.author.to_dict() if getattr(question, "author", None) else None
-        solutions = list(getattr(question, "solutions", []))
-        follows = list(getattr(question, "follows", []))
-
-        vote_total = sum(solution.get_vote_count() for solution in solutions)
-        upvotes_total = sum(solution.get_upvotes() for solution in solutions)
-        downvotes_total = sum(solution.get_downvotes() for solution in solutions)
-        view_count = len(follows)
+    def _serialize_question(
+        question,
+        include_answers=False,
+        include_related=False,
+        current_user_id=None,
+        followed_ids=None,
+        my_votes=None,
+        include_author=True,
+        include_tags=True,
+    ):
+        author = None
+        if include_author:
+            author = SerializationMemo.user(getattr(question, "author", None))
+        solutions_count = question.solutions_count or 0
+
+        vote_total = question.vote_total or 0
+        upvotes_total = question.upvotes_total or 0
+        downvotes_total = question.downvotes_total or 0
+        view_count = question.follows_count or 0
         bounty_value = (
             50 if question.problem_type and "bounty" in question.problem_type.lower() else 0
         )
-        is_solved = len(solutions) > 0
+        is_solved = solutions_count > 0
         is_featured = vote_total >= 5 or view_count >= 5 or bounty_value > 0
 
         created_at = question.created_at.isoformat() if question.created_at else None
@@ -62,11 +106,8 @@ class QuestionService:
             "created_at": created_at,
             "updated_at": updated_at,
             "timestamp": created_at,
-            "author": author,
             "authorId": author.get("id") if author else question.user_id,
-            "authorName": author.get("name") if author else None,
-            "tags": tags,
-            "solutions_count": len(question.solutions),
+            "solutions_count": solutions_count,
             "follows_count": view_count,
             "view_count": view_count,
             "views": view_count,
@@ -79,19 +120,32 @@ class QuestionService:
             "is_solved": is_solved,
             "is_featured": is_featured,
         }
+        if include_author:
+            base["author"] = author
+            base["authorName"] = author.get("name") if author else None
+        if include_tags:
+            base["tags"] = SerializationMemo.tag_names(question)
 
         if include_answers:
             ordered_solutions = sorted(
                 question.solutions,
                 key=lambda sol: (sol.created_at.timestamp() if sol.created_at else 0),
             )
+            my_votes = my_votes or {}
             base["answers"] = [
-                SolutionService._serialize_solution(solution, current_user_id=current_user_id)
+                SolutionService._serialize_solution(
+                    solution,
+                    current_user_id=current_user_id,
+                    my_vote=my_votes.get(solution.id, 0),
+                )
                 for solution in ordered_solutions
             ]
 
         if current_user_id is not None:
-            base["is_following"] = any(f.user_id == current_user_id for f in question.follows)
+            base["is_following"] = question.id in (followed_ids or ())
+
+        if not include_related:
+            return base
 
         related_candidates = []
         seen_related_ids = set()
@@ -103,7 +157,7 @@ class QuestionService:
                 continue
             seen_related_ids.add(related.id)
 
-            related_author = related.author.to_dict() if getattr(related, "author", None) else None
+            related_author = SerializationMemo.user(getattr(related, "author", None))
             related_created = related.created_at.isoformat() if related.created_at else None
             related_updated = related.updated_at.isoformat() if related.updated_at else None
 
@@ -113,9 +167,9 @@ class QuestionService:
                     "title": related.title,
                     "description": related.description,
                     "problem_type": related.problem_type,
-                    "tags": [tag.name for tag in getattr(related, "tags", [])],
-                    "follows_count": len(getattr(related, "follows", [])),
-                    "solutions_count": len(getattr(related, "solutions", [])),
+                    "tags": SerializationMemo.tag_names(related),
+                    "follows_count": related.follows_count or 0,
+                    "solutions_count": related.solutions_count or 0,
                     "author": related_author,
                     "authorId": related_author.get("id") if related_author else related.user_id,
                     "authorName": related_author.get("name") if related_author else None,
@@ -132,31 +186,240 @@ class QuestionService:
         return base
 
     @staticmethod
-    def get_questions(page=1, per_page=10, problem_type=None, search=None, current_user_id=None, created_by=None):
-        """Return paginated list of questions."""
+    def _serialize_list(questions, current_user_id=None, selection=None):
+        selection = selection or QuestionService.selection()
+        followed_ids = QuestionService._followed_ids(
+            [question.id for question in questions], current_user_id
+        )
+        return [
+            QuestionService._serialize_question(
+                question,
+                include_answers=selection.wants("answers"),
+                include_related=selection.wants("related"),
+                current_user_id=current_user_id,
+                followed_ids=followed_ids,
+                include_author=selection.wants("author"),
+                include_tags=selection.wants("tags"),
+            )
+            for question in questions
+        ]
+
+    @staticmethod
+    def _overlay_viewer(items, current_user_id, selection=None, buffered=None):
+        """Add ``is_following`` and the answers' ``my_vote`` to cached, viewer-independent question dicts.
+
+        Each is one query for the whole page, however many questions and answers it holds.
+        ``buffered`` is the viewer's vote-buffer snapshot, taken before ``items`` were read.
+        """
+        if current_user_id is None or not items:
+            return items
+        if selection is None or selection.includes("is_following"):
+            followed_ids = QuestionService._followed_ids([item["id"] for item in items], current_user_id)
+            for item in items:
+                item["is_following"] = item["id"] in followed_ids
+
+        answers = [answer for item in items for answer in item.get("answers") or ()]
+        if answers:
+            if buffered is None:
+                buffered = SolutionService._buffered_votes(current_user_id)
+            my_votes = SolutionService._my_votes([answer["id"] for answer in answers], current_user_id)
+            for answer in answers:
+                answer["my_vote"] = answer["user_vote"] = my_votes.get(answer["id"], 0)
+            VoteBuffer.overlay(answers, buffered)
+        return items
+
+    @staticmethod
+    def parse_tags(raw):
+        """Split ``?tags=python,flask`` into distinct lower-case names (max MAX_TAG_FILTERS)."""
+        names = []
+        for name in (raw or "").split(","):
+            name = name.strip().lower()
+            if name and name not in names:
+                names.append(name)
+        if len(names) > MAX_TAG_FILTERS:
+            raise ValueError(f"At most {MAX_TAG_FILTERS} tags can be combined")
+        return names
+
+    @staticmethod
+    def _filter_by_tags(query, names, match="any"):
+        """Semi-join on question_tags, served by its (tag_id, question_id) index.
+
+        Names are resolved to ids first so the subquery never touches ``tags``;
+        "all" keeps the questions that matched every id (question_tags is unique
+        per pair, so a plain count suffices).
+        """
+        tag_ids = [tag_id for (tag_id,) in db.session.query(Tag.id).filter(Tag.name.in_(names))]
+        if not tag_ids or (match == "all" and len(tag_ids) < len(names)):
+            return query.filter(false())
+        tagged = select(QuestionTag.question_id).where(QuestionTag.tag_id.in_(tag_ids))
+        if match == "all" and len(tag_ids) > 1:
+            tagged = tagged.group_by(QuestionTag.question_id).having(
+                func.count(QuestionTag.tag_id) == len(tag_ids)
+            )
+        return query.filter(Question.id.in_(tagged))
+
+    @staticmethod
+    def _with_highlights(items, search, hits):
+        if hits is None or not items:
+            return items
+        highlights = SearchService.highlights(search, [item["id"] for item in items])
+        for item in items:
+            if item["id"] in highlights:
+                item["highlight"] = highlights[item["id"]]
+        return items
+
+    @staticmethod
+    def get_questions(
+        page=1,
+        per_page=10,
+        problem_type=None,
+        search=None,
+        current_user_id=None,
+        created_by=None,
+        cursor=None,
+        selection=None,
+        tags=None,
+        tag_match="any",
+        sort="newest",
+    ):
+        """Return a page of questions.
+
+        Passing ``cursor`` (an empty string for the first page) switches to keyset
+        pagination on (created_at, id): the result carries ``next_cursor`` instead
+        of page counts, and no OFFSET or COUNT(*) is issued. Raises InvalidCursor
+        for a malformed cursor.
+
+        ``selection`` (see ``QuestionService.selection``) trims each item; only the
+        default shape is cached, sparse pages are built with a matching loader.
+
+        ``tags`` restricts the page to questions carrying any (``tag_match="any"``)
+        or all (``"all"``) of the named tags. ``sort="hot"`` orders by ``hot_score``
+        (see HotRanking) instead of recency, in both pagination modes.
+        """
+        selection = selection or QuestionService.selection()
+        buffered = SolutionService._buffered_votes(current_user_id)
+        params = {
+            "page": page,
+            "per_page": per_page,
+            "problem_type": problem_type,
+            "search": search,
+            "created_by": created_by,
+            "cursor": cursor,
+            "tags": sorted(tags) if tags else None,
+            "tag_match": tag_match,
+            "sort": sort,
+        }
+
+        def build():
+            return QuestionService._question_page(**params, selection=selection)
+
+        if selection.is_default:
+            result = QuestionCache.question_list(params, build)
+        else:
+            result = build()
+        QuestionService._overlay_viewer(result["items"], current_user_id, selection, buffered)
+        result["items"] = [selection.project(item) for item in result["items"]]
+        return result
+
+    @staticmethod
+    def get_questions_by_ids(ids, current_user_id=None, selection=None):
+        """List cards for ``ids`` in the order given, plus the ids that do not exist.
+
+        One query with the list loader (tags come in with its single IN load),
+        whatever the batch size.
+        """
+        selection = selection or QuestionService.selection()
+        buffered = SolutionService._buffered_votes(current_user_id)
+        questions = (
+            Question.query.options(*selection_options(selection))
+            .filter(Question.id.in_(ids))
+            .all()
+        )
+        by_id = {question.id: question for question in questions}
+        found = [by_id[question_id] for question_id in ids if question_id in by_id]
+        items = QuestionService._serialize_list(found, selection=selection)
+        QuestionService._overlay_viewer(items, current_user_id, selection, buffered)
+        items = [selection.project(item) for item in items]
+        return items, [question_id for question_id in ids if question_id not in by_id]
+
+    @staticmethod
+    def get_questions_by_tag(name, cursor="", per_page=20, current_user_id=None, selection=None):
+        """Keyset page of one tag's questions, newest first; None if the tag does not exist."""
+        name = (name or "").strip().lower()
+        if db.session.query(Tag.id).filter(Tag.name == name).first() is None:
+            return None
+        return QuestionService.get_questions(
+            per_page=per_page,
+            current_user_id=current_user_id,
+            cursor=cursor or "",
+            selection=selection,
+            tags=[name],
+        )
 
-        query = QuestionService._base_query()
+    @staticmethod
+    def _question_page(
+        page,
+        per_page,
+        problem_type,
+        search,
+        created_by,
+        cursor,
+        selection,
+        tags=None,
+        tag_match="any",
+        sort="newest",
+    ):
+        query = Question.query.options(*selection_options(selection))
+        highlight_search = search if selection.includes("highlight") else None
 
         if problem_type:
             query = query.filter(Question.problem_type == problem_type)
 
-        if search:
-            like = f"%{search}%"
-            query = query.filter(or_(Question.title.ilike(like), Question.description.ilike(like)))
+        if tags:
+            query = QuestionService._filter_by_tags(query, tags, tag_match)
+
+        hits = SearchService.match(search) if search else None
+        if hits is not None:
+            query = query.join(hits, hits.c.question_id == Question.id)
 
         if created_by:
             query = query.filter(Question.user_id == created_by)
 
-        query = query.order_by(Question.created_at.desc())
-        pagination = db.paginate(query, page=page, per_page=per_page, error_out=False)
-
-        items = [
-            QuestionService._serialize_question(question, include_answers=False, current_user_id=current_user_id)
-            for question in pagination.items
-        ]
+        if cursor is not None:
+            # Cursor mode keeps the feed order; search only filters here.
+            per_page = max(1, min(per_page, MAX_CURSOR_PAGE_SIZE))
+            questions, next_cursor = keyset_page(
+                query,
+                HOT_KEYS if sort == "hot" else FEED_KEYS,
+                cursor=cursor,
+                per_page=per_page,
+            )
+            return {
+                "items": QuestionService._with_highlights(
+                    QuestionService._serialize_list(questions, selection=selection),
+                    highlight_search,
+                    hits,
+                ),
+                "per_page": per_page,
+                "next_cursor": next_cursor,
+                "has_more": next_cursor is not None,
+            }
+
+        if sort == "hot":
+            query = query.order_by(Question.hot_score.desc(), Question.id.desc())
+        elif hits is not None:
+            query = query.order_by(hits.c.rank.asc(), Question.id.desc())
+        else:
+            query = query.order_by(Question.created_at.desc(), Question.id.desc())
+        # Query.paginate keeps the loader options; db.paginate would drop them.
+        pagination = query.paginate(page=page, per_page=per_page, error_out=False)
 
         return {
-            "items": items,
+            "items": QuestionService._with_highlights(
+                QuestionService._serialize_list(pagination.items, selection=selection),
+                highlight_search,
+                hits,
+            ),
             "current_page": pagination.page,
             "pages": pagination.pages,
             "per_page": pagination.per_page,
@@ -164,11 +427,129 @@ class QuestionService:
         }
 
     @staticmethod
-    def get_question_by_id(question_id, current_user_id=None):
-        question = QuestionService._base_query().filter(Question.id == question_id).first()
+    def get_question_by_id(question_id, current_user_id=None, selection=None, validator=None):
+        """``validator`` is ``cache_validator(question_id)`` when the caller already read it."""
+        selection = selection or QuestionService.selection(detail=True)
+        buffered = SolutionService._buffered_votes(current_user_id)
+        if selection.is_default:
+            if QuestionCache.store().shared:
+                validator = None
+            elif validator is None:
+                # A process-local entry must not outlive a write made by another process.
+                validator = QuestionService._database_validator(question_id)
+            question = QuestionCache.question(
+                question_id, lambda: QuestionService._question_body(question_id, selection), validator
+            )
+        else:
+            question = QuestionService._question_body(question_id, selection)
+        if question is None:
+            return None
+
+        QuestionService._overlay_viewer([question], current_user_id, selection, buffered)
+        return selection.project(question)
+
+    @staticmethod
+    def _similar_cards(matches, current_user_id=None):
+        """Serialize ``(question_id, score)`` matches as list cards, best first."""
+        if not matches:
+            return []
+        ids = [question_id for question_id, _ in matches]
+        questions = QuestionService._base_query("list").filter(Question.id.in_(ids)).all()
+        by_id = {question.id: question for question in questions}
+        items = QuestionService._serialize_list(
+            [by_id[question_id] for question_id in ids if question_id in by_id], current_user_id
+        )
+        scores = dict(matches)
+        for item in items:
+            item["similarity"] = round(scores[item["id"]], 4)
+        return items
+
+    @staticmethod
+    def get_similar_questions(question_id, limit=5, current_user_id=None):
+        """Questions most similar to ``question_id``; None if it does not exist."""
+        question = (
+            Question.query.options(selectinload(Question.tags))
+            .filter(Question.id == question_id)
+            .first()
+        )
+        if not question:
+            return None
+        matches = SimilarityService.similar_to_question(question, limit=limit)
+        return QuestionService._similar_cards(matches, current_user_id)
+
+    @staticmethod
+    def find_similar_questions(title, description="", limit=5, current_user_id=None):
+        """Questions similar to a draft, for the ask dialog."""
+        matches = SimilarityService.similar_to_text(title, description, limit=limit)
+        return QuestionService._similar_cards(matches, current_user_id)
+
+    @staticmethod
+    def find_duplicate_questions(title, description="", limit=5, current_user_id=None):
+        """Likely duplicates of a draft (estimated Jaccard >= DUPLICATE_THRESHOLD)."""
+        matches = DuplicateService.find(title, description, limit=limit)
+        return QuestionService._similar_cards(matches, current_user_id)
+
+    @staticmethod
+    def cache_validator(question_id):
+        """Cheap version tuple for ``question_id``; it moves on every write that
+        can change the question's payload or its answers.
+
+        A shared cache store's counters are moved by every process (CLI
+        commands included), so they validate without touching the DB. A
+        process-local store only sees its own process's writes, so the tuple
+        is read from the database instead, in one statement.
+        """
+        if QuestionCache.store().shared:
+            return QuestionCache.validator(question_id)
+        return QuestionService._database_validator(question_id)
+
+    @staticmethod
+    def _database_validator(question_id):
+        """The question's ``updated_at`` (counters, follows and tag edits move it),
+        its answers' count and latest ``updated_at`` (edits and votes), its authors'
+        latest ``updated_at`` (renames) and its related links, in one statement
+        served by primary keys and the question_id indexes."""
+        answers = Solution.question_id == question_id
+        links = or_(RelatedQuestion.question_id == question_id, RelatedQuestion.related_question_id == question_id)
+        linked_ids = select(
+            case(
+                (RelatedQuestion.question_id == question_id, RelatedQuestion.related_question_id),
+                else_=RelatedQuestion.question_id,
+            )
+        ).where(links)
+        linked = aliased(Question)
+        row = db.session.execute(
+            select(
+                Question.updated_at,
+                select(func.count(Solution.id)).where(answers).scalar_subquery(),
+                select(func.max(Solution.updated_at)).where(answers).scalar_subquery(),
+                select(func.max(User.updated_at))
+                .where(or_(User.id == Question.user_id, User.id.in_(select(Solution.user_id).where(answers))))
+                .scalar_subquery(),
+                select(func.count(RelatedQuestion.id)).where(links).scalar_subquery(),
+                select(func.max(RelatedQuestion.id)).where(links).scalar_subquery(),
+                select(func.max(linked.updated_at)).where(linked.id.in_(linked_ids)).scalar_subquery(),
+            ).where(Question.id == question_id)
+        ).first()
+        return ("db", *row) if row is not None else ("db", None)
+
+    @staticmethod
+    def _question_body(question_id, selection):
+        """Viewer-independent detail payload; the default shape is what the cache stores."""
+        question = (
+            Question.query.options(*selection_options(selection))
+            .filter(Question.id == question_id)
+            .first()
+        )
         if not question:
             return None
-        return QuestionService._serialize_question(question, include_answers=True, current_user_id=current_user_id)
+        return QuestionService._serialize_question(
+            question,
+            include_answers=selection.wants("answers"),
+            include_related=selection.wants("related"),
+            include_author=selection.wants("author"),
+            include_tags=selection.wants("tags"),
+        )
 
     @staticmethod
     def create_question(data, user_id):
@@ -179,6 +560,7 @@ class QuestionService:
             return {"error": err.messages}, 400
 
         tag_ids = payload.pop("tag_ids", [])
+        duplicates = DuplicateService.find(payload["title"], payload["description"])
 
         question = Question(
             title=payload["title"],
@@ -193,12 +575,19 @@ class QuestionService:
                 question.tags = tags
 
             db.session.add(question)
+            db.session.flush()
+            SearchService.index_question(question)
+            QuestionCache.invalidate(question.id)
             db.session.commit()
         except Exception as exc:
             db.session.rollback()
             return {"error": str(exc)}, 500
 
-        return QuestionService.get_question_by_id(question.id, current_user_id=user_id), 201
+        SimilarityService.index_question(question)
+        DuplicateService.index_question(question)
+        result = QuestionService.get_question_by_id(question.id, current_user_id=user_id)
+        result["duplicates"] = QuestionService._similar_cards(duplicates, user_id)
+        return result, 201
 
     @staticmethod
     def update_question(question_id, data, user_id):
@@ -223,14 +612,25 @@ class QuestionService:
 
         if "tag_ids" in payload:
             tags = Tag.query.filter(Tag.id.in_(payload["tag_ids"])).all()
+            if {tag.id for tag in tags} != {tag.id for tag in question.tags}:
+                # Association rows alone leave the question row, and so
+                # updated_at (export's updated_since), untouched.
+                question.updated_at = datetime.utcnow()
             question.tags = tags
 
         try:
+            if "title" in payload or "description" in payload:
+                SearchService.index_question(question)
+            QuestionCache.invalidate(question.id)
             db.session.commit()
         except Exception as exc:
             db.session.rollback()
             return {"error": str(exc)}, 500
 
+        if {"title", "description", "tag_ids"} & payload.keys():
+            SimilarityService.index_question(question)
+        if {"title", "description"} & payload.keys():
+            DuplicateService.index_question(question)
         return QuestionService.get_question_by_id(question.id, current_user_id=user_id), 200
 
     @staticmethod
@@ -245,12 +645,16 @@ class QuestionService:
                 return {"error": "Not authorized to delete this question"}, 403
 
         try:
+            SearchService.remove_question(question.id)
+            QuestionCache.invalidate(question.id)
             db.session.delete(question)
             db.session.commit()
         except Exception as exc:
             db.session.rollback()
             return {"error": str(exc)}, 500
 
+        SimilarityService.remove_question(question_id)
+        DuplicateService.remove_question(question_id)
         return {"message": "Question deleted"}, 200
 
     @staticmethod
@@ -261,6 +665,7 @@ class QuestionService:
 
         follow = Follow(question_id=question_id, user_id=user_id)
         db.session.add(follow)
+        EngagementCounters.follow_changed(question_id, 1)
         db.session.commit()
         return {"message": "Followed"}, 201
 
@@ -271,6 +676,7 @@ class QuestionService:
             return {"error": "Not following"}, 404
 
         db.session.delete(follow)
+        EngagementCounters.follow_changed(question_id, -1)
         db.session.commit()
         return {"message": "Unfollowed"}, 200
 
@@ -287,5 +693,6 @@ class QuestionService:
 
         relation = RelatedQuestion(question_id=question_id, related_question_id=related_question_id)
         db.session.add(relation)
+        QuestionCache.invalidate(question_id, related_question_id)
         db.session.commit()
         return {"message": "Linked"}, 201
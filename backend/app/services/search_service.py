@@ -0,0 +1,306 @@
+"""Ranked full-text search over questions.
+
+The backend is picked per database: SQLite uses an FTS5 virtual table kept in
+sync by QuestionService writes, PostgreSQL uses a generated ``tsvector`` column
+with a GIN index (created by migration, so it syncs itself). Anything else falls
+back to the old ILIKE filter without ranking. Set ``SEARCH_BACKEND`` to
+``sqlite``, ``postgres`` or ``like`` to override the automatic choice.
+"""
+
+import html
+import re
+import sqlite3
+
+from flask import current_app
+from sqlalchemy import Float, Integer, column, func, literal, literal_column, or_, select, text
+
+from .. import db
+from ..models import Question
+
+# Control characters never appear in user text, so highlights can be marked
+# with them, the whole fragment HTML-escaped, and the markers swapped for <mark>.
+_MARK_START = "\x02"
+_MARK_END = "\x03"
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+
+def _terms(raw):
+    return [token.lower() for token in _TOKEN.findall(raw or "")][:16]
+
+
+def _render_highlight(fragment):
+    if fragment is None:
+        return None
+    escaped = html.escape(fragment)
+    return escaped.replace(_MARK_START, "<mark>").replace(_MARK_END, "</mark>")
+
+
+class LikeSearchBackend:
+    """Unranked substring match; used when no full-text engine is available."""
+
+    name = "like"
+
+    def match(self, raw):
+        if not raw or not raw.strip():
+            return None
+        like = f"%{raw.strip()}%"
+        return (
+            select(Question.id.label("question_id"), literal(0.0).label("rank"))
+            .where(or_(Question.title.ilike(like), Question.description.ilike(like)))
+            .subquery("search_hits")
+        )
+
+    def highlights(self, raw, question_ids):
+        return {}
+
+    def index(self, question):
+        pass
+
+    def index_many(self, rows):
+        pass
+
+    def remove(self, question_id):
+        pass
+
+    def rebuild(self):
+        return 0
+
+
+class SqliteSearchBackend:
+    """FTS5 table ``questions_fts`` whose rowid is the question id; ranked by BM25."""
+
+    name = "sqlite"
+    table = "questions_fts"
+
+    def __init__(self):
+        self._ready = False
+
+    def _ensure_schema(self):
+        """Create the table on first use; True if it was just created (and populated)."""
+        if self._ready:
+            return False
+        exists = db.session.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+            {"name": self.table},
+        ).first()
+        if not exists:
+            db.session.execute(
+                text(
+                    f"CREATE VIRTUAL TABLE {self.table} USING fts5("
+                    "title, description, tokenize = 'porter unicode61')"
+                )
+            )
+            self._populate()
+        self._ready = True
+        return not exists
+
+    def _populate(self):
+        db.session.execute(
+            text(
+                f"INSERT INTO {self.table} (rowid, title, description) "
+                "SELECT id, title, description FROM questions"
+            )
+        )
+
+    @staticmethod
+    def _query(raw):
+        terms = _terms(raw)
+        if not terms:
+            return None
+        # Quote each term so FTS operators in user input are inert; prefix-match
+        # the terms so search-as-you-type hits partial words.
+        return " ".join(f'"{term}"*' for term in terms)
+
+    def match(self, raw):
+        query = self._query(raw)
+        if query is None:
+            return None
+        self._ensure_schema()
+        # Title matches weigh ten times description matches.
+        return (
+            text(
+                f"SELECT rowid AS question_id, bm25({self.table}, 10.0, 1.0) AS rank "
+                f"FROM {self.table} WHERE {self.table} MATCH :search_query"
+            )
+            .bindparams(search_query=query)
+            .columns(column("question_id", Integer), column("rank", Float))
+            .subquery("search_hits")
+        )
+
+    def highlights(self, raw, question_ids):
+        query = self._query(raw)
+        if query is None or not question_ids:
+            return {}
+        self._ensure_schema()
+        ids = ", ".join(str(int(question_id)) for question_id in question_ids)
+        rows = db.session.execute(
+            text(
+                f"SELECT rowid, highlight({self.table}, 0, :start, :end), "
+                f"snippet({self.table}, 1, :start, :end, '…', 24) "
+                f"FROM {self.table} WHERE {self.table} MATCH :search_query AND rowid IN ({ids})"
+            ),
+            {"search_query": query, "start": _MARK_START, "end": _MARK_END},
+        )
+        return {
+            row[0]: {"title": _render_highlight(row[1]), "snippet": _render_highlight(row[2])}
+            for row in rows
+        }
+
+    def index(self, question):
+        self._ensure_schema()
+        self.remove(question.id)
+        db.session.execute(
+            text(
+                f"INSERT INTO {self.table} (rowid, title, description) "
+                "VALUES (:id, :title, :description)"
+            ),
+            {"id": question.id, "title": question.title, "description": question.description},
+        )
+
+    def index_many(self, rows):
+        """Index freshly inserted questions (dicts of id, title, description) in one executemany."""
+        if not rows:
+            return
+        if self._ensure_schema():
+            # Creating the table populated it from ``questions``, rows included.
+            return
+        db.session.execute(
+            text(
+                f"INSERT INTO {self.table} (rowid, title, description) "
+                "VALUES (:id, :title, :description)"
+            ),
+            [{"id": row["id"], "title": row["title"], "description": row["description"]} for row in rows],
+        )
+
+    def remove(self, question_id):
+        self._ensure_schema()
+        db.session.execute(text(f"DELETE FROM {self.table} WHERE rowid = :id"), {"id": question_id})
+
+    def rebuild(self):
+        self._ensure_schema()
+        db.session.execute(text(f"DELETE FROM {self.table}"))
+        self._populate()
+        return db.session.execute(text(f"SELECT count(*) FROM {self.table}")).scalar()
+
+
+class PostgresSearchBackend:
+    """``questions.search_vector`` is a generated tsvector column with a GIN index."""
+
+    name = "postgres"
+    config = "english"
+
+    def _tsquery(self, raw):
+        terms = _terms(raw)
+        if not terms:
+            return None
+        return func.to_tsquery(self.config, " & ".join(f"{term}:*" for term in terms))
+
+    def match(self, raw):
+        tsquery = self._tsquery(raw)
+        if tsquery is None:
+            return None
+        vector = literal_column("questions.search_vector")
+        # ts_rank is "higher is better"; negate it so every backend sorts ascending.
+        return (
+            select(Question.id.label("question_id"), (-func.ts_rank(vector, tsquery)).label("rank"))
+            .where(vector.op("@@")(tsquery))
+            .subquery("search_hits")
+        )
+
+    def highlights(self, raw, question_ids):
+        tsquery = self._tsquery(raw)
+        if tsquery is None or not question_ids:
+            return {}
+        options = f"StartSel={_MARK_START}, StopSel={_MARK_END}, MaxWords=24, MinWords=8"
+        title_options = f"StartSel={_MARK_START}, StopSel={_MARK_END}, HighlightAll=true"
+        rows = db.session.execute(
+            select(
+                Question.id,
+                func.ts_headline(self.config, Question.title, tsquery, title_options),
+                func.ts_headline(self.config, Question.description, tsquery, options),
+            ).where(Question.id.in_(question_ids))
+        )
+        return {
+            row[0]: {"title": _render_highlight(row[1]), "snippet": _render_highlight(row[2])}
+            for row in rows
+        }
+
+    def index(self, question):
+        pass
+
+    def index_many(self, rows):
+        pass
+
+    def remove(self, question_id):
+        pass
+
+    def rebuild(self):
+        db.session.execute(text("REINDEX INDEX ix_questions_search_vector"))
+        return db.session.query(func.count(Question.id)).scalar()
+
+
+BACKENDS = {
+    "like": LikeSearchBackend,
+    "sqlite": SqliteSearchBackend,
+    "postgres": PostgresSearchBackend,
+}
+
+
+class SearchService:
+    @staticmethod
+    def _detect():
+        configured = current_app.config.get("SEARCH_BACKEND", "auto")
+        if configured in BACKENDS:
+            return BACKENDS[configured]()
+
+        dialect = db.engine.dialect.name
+        if dialect == "postgresql":
+            return PostgresSearchBackend()
+        if dialect == "sqlite":
+            # Probe on a private connection: the app's pool may share one DBAPI
+            # connection with the caller's open transaction (in-memory databases).
+            probe = sqlite3.connect(":memory:")
+            try:
+                probe.execute("CREATE VIRTUAL TABLE fts5_probe USING fts5(x)")
+                return SqliteSearchBackend()
+            except sqlite3.OperationalError:
+                current_app.logger.warning("SQLite lacks FTS5; falling back to LIKE search")
+            finally:
+                probe.close()
+        return LikeSearchBackend()
+
+    @staticmethod
+    def backend():
+        backend = current_app.extensions.get("question_search")
+        if backend is None:
+            backend = SearchService._detect()
+            current_app.extensions["question_search"] = backend
+        return backend
+
+    @staticmethod
+    def match(raw):
+        """Subquery of (question_id, rank) for ``raw``; lower rank is better. None if empty."""
+        return SearchService.backend().match(raw)
+
+    @staticmethod
+    def highlights(raw, question_ids):
+        return SearchService.backend().highlights(raw, question_ids)
+
+    @staticmethod
+    def index_question(question):
+        SearchService.backend().index(question)
+
+    @staticmethod
+    def index_new_questions(rows):
+        """Index questions that bypassed the ORM (bulk import); ``rows`` carry id, title, description."""
+        SearchService.backend().index_many(rows)
+
+    @staticmethod
+    def remove_question(question_id):
+        SearchService.backend().remove(question_id)
+
+    @staticmethod
+    def rebuild():
+        count = SearchService.backend().rebuild()
+        db.session.commit()
+        return count
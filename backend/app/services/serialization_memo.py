@@ -0,0 +1,51 @@
+"""Request-scoped memo for serialized users and tags.
+
+A question thread repeats the same few people: the asker, each answerer, the
+authors of related questions. ``SerializationMemo.user`` builds each user's
+dict once per request and hands the same (read-only) dict to every payload
+that embeds it; ``tag_names`` does the same for a question's tag list, which
+recurs when a question shows up both as an item and as a related card.
+
+The memo lives in the request's WSGI environ rather than on ``flask.g``:
+``g`` belongs to the app context, which requests share whenever one is
+already pushed (the test suite, CLI code issuing requests). Outside a request
+(CLI commands, jobs) every call simply builds a fresh value. Entries are keyed
+by primary key: code that modifies a user mid-request must serialize it with
+``to_dict()`` directly, as the auth routes do.
+"""
+
+from flask import has_request_context, request
+
+_ENVIRON_KEY = "moringadesk.serialization_memo"
+
+
+def _memo():
+    if not has_request_context():
+        return None
+    return request.environ.setdefault(_ENVIRON_KEY, {})
+
+
+class SerializationMemo:
+    @staticmethod
+    def _get(key, build):
+        memo = _memo()
+        if memo is None:
+            return build()
+        value = memo.get(key)
+        if value is None:
+            value = memo[key] = build()
+        return value
+
+    @staticmethod
+    def user(user):
+        """``user.to_dict()``, built once per user per request; None for no user."""
+        if user is None:
+            return None
+        return SerializationMemo._get(("user", user.id), user.to_dict)
+
+    @staticmethod
+    def tag_names(question):
+        """Names of ``question``'s tags, built once per question per request."""
+        return SerializationMemo._get(
+            ("tag_names", question.id), lambda: [tag.name for tag in question.tags]
+        )
@@ -0,0 +1,350 @@
+"""TF-IDF similarity index over question titles, descriptions and tags.
+
+Postings are kept term-major (one sparse row per term, one column per indexed
+question), so a lookup only touches the rows of the query's terms: scoring is a
+weighted sum of a handful of posting rows followed by an ``argpartition`` for
+the top k, independent of how many questions share no term with the query.
+
+New and edited questions go into a small in-memory delta that is folded into
+the postings every ``MERGE_THRESHOLD`` adds; their IDF weights are those known
+when they were added, and ``flask similarity-rebuild`` recomputes everything
+and writes the index to ``SIMILARITY_INDEX_PATH``. Saved arrays are loaded with
+``mmap_mode="r"`` so workers share the OS page cache instead of copying them.
+"""
+
+import hashlib
+import json
+import math
+import os
+import re
+import threading
+from collections import Counter
+
+import numpy as np
+import scipy.sparse as sp
+from flask import current_app
+from sqlalchemy import func
+from sqlalchemy.orm import selectinload
+
+from .. import db
+from ..models import Question
+
+FORMAT_VERSION = 1
+MERGE_THRESHOLD = 256
+TITLE_WEIGHT = 2
+TAG_WEIGHT = 3
+
+_TOKEN = re.compile(r"[a-z0-9][a-z0-9+#.]*[a-z0-9+#]|[a-z0-9]", re.UNICODE)
+_STOPWORDS = frozenset(
+    """
+    a an and are as at be but by can do does for from has have how i if in into
+    is it its me my not of on or so that the this to using was what when where
+    which while why will with you your
+    """.split()
+)
+
+
+def _terms(title, description="", tags=()):
+    """Weighted term counts: title words count double, tags are their own terms."""
+    counts = Counter()
+    for text, weight in ((title, TITLE_WEIGHT), (description, 1)):
+        for token in _TOKEN.findall((text or "").lower()):
+            if token not in _STOPWORDS:
+                counts[token] += weight
+    for tag in tags or ():
+        counts[f"#{tag.lower()}"] += TAG_WEIGHT
+    return counts
+
+
+def _question_terms(question):
+    return _terms(question.title, question.description, [tag.name for tag in question.tags])
+
+
+class SimilarityIndex:
+    def __init__(self, vocabulary=None, doc_freq=None, postings=None, question_ids=None):
+        self.vocabulary = vocabulary or {}
+        self.doc_freq = list(doc_freq if doc_freq is not None else [])
+        self.postings = (
+            postings if postings is not None else sp.csr_matrix((len(self.vocabulary), 0))
+        )
+        self.question_ids = np.asarray(
+            question_ids if question_ids is not None else [], dtype=np.int64
+        )
+        self.max_question_id = int(self.question_ids.max()) if len(self.question_ids) else 0
+        # question id -> posting column, for columns that are still live
+        self.positions = {int(qid): pos for pos, qid in enumerate(self.question_ids)}
+        self.dead = set()
+        self.delta = {}
+        self._lock = threading.RLock()
+
+    # -- building ---------------------------------------------------------
+
+    @classmethod
+    def build(cls, documents):
+        """Build from ``(question_id, term_counts)`` pairs with exact IDF weights."""
+        documents = [(question_id, counts) for question_id, counts in documents if counts]
+        vocabulary = {}
+        doc_freq = []
+        for _, counts in documents:
+            for term in counts:
+                column = vocabulary.setdefault(term, len(vocabulary))
+                if column == len(doc_freq):
+                    doc_freq.append(0)
+                doc_freq[column] += 1
+
+        index = cls(
+            vocabulary=vocabulary,
+            doc_freq=doc_freq,
+            question_ids=[question_id for question_id, _ in documents],
+        )
+        index.postings = index._term_major([index._vector(counts) for _, counts in documents])
+        return index
+
+    def _idf(self, column):
+        documents = len(self.question_ids) + len(self.delta)
+        return math.log((1 + documents) / (1 + self.doc_freq[column])) + 1.0
+
+    def _vector(self, counts):
+        """L2-normalised {column: weight} for known terms (sublinear TF x IDF)."""
+        vector = {}
+        for term, count in counts.items():
+            column = self.vocabulary.get(term)
+            if column is not None:
+                vector[column] = (1.0 + math.log(count)) * self._idf(column)
+        norm = math.sqrt(sum(weight * weight for weight in vector.values()))
+        return {column: weight / norm for column, weight in vector.items()} if norm else {}
+
+    def _term_major(self, rows):
+        """Stack {column: weight} document rows into a (terms x documents) CSR."""
+        data, columns, indptr = [], [], [0]
+        for row in rows:
+            columns.extend(row.keys())
+            data.extend(row.values())
+            indptr.append(len(columns))
+        doc_major = sp.csr_matrix(
+            (np.asarray(data, dtype=np.float32), np.asarray(columns, dtype=np.int32), indptr),
+            shape=(len(rows), len(self.vocabulary)),
+        )
+        return doc_major.T.tocsr()
+
+    # -- maintenance ------------------------------------------------------
+
+    def add(self, question_id, counts):
+        """Index (or re-index) one question. Edits do not decrement old terms'
+        document frequencies; the next rebuild settles those."""
+        with self._lock:
+            self.remove(question_id)
+            for term in counts:
+                if term not in self.vocabulary:
+                    self.vocabulary[term] = len(self.vocabulary)
+                    self.doc_freq.append(0)
+                self.doc_freq[self.vocabulary[term]] += 1
+            self.delta[question_id] = self._vector(counts)
+            self.max_question_id = max(self.max_question_id, question_id)
+            if len(self.delta) >= MERGE_THRESHOLD:
+                self._merge()
+
+    def remove(self, question_id):
+        with self._lock:
+            self.delta.pop(question_id, None)
+            position = self.positions.pop(question_id, None)
+            if position is not None:
+                self.dead.add(position)
+
+    def _merge(self):
+        """Fold the delta into the postings (copies any memory-mapped arrays once)."""
+        base = self.postings
+        terms = len(self.vocabulary)
+        if base.shape[0] < terms:
+            padding = np.full(terms - base.shape[0], base.indptr[-1], dtype=base.indptr.dtype)
+            base = sp.csr_matrix(
+                (base.data, base.indices, np.concatenate([base.indptr, padding])),
+                shape=(terms, base.shape[1]),
+            )
+        ids = list(self.delta)
+        self.postings = sp.hstack([base, self._term_major(list(self.delta.values()))], format="csr")
+        start = len(self.question_ids)
+        self.question_ids = np.concatenate([self.question_ids, np.asarray(ids, dtype=np.int64)])
+        for offset, question_id in enumerate(ids):
+            self.positions[question_id] = start + offset
+        self.delta = {}
+
+    # -- querying ---------------------------------------------------------
+
+    def query(self, counts, k=5, exclude=()):
+        """Return up to ``k`` ``(question_id, cosine)`` pairs, best first."""
+        with self._lock:
+            vector = self._vector(counts)
+            if not vector:
+                return []
+            exclude = set(exclude)
+            candidates = []
+
+            base = self.postings
+            columns = [column for column in vector if column < base.shape[0]]
+            if columns and base.shape[1]:
+                weights = np.asarray([vector[column] for column in columns], dtype=np.float32)
+                scores = np.asarray(base[columns].T @ weights).ravel()
+                if self.dead:
+                    scores[list(self.dead)] = 0.0
+                limit = min(len(scores), k + len(exclude))
+                for position in np.argpartition(-scores, limit - 1)[:limit]:
+                    question_id = int(self.question_ids[position])
+                    if scores[position] > 0 and question_id not in exclude:
+                        candidates.append((question_id, float(scores[position])))
+
+            for question_id, row in self.delta.items():
+                if question_id in exclude:
+                    continue
+                score = sum(weight * row.get(column, 0.0) for column, weight in vector.items())
+                if score > 0:
+                    candidates.append((question_id, score))
+
+            candidates.sort(key=lambda pair: (-pair[1], -pair[0]))
+            return candidates[:k]
+
+    # -- persistence ------------------------------------------------------
+
+    def save(self, path, fingerprint):
+        with self._lock:
+            self._compact()
+            os.makedirs(path, exist_ok=True)
+            arrays = {
+                "postings_data": self.postings.data.astype(np.float32),
+                "postings_indices": self.postings.indices.astype(np.int32),
+                "postings_indptr": self.postings.indptr.astype(np.int32),
+                "question_ids": self.question_ids.astype(np.int64),
+                "doc_freq": np.asarray(self.doc_freq, dtype=np.int64),
+            }
+            for name, array in arrays.items():
+                tmp = os.path.join(path, f"{name}.tmp.npy")
+                np.save(tmp, array)
+                os.replace(tmp, os.path.join(path, f"{name}.npy"))
+            _write_json(os.path.join(path, "vocabulary.json"), self.vocabulary)
+            # meta.json goes last, so it never describes arrays that are not on disk yet.
+            _write_json(
+                os.path.join(path, "meta.json"),
+                {
+                    "format": FORMAT_VERSION,
+                    "fingerprint": fingerprint,
+                    "shape": list(self.postings.shape),
+                },
+            )
+
+    def _compact(self):
+        """Merge the delta and drop dead columns."""
+        if self.delta:
+            self._merge()
+        if self.dead:
+            keep = [position for position in range(len(self.question_ids)) if position not in self.dead]
+            self.postings = self.postings[:, keep].tocsr()
+            self.question_ids = self.question_ids[keep]
+            self.positions = {int(qid): pos for pos, qid in enumerate(self.question_ids)}
+            self.dead = set()
+
+    @classmethod
+    def load(cls, path, fingerprint):
+        """Memory-map a saved index; None if missing or built for another database."""
+        try:
+            with open(os.path.join(path, "meta.json"), encoding="utf-8") as handle:
+                meta = json.load(handle)
+            if meta.get("format") != FORMAT_VERSION or meta.get("fingerprint") != fingerprint:
+                return None
+            with open(os.path.join(path, "vocabulary.json"), encoding="utf-8") as handle:
+                vocabulary = json.load(handle)
+
+            def array(name):
+                return np.load(os.path.join(path, f"{name}.npy"), mmap_mode="r")
+
+            postings = sp.csr_matrix(
+                (array("postings_data"), array("postings_indices"), array("postings_indptr")),
+                shape=tuple(meta["shape"]),
+                copy=False,
+            )
+            return cls(
+                vocabulary=vocabulary,
+                doc_freq=array("doc_freq").tolist(),
+                postings=postings,
+                question_ids=array("question_ids"),
+            )
+        except (OSError, ValueError, KeyError):
+            return None
+
+
+def _write_json(path, payload):
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as handle:
+        json.dump(payload, handle)
+    os.replace(tmp, path)
+
+
+class SimilarityService:
+    MAX_RESULTS = 20
+
+    @staticmethod
+    def _fingerprint():
+        uri = current_app.config["SQLALCHEMY_DATABASE_URI"]
+        return hashlib.sha1(uri.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _documents(min_id=0):
+        query = (
+            Question.query.options(selectinload(Question.tags))
+            .filter(Question.id > min_id)
+            .order_by(Question.id)
+        )
+        for question in query.yield_per(1000):
+            yield question.id, _question_terms(question)
+
+    @staticmethod
+    def index():
+        """The app's index: loaded from disk or built on first use, then caught up."""
+        index = current_app.extensions.get("question_similarity")
+        if index is None:
+            path = current_app.config.get("SIMILARITY_INDEX_PATH")
+            index = SimilarityIndex.load(path, SimilarityService._fingerprint()) if path else None
+            if index is None:
+                index = SimilarityIndex.build(SimilarityService._documents())
+            current_app.extensions["question_similarity"] = index
+
+        # Other workers (or a stale file) may be missing recent questions.
+        newest = db.session.query(func.max(Question.id)).scalar() or 0
+        if newest > index.max_question_id:
+            for question_id, counts in SimilarityService._documents(index.max_question_id):
+                index.add(question_id, counts)
+        return index
+
+    @staticmethod
+    def index_question(question):
+        """Add or refresh ``question``; a no-op until the index has been loaded."""
+        index = current_app.extensions.get("question_similarity")
+        if index is not None:
+            index.add(question.id, _question_terms(question))
+
+    @staticmethod
+    def remove_question(question_id):
+        index = current_app.extensions.get("question_similarity")
+        if index is not None:
+            index.remove(question_id)
+
+    @staticmethod
+    def similar_to_question(question, limit=5):
+        limit = max(1, min(limit, SimilarityService.MAX_RESULTS))
+        return SimilarityService.index().query(
+            _question_terms(question), k=limit, exclude={question.id}
+        )
+
+    @staticmethod
+    def similar_to_text(title, description="", limit=5):
+        limit = max(1, min(limit, SimilarityService.MAX_RESULTS))
+        return SimilarityService.index().query(_terms(title, description), k=limit)
+
+    @staticmethod
+    def rebuild():
+        """Rebuild from the database with exact IDF weights and save it."""
+        index = SimilarityIndex.build(SimilarityService._documents())
+        path = current_app.config.get("SIMILARITY_INDEX_PATH")
+        if path:
+            index.save(path, SimilarityService._fingerprint())
+        current_app.extensions["question_similarity"] = index
+        return len(index.question_ids)
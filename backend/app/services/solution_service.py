@@ -1,26 +1,92 @@
-from sqlalchemy.orm import joinedload
+from datetime import datetime
+
 from marshmallow import ValidationError
+from sqlalchemy import DateTime, Integer, literal, select, union
 
 from .. import db
-from ..models import Solution, Question, Notification, User, Follow
+from ..models import Solution, Question, Notification, User, Follow, Vote
 from ..schemas.solution_schema import SolutionCreateSchema
+from .engagement_counters import EngagementCounters
+from .field_selection import FieldSelection
+from .loader_profiles import solution_options
+from .notification_outbox import ANSWER_CREATED, NotificationOutbox
+from .pagination import keyset_page
+from .question_cache import QuestionCache
+from .serialization_memo import SerializationMemo
+from .unread_counters import UnreadCounters
+from .vote_buffer import VoteBuffer
+
+MAX_CURSOR_PAGE_SIZE = 100
+
+# ``?sort=`` orders for a question's solutions; id breaks ties so each order is
+# total. score and newest/oldest are served by ix_solutions_question_id_score_id
+# and ix_solutions_question_id_created_at_id respectively.
+SOLUTION_SORT_KEYS = {
+    "score": [(Solution.score, True), (Solution.id, True)],
+    "newest": [(Solution.created_at, True), (Solution.id, True)],
+    "oldest": [(Solution.created_at, False), (Solution.id, False)],
+}
+SOLUTION_SORTS = tuple(SOLUTION_SORT_KEYS)
 
 
 class SolutionService:
     @staticmethod
-    def _serialize_solution(solution, current_user_id=None):
-        my_vote = 0
-        if current_user_id is not None:
-            for vote in solution.votes:
-                if vote.user_id == current_user_id:
-                    my_vote = 1 if vote.vote_type == "up" else -1
-                    break
+    def selection(args=None):
+        """Parse ``?fields=``/``?expand=`` for solution reads; ``author`` is the only relation."""
+        return FieldSelection.from_args(
+            args or {},
+            default_expand=("author",),
+            allowed_expand=("author",),
+            required=("id", "question_id"),
+        )
+
+    @staticmethod
+    def _user_id(value):
+        """JWT identities are strings; coerce them to the integer user id."""
+        if value is None:
+            return None
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            return None
+
+    @staticmethod
+    def _my_votes(solution_ids, user_id):
+        """Map solution id -> 1/-1 for ``user_id``'s votes, in one query."""
+        user_id = SolutionService._user_id(user_id)
+        if user_id is None or not solution_ids:
+            return {}
+        rows = (
+            db.session.query(Vote.solution_id, Vote.vote_type)
+            .filter(Vote.user_id == user_id, Vote.solution_id.in_(solution_ids))
+            .all()
+        )
+        return {solution_id: 1 if vote_type == "up" else -1 for solution_id, vote_type in rows}
+
+    @staticmethod
+    def _buffered_votes(current_user_id):
+        """The viewer's buffered votes; take this before loading the solutions it overlays."""
+        return VoteBuffer.pending(SolutionService._user_id(current_user_id))
 
-        author = solution.author.to_dict() if getattr(solution, "author", None) else None
+    @staticmethod
+    def _serialize_solution(solution, current_user_id=None, my_vote=None, include_author=True, buffered=None):
+        """Serialize one solution; pass ``my_vote`` from ``_my_votes`` when serializing several.
+
+        ``buffered`` is the ``_buffered_votes`` snapshot taken before ``solution``
+        was loaded; without it one is taken now.
+        """
+        if buffered is None:
+            buffered = SolutionService._buffered_votes(current_user_id)
+        if my_vote is None:
+            my_vote = SolutionService._my_votes([solution.id], current_user_id).get(solution.id, 0)
+
+        author = None
+        if include_author:
+            author = SerializationMemo.user(getattr(solution, "author", None))
         created_at = solution.created_at.isoformat() if solution.created_at else None
         updated_at = solution.updated_at.isoformat() if solution.updated_at else None
 
-        return {
+        payload = {
             "id": solution.id,
             "question_id": solution.question_id,
             "user_id": solution.user_id,
@@ -29,9 +95,7 @@ class SolutionService:
             "created_at": created_at,
             "updated_at": updated_at,
             "timestamp": created_at,
-            "author": author,
             "authorId": author.get("id") if author else solution.user_id,
-            "authorName": author.get("name") if author else None,
             "vote_count": solution.get_vote_count(),
             "votes": solution.get_vote_count(),
             "upvotes": solution.get_upvotes(),
@@ -39,20 +103,83 @@ class SolutionService:
             "my_vote": my_vote,
             "user_vote": my_vote,
         }
+        if include_author:
+            payload["author"] = author
+            payload["authorName"] = author.get("name") if author else None
+        VoteBuffer.overlay([payload], buffered)
+        return payload
 
     @staticmethod
-    def get_solutions_by_question(question_id, page=1, per_page=10, current_user_id=None):
-        query = (
-            Solution.query.filter_by(question_id=question_id)
-            .options(joinedload(Solution.author), joinedload(Solution.votes))
-            .order_by(Solution.created_at.asc())
+    def _serialize_page(solutions, current_user_id=None, include_author=True, buffered=None):
+        """Serialize ``solutions`` with the viewer's votes resolved in a single query."""
+        if buffered is None:
+            buffered = SolutionService._buffered_votes(current_user_id)
+        my_votes = SolutionService._my_votes([solution.id for solution in solutions], current_user_id)
+        return [
+            SolutionService._serialize_solution(
+                solution,
+                current_user_id=current_user_id,
+                my_vote=my_votes.get(solution.id, 0),
+                include_author=include_author,
+                buffered=buffered,
+            )
+            for solution in solutions
+        ]
+
+    @staticmethod
+    def _solution_options(selection):
+        return solution_options(author=selection.wants("author"))
+
+    @staticmethod
+    def get_solutions_by_question(
+        question_id,
+        page=1,
+        per_page=10,
+        current_user_id=None,
+        selection=None,
+        sort="oldest",
+        cursor=None,
+    ):
+        """Return a page of a question's solutions in ``sort`` order (see SOLUTION_SORTS).
+
+        Passing ``cursor`` (an empty string for the first page) switches to keyset
+        pagination: the result carries ``next_cursor`` instead of page counts and
+        no OFFSET or COUNT(*) is issued. Raises InvalidCursor for a malformed cursor.
+        """
+        selection = selection or SolutionService.selection()
+        buffered = SolutionService._buffered_votes(current_user_id)
+        keys = SOLUTION_SORT_KEYS[sort]
+        query = Solution.query.filter_by(question_id=question_id).options(
+            *SolutionService._solution_options(selection)
         )
 
+        if cursor is not None:
+            per_page = max(1, min(per_page, MAX_CURSOR_PAGE_SIZE))
+            solutions, next_cursor = keyset_page(query, keys, cursor=cursor, per_page=per_page)
+            items = [
+                selection.project(payload)
+                for payload in SolutionService._serialize_page(
+                    solutions, current_user_id, include_author=selection.wants("author"), buffered=buffered
+                )
+            ]
+            return {
+                "items": items,
+                "solutions": items,
+                "per_page": per_page,
+                "next_cursor": next_cursor,
+                "has_more": next_cursor is not None,
+            }
+
+        query = query.order_by(
+            *[column.desc() if descending else column.asc() for column, descending in keys]
+        )
         pagination = db.paginate(query, page=page, per_page=per_page, error_out=False)
 
         items = [
-            SolutionService._serialize_solution(solution, current_user_id=current_user_id)
-            for solution in pagination.items
+            selection.project(payload)
+            for payload in SolutionService._serialize_page(
+                pagination.items, current_user_id, include_author=selection.wants("author"), buffered=buffered
+            )
         ]
 
         return {
@@ -65,28 +192,55 @@ class SolutionService:
         }
 
     @staticmethod
-    def get_solution_by_id(solution_id, current_user_id=None):
+    def get_solution_by_id(solution_id, current_user_id=None, selection=None):
+        selection = selection or SolutionService.selection()
+        buffered = SolutionService._buffered_votes(current_user_id)
         solution = (
-            Solution.query.options(joinedload(Solution.author), joinedload(Solution.votes))
+            Solution.query.options(*SolutionService._solution_options(selection))
             .filter_by(id=solution_id)
             .first()
         )
         if not solution:
             return None
-        return SolutionService._serialize_solution(solution, current_user_id=current_user_id)
+        return selection.project(
+            SolutionService._serialize_solution(
+                solution,
+                current_user_id=current_user_id,
+                include_author=selection.wants("author"),
+                buffered=buffered,
+            )
+        )
+
+    @staticmethod
+    def get_solutions_by_ids(ids, current_user_id=None, selection=None):
+        """Solutions for ``ids`` in the order given, plus the ids that do not exist.
+
+        One query (author joined in when expanded); ``my_vote`` comes from a single
+        lookup of the viewer's votes instead of loading every vote.
+        """
+        selection = selection or SolutionService.selection()
+        buffered = SolutionService._buffered_votes(current_user_id)
+        query = Solution.query.filter(Solution.id.in_(ids)).options(*SolutionService._solution_options(selection))
+        by_id = {solution.id: solution for solution in query.all()}
+        found = [by_id[solution_id] for solution_id in ids if solution_id in by_id]
+        items = [
+            selection.project(payload)
+            for payload in SolutionService._serialize_page(
+                found, current_user_id, include_author=selection.wants("author"), buffered=buffered
+            )
+        ]
+        return items, [solution_id for solution_id in ids if solution_id not in by_id]
 
     @staticmethod
     def get_user_solutions(user_id, page=1, per_page=10, current_user_id=None):
+        buffered = SolutionService._buffered_votes(current_user_id)
         query = (
             Solution.query.filter_by(user_id=user_id)
-            .options(joinedload(Solution.author), joinedload(Solution.votes))
+            .options(*solution_options())
             .order_by(Solution.created_at.desc())
         )
         pagination = db.paginate(query, page=page, per_page=per_page, error_out=False)
-        items = [
-            SolutionService._serialize_solution(solution, current_user_id=current_user_id)
-            for solution in pagination.items
-        ]
+        items = SolutionService._serialize_page(pagination.items, current_user_id, buffered=buffered)
         meta = {
             "current_page": pagination.page,
             "pages": pagination.pages,
@@ -116,34 +270,21 @@ class SolutionService:
         try:
             db.session.add(solution)
             db.session.flush()
-
-            notified_user_ids = set()
-
-            # Notify followers of the question (excluding the author of the solution)
-            followers = (
-                Follow.query.filter(Follow.question_id == question_id)
-                .filter(Follow.user_id != user_id)
-                .all()
-            )
-            for follow in followers:
-                notification = Notification(
-                    user_id=follow.user_id,
-                    type="new_answer",
-                    reference_id=solution.id,
+            EngagementCounters.solution_created(question_id)
+
+            if NotificationOutbox.enabled():
+                NotificationOutbox.publish(
+                    ANSWER_CREATED,
+                    question_id=question_id,
+                    question_author_id=question.user_id,
+                    solution_id=solution.id,
+                    author_id=user_id,
                 )
-                db.session.add(notification)
-                notified_user_ids.add(follow.user_id)
-
-            # Notify question author about new answer (skip self notifications)
-            if question.user_id != user_id:
-                notification = Notification(
-                    user_id=question.user_id,
-                    type="new_answer",
-                    reference_id=solution.id,
+                notified_user_ids = set()
+            else:
+                notified_user_ids = SolutionService._notify_new_answer(
+                    question_id, question.user_id, solution.id, user_id
                 )
-                db.session.add(notification)
-                notified_user_ids.add(question.user_id)
-
             db.session.commit()
         except Exception as exc:
             db.session.rollback()
@@ -176,6 +317,7 @@ class SolutionService:
             solution.content = payload["content"]
 
         try:
+            QuestionCache.invalidate(solution.question_id)
             db.session.commit()
         except Exception as exc:
             db.session.rollback()
@@ -196,6 +338,7 @@ class SolutionService:
                 return {"error": "Not authorized to delete this solution"}, 403
 
         try:
+            EngagementCounters.solution_deleted(solution)
             db.session.delete(solution)
             db.session.commit()
         except Exception as exc:
@@ -204,21 +347,65 @@ class SolutionService:
 
         return {"message": "Solution deleted"}, 200
 
+    @staticmethod
+    def _notify_new_answer(question_id, question_author_id, solution_id, author_id):
+        """Notify the question's followers and author of a new answer; returns who was notified.
+
+        Recipients are selected and inserted by the database in one
+        INSERT ... SELECT, so the cost does not grow with round trips per
+        follower. The answer's author is never notified, and a question author
+        who also follows the question gets one notification, not two. The
+        unread counters move for exactly the users RETURNING reported (or, on
+        databases without it, the list selected once and inserted from), so a
+        follow committed mid-fan-out cannot make them drift.
+        """
+        recipients = select(Follow.user_id).where(
+            Follow.question_id == question_id, Follow.user_id != author_id
+        )
+        if question_author_id != author_id:
+            recipients = union(recipients, select(literal(question_author_id, Integer)))
+        recipients = recipients.subquery()
+
+        notifications = Notification.__table__
+        rows = select(
+            recipients.c.user_id,
+            literal("new_answer"),
+            literal(solution_id, Integer),
+            literal(False),
+            literal(datetime.utcnow(), DateTime),
+        )
+        statement = notifications.insert().from_select(
+            ["user_id", "type", "reference_id", "is_read", "created_at"], rows
+        )
+        if db.session.get_bind().dialect.insert_returning:
+            notified = set(db.session.execute(statement.returning(notifications.c.user_id)).scalars())
+        else:
+            notified = set(db.session.execute(select(recipients.c.user_id)).scalars())
+            if notified:
+                created_at = datetime.utcnow()
+                db.session.execute(
+                    notifications.insert(),
+                    [
+                        {"user_id": user_id, "type": "new_answer", "reference_id": solution_id,
+                         "is_read": False, "created_at": created_at}
+                        for user_id in notified
+                    ],
+                )
+        if notified:
+            UnreadCounters.added(notified)
+        return notified
+
     @staticmethod
     def _push_unread_updates(user_ids):
+        """Push fresh unread counts to ``user_ids``: one grouped COUNT, then batched emits."""
         if not user_ids:
             return
         try:
             from .notification_service import NotificationService
             from .websocket_service import WebSocketService
         except ImportError:
-            NotificationService = None
-            WebSocketService = None
-
-        if not NotificationService:
             return
 
-        for uid in set(user_ids):
-            unread = NotificationService.get_unread_count(uid)["unread_count"]
-            if WebSocketService:
-                WebSocketService.send_notification_count_update(uid, unread)
+        WebSocketService.send_notification_count_updates(
+            NotificationService.get_unread_counts(user_ids)
+        )
@@ -0,0 +1,100 @@
+"""Per-user unread-notification counters.
+
+``users.unread_notifications`` holds each user's unread count, so reading it
+(socket connect, the unread-count poll, every push after a fan-out) is a
+primary-key lookup instead of a COUNT(*) over ``notifications``. Every path
+that creates notifications or marks them read moves the counter with a
+relative UPDATE in the same transaction, so concurrent writers never lose an
+increment. ``flask reconcile-counters`` recomputes it from the notifications
+table and repairs drift left by anything that bypasses these hooks.
+"""
+
+from sqlalchemy import bindparam, func, select, update
+
+from .. import db
+from ..models import Notification, User
+
+# Users per IN list when reading or moving many counters; stays under
+# SQLite's bound-parameter limit on very large fan-outs.
+READ_CHUNK = 10000
+
+
+def _keep_updated_at():
+    # The counter is bookkeeping, not a profile change.
+    return {"updated_at": User.updated_at}
+
+
+class UnreadCounters:
+    @staticmethod
+    def added(user_ids, amount=1):
+        """Add ``amount`` unread notifications for ``user_ids``."""
+        user_ids = list(user_ids)
+        for start in range(0, len(user_ids), READ_CHUNK):
+            db.session.execute(
+                update(User)
+                .where(User.id.in_(user_ids[start:start + READ_CHUNK]))
+                .values(unread_notifications=User.unread_notifications + amount, **_keep_updated_at()),
+                execution_options={"synchronize_session": False},
+            )
+
+    @staticmethod
+    def added_many(counts):
+        """Apply ``{user_id: new unread notifications}`` with one executemany."""
+        rows = [{"user_id": user_id, "amount": amount} for user_id, amount in counts.items() if amount]
+        if not rows:
+            return
+        table = User.__table__
+        db.session.execute(
+            update(table)
+            .where(table.c.id == bindparam("user_id"))
+            .values(unread_notifications=table.c.unread_notifications + bindparam("amount"),
+                    updated_at=table.c.updated_at),
+            rows,
+        )
+
+    @staticmethod
+    def read(user_id, amount):
+        """``amount`` of ``user_id``'s notifications were just marked read."""
+        if amount:
+            UnreadCounters.added([user_id], -amount)
+
+    @staticmethod
+    def get(user_id):
+        count = db.session.execute(
+            select(User.unread_notifications).where(User.id == user_id)
+        ).scalar()
+        return count or 0
+
+    @staticmethod
+    def get_many(user_ids):
+        """Map each of ``user_ids`` to its unread count."""
+        user_ids = sorted(set(user_ids))
+        counts = dict.fromkeys(user_ids, 0)
+        for start in range(0, len(user_ids), READ_CHUNK):
+            rows = db.session.execute(
+                select(User.id, User.unread_notifications).where(User.id.in_(user_ids[start:start + READ_CHUNK]))
+            )
+            for user_id, count in rows:
+                counts[user_id] = count
+        return counts
+
+    @staticmethod
+    def reconcile(dry_run=False):
+        """Recompute every user's counter from ``notifications``; returns the number of drifted users."""
+        expected = (
+            select(func.count(Notification.id))
+            .where(Notification.user_id == User.id, Notification.is_read.is_(False))
+            .scalar_subquery()
+        )
+        drift = User.unread_notifications != expected
+        drifted = db.session.execute(select(func.count(User.id)).where(drift)).scalar()
+        if drifted and not dry_run:
+            db.session.execute(
+                update(User).where(drift).values(unread_notifications=expected, **_keep_updated_at()),
+                execution_options={"synchronize_session": False},
+            )
+        if dry_run:
+            db.session.rollback()
+        else:
+            db.session.commit()
+        return drifted
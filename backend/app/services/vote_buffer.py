@@ -0,0 +1,370 @@
+"""Write-behind buffering for solution votes.
+
+When a solution is shared in a busy channel, hundreds of votes land on the
+same row within seconds and each one commits on its own. With
+``VOTE_BUFFER_ENABLED`` the vote endpoints hand votes to a per-process buffer
+instead: the latest vote per (user, solution) wins, and every
+``VOTE_BUFFER_FLUSH_MS`` a background thread writes the batch in one
+transaction, with one executemany per statement: vote inserts, flips and
+deletes, one counter update per touched solution and question, and the upvote
+notifications. A burst on a single solution therefore costs one counter
+update per flush instead of one per vote.
+
+Votes are acknowledged with ``202 Accepted`` and the tally as it will be once
+flushed. Reads stay consistent for the voter: solution payloads built for a
+user are overlaid with that user's buffered votes (``VoteBuffer.overlay``).
+The snapshot of the buffer is taken before the counts and the persisted vote
+are read, and applied relative to what was read, so a flush committing in
+between only makes the overlay a no-op. Other viewers, and the voter on
+another worker, see the vote after the flush.
+
+The buffer is in memory. Buffered votes are lost if the process dies before
+a flush. Each worker flushes its own buffer, so a user voting through two
+workers within one interval converges on whichever flush commits last.
+``VOTE_BUFFER_FLUSH_MS=0`` disables the flush thread; ``VoteBuffer.flush``
+then has to be called explicitly (tests, benchmarks). If a batch fails, it is
+rolled back and replayed vote by vote through the synchronous path.
+"""
+
+import atexit
+import threading
+
+from flask import current_app
+from sqlalchemy import bindparam, case, delete, insert, select, update
+
+from .. import db
+from ..models import Notification, Question, Solution, Vote
+from .engagement_counters import _vote_delta
+from .hot_ranking import VOTE_WEIGHT
+from .notification_outbox import VOTE_CAST, NotificationOutbox
+from .question_cache import QuestionCache
+from .unread_counters import UnreadCounters
+
+_EXTENSION = "vote_buffer"
+_VOTE_VALUES = {"up": 1, "down": -1, None: 0}
+_VOTE_TYPES = {1: "up", -1: "down", 0: None}
+
+
+class PendingVotes:
+    """The buffer itself: pending votes keyed by (user_id, solution_id), plus the batch being flushed."""
+
+    def __init__(self, app, flush_ms, max_pending):
+        self.app = app
+        self.flush_ms = flush_ms
+        self.max_pending = max_pending
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._pending = {}
+        self._inflight = {}
+        self._stop = threading.Event()
+        self._thread = None
+
+    def __len__(self):
+        with self._lock:
+            return len(self._pending)
+
+    def submit(self, user_id, solution_id, vote_type):
+        """Buffer a vote (``None`` removes it); returns True once the buffer is full."""
+        with self._lock:
+            self._pending[(user_id, solution_id)] = vote_type
+            full = len(self._pending) >= self.max_pending
+        self._start()
+        return full
+
+    def lookup(self, user_id, solution_ids=None):
+        """Map solution id -> buffered vote type (None = removed) for ``user_id``; all of them without ids."""
+        found = {}
+        with self._lock:
+            for source in (self._inflight, self._pending):
+                if solution_ids is None:
+                    found.update((key[1], vote) for key, vote in source.items() if key[0] == user_id)
+                    continue
+                for solution_id in solution_ids:
+                    key = (user_id, solution_id)
+                    if key in source:
+                        found[solution_id] = source[key]
+        return found
+
+    def take(self):
+        with self._lock:
+            batch, self._pending = self._pending, {}
+            self._inflight = batch
+        return batch
+
+    def done(self):
+        with self._lock:
+            self._inflight = {}
+
+    def _start(self):
+        if self.flush_ms <= 0 or self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, name="vote-buffer", daemon=True)
+            self._thread.start()
+        atexit.register(self.stop)
+
+    def _run(self):
+        while not self._stop.wait(self.flush_ms / 1000):
+            self._flush_in_app()
+
+    def _flush_in_app(self):
+        if not len(self):
+            return
+        with self.app.app_context():
+            try:
+                VoteBuffer.flush()
+            except Exception:
+                current_app.logger.exception("Vote buffer flush failed")
+            finally:
+                db.session.remove()
+
+    def stop(self):
+        """Stop the flush thread and write whatever is still buffered."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+        self._flush_in_app()
+
+
+class VoteBuffer:
+    @staticmethod
+    def enabled():
+        return bool(current_app.config.get("VOTE_BUFFER_ENABLED"))
+
+    @staticmethod
+    def buffer(create=True):
+        pending = current_app.extensions.get(_EXTENSION)
+        if pending is None and create:
+            pending = PendingVotes(
+                current_app._get_current_object(),
+                flush_ms=int(current_app.config.get("VOTE_BUFFER_FLUSH_MS", 200)),
+                max_pending=int(current_app.config.get("VOTE_BUFFER_MAX_PENDING", 10000)),
+            )
+            current_app.extensions[_EXTENSION] = pending
+        return pending
+
+    @staticmethod
+    def submit(user_id, solution_id, vote_type):
+        """Buffer a vote; flushes inline when the buffer is full (back-pressure)."""
+        if VoteBuffer.buffer().submit(user_id, solution_id, vote_type):
+            VoteBuffer.flush()
+
+    @staticmethod
+    def pending(user_id, solution_ids=None):
+        """Snapshot of ``user_id``'s buffered votes (all of them when ``solution_ids`` is None)."""
+        pending = VoteBuffer.buffer(create=False)
+        if pending is None or user_id is None:
+            return {}
+        return pending.lookup(user_id, solution_ids)
+
+    @staticmethod
+    def overlay(payloads, buffered):
+        """Apply a ``pending`` snapshot to serialized solutions.
+
+        Take the snapshot before reading the solutions' counts and ``my_vote``:
+        a vote flushed before the snapshot is already in what was read, and one
+        whose flush commits in between is in both, so the overlay moves nothing.
+        ``my_vote`` in each payload must be the user's persisted vote; counts
+        move by the difference between that and the buffered vote.
+        """
+        if not payloads or not buffered:
+            return payloads
+        for payload in payloads:
+            if payload["id"] not in buffered:
+                continue
+            vote_type = buffered[payload["id"]]
+            up, down = _vote_delta(_VOTE_TYPES[payload.get("my_vote") or 0], vote_type)
+            for key, delta in (("upvotes", up), ("downvotes", down), ("votes", up - down), ("vote_count", up - down)):
+                if key in payload:
+                    payload[key] += delta
+            for key in ("my_vote", "user_vote"):
+                if key in payload:
+                    payload[key] = _VOTE_VALUES[vote_type]
+        return payloads
+
+    @staticmethod
+    def flush():
+        """Write every buffered vote in one transaction; returns the number of votes changed."""
+        pending = VoteBuffer.buffer(create=False)
+        if pending is None:
+            return 0
+        with pending._flush_lock:
+            batch = pending.take()
+            if not batch:
+                return 0
+            try:
+                changed, notified = VoteBuffer._write(batch)
+                db.session.commit()
+            except Exception:
+                db.session.rollback()
+                current_app.logger.exception("Batched vote flush failed; replaying %d vote(s) one by one", len(batch))
+                changed, notified = VoteBuffer._replay(batch), set()
+            finally:
+                pending.done()
+
+        if notified:
+            from .solution_service import SolutionService
+
+            SolutionService._push_unread_updates(notified)
+        return changed
+
+    @staticmethod
+    def _write(batch):
+        solution_ids = {solution_id for _, solution_id in batch}
+        user_ids = {user_id for user_id, _ in batch}
+        solutions = {
+            row.id: row
+            for row in db.session.execute(
+                select(Solution.id, Solution.question_id, Solution.user_id, Question.user_id.label("question_author"))
+                .join(Question, Question.id == Solution.question_id)
+                .where(Solution.id.in_(solution_ids))
+            )
+        }
+        existing = {
+            (row.user_id, row.solution_id): row
+            for row in db.session.execute(
+                select(Vote.id, Vote.user_id, Vote.solution_id, Vote.vote_type)
+                .where(Vote.solution_id.in_(solution_ids), Vote.user_id.in_(user_ids))
+                .with_for_update()
+            )
+        }
+
+        inserts, flips, deletes, upvoted = [], [], [], []
+        solution_deltas, question_deltas = {}, {}
+        for (user_id, solution_id), vote_type in sorted(batch.items()):
+            solution = solutions.get(solution_id)
+            if solution is None:
+                continue
+            current = existing.get((user_id, solution_id))
+            previous = current.vote_type if current else None
+            if previous == vote_type:
+                continue
+            if current is None:
+                inserts.append({"solution_id": solution_id, "user_id": user_id, "vote_type": vote_type})
+            elif vote_type is None:
+                deletes.append({"vote_id": current.id})
+            else:
+                flips.append({"vote_id": current.id, "new_type": vote_type})
+                if vote_type == "up":
+                    upvoted.append((current.id, user_id, solution))
+            up, down = _vote_delta(previous, vote_type)
+            for deltas, key in ((solution_deltas, solution_id), (question_deltas, solution.question_id)):
+                total_up, total_down = deltas.get(key, (0, 0))
+                deltas[key] = (total_up + up, total_down + down)
+
+        votes = Vote.__table__
+        if inserts:
+            # (user_id, solution_id) identifies each row, so RETURNING needs no
+            # parameter ordering and stays a single batch on SQLite too.
+            rows = db.session.execute(
+                insert(votes).returning(votes.c.id, votes.c.user_id, votes.c.solution_id, votes.c.vote_type), inserts
+            )
+            for vote_id, user_id, solution_id, vote_type in rows:
+                if vote_type == "up":
+                    upvoted.append((vote_id, user_id, solutions[solution_id]))
+        if flips:
+            db.session.execute(
+                update(votes).where(votes.c.id == bindparam("vote_id")).values(vote_type=bindparam("new_type")),
+                flips,
+            )
+        if deletes:
+            db.session.execute(delete(votes).where(votes.c.id == bindparam("vote_id")), deletes)
+
+        VoteBuffer._apply_counters(solution_deltas, question_deltas)
+        notified = VoteBuffer._notify(upvoted)
+        QuestionCache.invalidate(*question_deltas)
+        return len(inserts) + len(flips) + len(deletes), notified
+
+    @staticmethod
+    def _apply_counters(solution_deltas, question_deltas):
+        solution_rows = [
+            {"solution_id": solution_id, "up": up, "down": down, "net": up - down}
+            for solution_id, (up, down) in solution_deltas.items()
+            if up or down
+        ]
+        if solution_rows:
+            table = Solution.__table__
+            db.session.execute(
+                update(table)
+                .where(table.c.id == bindparam("solution_id"))
+                .values(
+                    upvotes=table.c.upvotes + bindparam("up"),
+                    downvotes=table.c.downvotes + bindparam("down"),
+                    score=table.c.score + bindparam("net"),
+                ),
+                solution_rows,
+            )
+        question_rows = [
+            {"question_id": question_id, "up": up, "down": down, "net": up - down, "heat": VOTE_WEIGHT * (up - down)}
+            for question_id, (up, down) in question_deltas.items()
+            if up or down
+        ]
+        if question_rows:
+            table = Question.__table__
+            heated = table.c.hot_score + bindparam("heat")
+            db.session.execute(
+                update(table)
+                .where(table.c.id == bindparam("question_id"))
+                .values(
+                    upvotes_total=table.c.upvotes_total + bindparam("up"),
+                    downvotes_total=table.c.downvotes_total + bindparam("down"),
+                    vote_total=table.c.vote_total + bindparam("net"),
+                    hot_score=case((heated < 0, 0.0), else_=heated),
+                ),
+                question_rows,
+            )
+
+    @staticmethod
+    def _notify(upvoted):
+        """Upvote notifications for the solution and question authors, as VoteService sends them."""
+        if NotificationOutbox.enabled():
+            NotificationOutbox.publish_many(
+                VOTE_CAST,
+                [
+                    {
+                        "solution_author_id": solution.user_id,
+                        "question_author_id": solution.question_author,
+                        "voter_id": voter_id,
+                        "vote_id": vote_id,
+                    }
+                    for vote_id, voter_id, solution in upvoted
+                ],
+            )
+            return set()
+        notified, rows = set(), []
+        for vote_id, voter_id, solution in upvoted:
+            recipients = set()
+            if solution.user_id != voter_id:
+                recipients.add(solution.user_id)
+            if solution.question_author not in {solution.user_id, voter_id}:
+                recipients.add(solution.question_author)
+            rows += [{"user_id": user_id, "type": "vote", "reference_id": vote_id} for user_id in recipients]
+            notified |= recipients
+        if rows:
+            db.session.execute(insert(Notification.__table__), rows)
+            counts = {}
+            for row in rows:
+                counts[row["user_id"]] = counts.get(row["user_id"], 0) + 1
+            UnreadCounters.added_many(counts)
+        return notified
+
+    @staticmethod
+    def _replay(batch):
+        from .vote_service import VoteService
+
+        changed = 0
+        for (user_id, solution_id), vote_type in batch.items():
+            try:
+                if vote_type is None:
+                    _, status = VoteService.remove_vote(solution_id, user_id, buffered=False)
+                else:
+                    _, status = VoteService.vote_solution(
+                        solution_id, {"vote_type": vote_type}, user_id, buffered=False
+                    )
+                changed += status == 200
+            except Exception:
+                db.session.rollback()
+                current_app.logger.exception("Dropping buffered vote %s on solution %s", user_id, solution_id)
+        return changed
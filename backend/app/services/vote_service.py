@@ -1,95 +1,200 @@
-from marshmallow import ValidationError
+from datetime import datetime
+
+from sqlalchemy import delete, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.dialects import postgresql, sqlite
 
 from .. import db
 from ..models import Vote, Solution, Notification
-from ..schemas import VoteCreateSchema
+from .engagement_counters import EngagementCounters, _vote_delta
+from .notification_outbox import VOTE_CAST, NotificationOutbox
 from .solution_service import SolutionService
+from .unread_counters import UnreadCounters
+from .vote_buffer import VoteBuffer
+
+VOTE_TYPES = ("up", "down")
+VOTE_VALUES = {"up": 1, "down": -1}
+
+# Dialects whose INSERT supports ON CONFLICT (user_id, solution_id) DO UPDATE.
+_UPSERT_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
 
 
 class VoteService:
     @staticmethod
-    def vote_solution(solution_id, data, user_id):
-        """Create or update a vote on a solution."""
-        solution = Solution.query.get(solution_id)
-        if not solution:
-            return {"error": "Solution not found"}, 404
-
+    def _voter_id(user_id):
         try:
-            voter_id = int(user_id)
+            return int(user_id)
         except (TypeError, ValueError):
-            voter_id = user_id
+            return user_id
 
-        schema = VoteCreateSchema()
-        try:
-            validated_data = schema.load(data)
-        except ValidationError as err:
-            return {"error": err.messages}, 400
+    @staticmethod
+    def _upsert(solution_id, voter_id, vote_type):
+        """Write the vote in one statement; returns (vote_id, previous type) or None if unchanged.
+
+        ON CONFLICT only rewrites a vote whose type differs, so a returned row
+        is either a new vote or a flip, and a flip's previous type is the other
+        one. The insert stamps ``created_at`` with ``now`` and the update leaves
+        it alone, which tells the two apart without a prior SELECT.
+        """
+        table = Vote.__table__
+        now = datetime.utcnow()
+        dialect_insert = _UPSERT_INSERTS.get(db.session.get_bind().dialect.name)
+        if dialect_insert is None:
+            return VoteService._upsert_portable(solution_id, voter_id, vote_type, now)
+
+        stmt = dialect_insert(table).values(
+            solution_id=solution_id, user_id=voter_id, vote_type=vote_type, created_at=now
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.user_id, table.c.solution_id],
+            set_={"vote_type": stmt.excluded.vote_type},
+            where=table.c.vote_type != stmt.excluded.vote_type,
+        ).returning(table.c.id, table.c.created_at)
+        row = db.session.execute(stmt).first()
+        if row is None:
+            return None
+        previous = None if row.created_at == now else ("down" if vote_type == "up" else "up")
+        return row.id, previous
 
-        existing_vote = Vote.query.filter_by(
-            user_id=voter_id, solution_id=solution_id
+    @staticmethod
+    def _upsert_portable(solution_id, voter_id, vote_type, now):
+        table = Vote.__table__
+        existing = db.session.execute(
+            select(table.c.id, table.c.vote_type)
+            .where(table.c.user_id == voter_id, table.c.solution_id == solution_id)
+            .with_for_update()
         ).first()
+        if existing is None:
+            result = db.session.execute(
+                table.insert().values(
+                    solution_id=solution_id, user_id=voter_id, vote_type=vote_type, created_at=now
+                )
+            )
+            return result.inserted_primary_key[0], None
+        if existing.vote_type == vote_type:
+            return None
+        db.session.execute(table.update().where(table.c.id == existing.id).values(vote_type=vote_type))
+        return existing.id, existing.vote_type
 
-        message = "Vote recorded successfully"
-        commit_needed = False
-        notified_users = set()
+    @staticmethod
+    def _tally(solution_id, upvotes, downvotes, my_vote):
+        return {
+            "id": solution_id,
+            "solution_id": solution_id,
+            "upvotes": upvotes,
+            "downvotes": downvotes,
+            "votes": upvotes - downvotes,
+            "my_vote": my_vote,
+        }
 
-        new_type = validated_data["vote_type"]
-
-        if existing_vote:
-            if existing_vote.vote_type == new_type:
-                message = "Vote unchanged"
-            else:
-                existing_vote.vote_type = new_type
-                message = "Vote updated successfully"
-                commit_needed = True
-                if new_type == "up":
-                    notified_users.update(
-                        VoteService._create_upvote_notifications(solution, voter_id, existing_vote.id)
-                    )
-        else:
-            vote = Vote(
-                solution_id=solution_id,
-                user_id=voter_id,
-                vote_type=new_type,
-            )
-            db.session.add(vote)
-            db.session.flush()  # assign vote.id
+    @staticmethod
+    def _buffer_vote(solution_id, voter_id, vote_type):
+        """Hand the vote to the VoteBuffer; answers 202 with the tally it will produce."""
+        table = Vote.__table__
+        row = db.session.execute(
+            select(Solution.upvotes, Solution.downvotes, table.c.vote_type)
+            .outerjoin(table, (table.c.solution_id == Solution.id) & (table.c.user_id == voter_id))
+            .where(Solution.id == solution_id)
+        ).first()
+        db.session.rollback()
+        if row is None:
+            return {"error": "Solution not found"}, 404
+        persisted = row.vote_type
+        if vote_type is None and VoteBuffer.pending(voter_id, [solution_id]).get(solution_id, persisted) is None:
+            return {"error": "Vote not found"}, 404
 
-            if new_type == "up":
-                notified_users.update(
-                    VoteService._create_upvote_notifications(solution, voter_id, vote.id)
-                )
-            commit_needed = True
+        VoteBuffer.submit(voter_id, solution_id, vote_type)
+        up, down = _vote_delta(persisted, vote_type)
+        tally = VoteService._tally(
+            solution_id, row.upvotes + up, row.downvotes + down, VOTE_VALUES.get(vote_type, 0)
+        )
+        return {"item": tally, "message": "Vote accepted"}, 202
+
+    @staticmethod
+    def vote_solution(solution_id, data, user_id, buffered=None):
+        """Create or update a vote on a solution.
 
-        if commit_needed:
-            db.session.commit()
+        The vote and the counters it moves are written without loading the
+        solution or its votes; the response is the solution's new tally. With
+        the vote buffer enabled the write is deferred (see VoteBuffer).
+        """
+        voter_id = VoteService._voter_id(user_id)
+        vote_type = (data or {}).get("vote_type")
+        if vote_type not in VOTE_TYPES:
+            return {"error": {"vote_type": ["Must be one of: up, down."]}}, 400
+        if VoteBuffer.enabled() if buffered is None else buffered:
+            return VoteService._buffer_vote(solution_id, voter_id, vote_type)
+
+        try:
+            written = VoteService._upsert(solution_id, voter_id, vote_type)
+        except IntegrityError:
+            # The solution row is gone (enforced foreign key).
+            db.session.rollback()
+            return {"error": "Solution not found"}, 404
+
+        if written is None:
+            counts = db.session.execute(
+                select(Solution.upvotes, Solution.downvotes).where(Solution.id == solution_id)
+            ).first()
+            db.session.rollback()
+            if counts is None:
+                return {"error": "Solution not found"}, 404
+            tally = VoteService._tally(solution_id, counts.upvotes, counts.downvotes, VOTE_VALUES[vote_type])
+            return {"item": tally, "message": "Vote unchanged"}, 200
+
+        vote_id, previous = written
+        applied = EngagementCounters.vote_applied(solution_id, previous, vote_type)
+        if applied is None:
+            db.session.rollback()
+            return {"error": "Solution not found"}, 404
+        solution, question_author_id = applied
+
+        notified_users = set()
+        if vote_type == "up" and NotificationOutbox.enabled():
+            NotificationOutbox.publish(
+                VOTE_CAST,
+                solution_author_id=solution.user_id,
+                question_author_id=question_author_id,
+                voter_id=voter_id,
+                vote_id=vote_id,
+            )
+        elif vote_type == "up":
+            notified_users = VoteService._create_upvote_notifications(
+                solution.user_id, question_author_id, voter_id, vote_id
+            )
+        db.session.commit()
 
         if notified_users:
             SolutionService._push_unread_updates(notified_users)
 
-        serialized = SolutionService.get_solution_by_id(solution_id, current_user_id=voter_id)
-        return {"item": serialized, "message": message}, 200
+        message = "Vote recorded successfully" if previous is None else "Vote updated successfully"
+        tally = VoteService._tally(solution_id, solution.upvotes, solution.downvotes, VOTE_VALUES[vote_type])
+        return {"item": tally, "message": message}, 200
 
     @staticmethod
-    def remove_vote(solution_id, user_id):
+    def remove_vote(solution_id, user_id, buffered=None):
         """Remove vote from solution"""
-        try:
-            voter_id = int(user_id)
-        except (TypeError, ValueError):
-            voter_id = user_id
-
-        vote = Vote.query.filter_by(
-            user_id=voter_id, solution_id=solution_id
-        ).first()
-
-        if not vote:
+        voter_id = VoteService._voter_id(user_id)
+        if VoteBuffer.enabled() if buffered is None else buffered:
+            return VoteService._buffer_vote(solution_id, voter_id, None)
+        table = Vote.__table__
+        previous = db.session.execute(
+            delete(table)
+            .where(table.c.user_id == voter_id, table.c.solution_id == solution_id)
+            .returning(table.c.vote_type)
+        ).scalar()
+        if previous is None:
+            db.session.rollback()
             return {"error": "Vote not found"}, 404
 
-        db.session.delete(vote)
+        applied = EngagementCounters.vote_applied(solution_id, previous, None)
         db.session.commit()
+        if applied is None:
+            return {"error": "Solution not found"}, 404
 
-        serialized = SolutionService.get_solution_by_id(solution_id, current_user_id=voter_id)
-        return {"item": serialized, "message": "Vote removed successfully"}, 200
+        solution, _ = applied
+        tally = VoteService._tally(solution_id, solution.upvotes, solution.downvotes, 0)
+        return {"item": tally, "message": "Vote removed successfully"}, 200
 
     @staticmethod
     def get_votes_by_solution(solution_id):
@@ -98,37 +203,24 @@ class VoteService:
         return [vote.to_dict() for vote in votes]
 
     @staticmethod
-    def _create_upvote_notifications(solution, voter_user_id, vote_id):
+    def _create_upvote_notifications(solution_author_id, question_author_id, voter_user_id, vote_id):
         """Create notifications for an upvote.
 
         Returns a set of user IDs that should have their unread counts refreshed.
         """
         notified_users = set()
 
-        from ..models import Question
-
-        question = Question.query.get(solution.question_id)
-        if not question:
-            return notified_users
-
         # Notify solution author about upvote (if not voting on own solution)
-        if solution.user_id != voter_user_id:
-            notification = Notification(
-                user_id=solution.user_id,
-                type="vote",
-                reference_id=vote_id,
-            )
-            db.session.add(notification)
-            notified_users.add(solution.user_id)
+        if solution_author_id != voter_user_id:
+            notified_users.add(solution_author_id)
 
         # Notify question author (if distinct from solution author and voter)
-        if question.user_id not in {solution.user_id, voter_user_id}:
-            notification = Notification(
-                user_id=question.user_id,
-                type="vote",
-                reference_id=vote_id,
-            )
-            db.session.add(notification)
-            notified_users.add(question.user_id)
+        if question_author_id is not None and question_author_id not in {solution_author_id, voter_user_id}:
+            notified_users.add(question_author_id)
 
+        db.session.add_all(
+            Notification(user_id=user_id, type="vote", reference_id=vote_id) for user_id in notified_users
+        )
+        if notified_users:
+            UnreadCounters.added(notified_users)
         return notified_users
@@ -22,6 +22,25 @@ class WebSocketService:
         except Exception as e:
             print(f"Error sending notification count to user {user_id}: {e}")
     
+    @staticmethod
+    def send_notification_count_updates(unread_counts):
+        """Send unread counts to many users, one emit per distinct count.
+
+        ``unread_counts`` maps user id -> count. Users sharing a count are
+        addressed together through a list of rooms, so a fan-out to thousands
+        of followers costs a handful of emits rather than one per user.
+        """
+        rooms_by_count = {}
+        for user_id, unread_count in unread_counts.items():
+            rooms_by_count.setdefault(unread_count, []).append(f'user_{user_id}')
+        for unread_count, rooms in rooms_by_count.items():
+            try:
+                socketio.emit('notification_count_update', {
+                    'unread_count': unread_count
+                }, to=rooms)
+            except Exception as e:
+                print(f"Error sending notification count to {len(rooms)} users: {e}")
+    
     @staticmethod
     def handle_user_connect(user_id):
         """Handle user connecting to WebSocket"""
@@ -0,0 +1,36 @@
+"""Response envelopes for the v1 and v2 API surfaces.
+
+v1 responses keep their historical shapes, several of which repeat the same
+collection or object under more than one key. v2 sends every success as
+``{"data": ..., "meta": {...}}`` exactly once. A request gets v2 when it comes
+through a blueprint mounted under ``/v2`` or when it lists ``V2_MEDIA_TYPE`` in
+its Accept header; the views are shared, only the envelope differs.
+"""
+
+from flask import jsonify, request
+
+V2_MEDIA_TYPE = "application/vnd.moringadesk.v2+json"
+V2_BLUEPRINT_PREFIX = "v2_"
+
+
+def wants_v2():
+    if request.blueprint and request.blueprint.startswith(V2_BLUEPRINT_PREFIX):
+        return True
+    return any(mimetype == V2_MEDIA_TYPE and quality > 0 for mimetype, quality in request.accept_mimetypes)
+
+
+def api_version():
+    return 2 if wants_v2() else 1
+
+
+def envelope(data, meta=None, status=200, legacy=None):
+    """Return ``data`` in the canonical v2 envelope, or ``legacy`` for v1 callers.
+
+    When ``legacy`` is None the v1 shape already is the canonical one.
+    """
+    if legacy is not None and not wants_v2():
+        return jsonify(legacy), status
+    payload = {"data": data}
+    if meta is not None:
+        payload["meta"] = meta
+    return jsonify(payload), status
@@ -0,0 +1,58 @@
+"""Conditional GET support: strong ETags, Last-Modified and 304 responses.
+
+Routes compute a cheap validator (a version counter or ``updated_at``) before
+doing any real work, return ``not_modified(...)`` when the client's copy is
+current, and otherwise pass their normal response through ``with_validators``.
+"""
+
+import hashlib
+from datetime import timezone
+
+from flask import make_response, request
+
+from .envelope import api_version
+
+
+def strong_etag(*parts):
+    """Hash ``parts`` into an ETag value; any change in a part changes the tag.
+
+    The API version is mixed in because v1 and v2 envelopes differ byte-wise.
+    """
+    parts = (*parts, api_version())
+    return hashlib.sha1("|".join(str(part) for part in parts).encode("utf-8")).hexdigest()
+
+
+def _http_date(value):
+    # HTTP dates have one-second resolution and are always UTC.
+    return value.replace(microsecond=0, tzinfo=timezone.utc)
+
+
+def is_fresh(etag, last_modified=None):
+    """True when the request's validators match the current representation."""
+    if request.if_none_match:
+        # If-None-Match takes precedence over If-Modified-Since (RFC 9110 13.2.2).
+        return request.if_none_match.contains_weak(etag)
+    if last_modified is not None and request.if_modified_since is not None:
+        return _http_date(last_modified) <= request.if_modified_since
+    return False
+
+
+def with_validators(rv, etag, last_modified=None, private=False):
+    """Attach ETag, Last-Modified and Cache-Control to a view's return value.
+
+    ``private`` marks responses that depend on the caller (e.g. ``my_vote``) so
+    shared caches never store them. Either way clients must revalidate, which
+    costs a 304 rather than a full body once the tag matches.
+    """
+    response = make_response(rv)
+    response.set_etag(etag)
+    if last_modified is not None:
+        response.last_modified = _http_date(last_modified)
+    response.headers["Cache-Control"] = "private, no-cache" if private else "public, no-cache"
+    response.vary.add("Authorization")
+    response.vary.add("Accept")
+    return response
+
+
+def not_modified(etag, last_modified=None, private=False):
+    return with_validators(("", 304), etag, last_modified=last_modified, private=private)
@@ -0,0 +1,29 @@
+"""Parsing for ``?ids=1,2,3`` batch-fetch parameters."""
+
+MAX_BATCH_IDS = 100
+
+
+class InvalidIdList(ValueError):
+    """Raised for an ``ids`` parameter that is empty, malformed or too long."""
+
+
+def parse_id_list(raw, limit=MAX_BATCH_IDS):
+    """Distinct positive integer ids in the order given; duplicates keep their first place."""
+    ids = []
+    for part in (raw or "").split(","):
+        part = part.strip()
+        if not part:
+            continue
+        try:
+            value = int(part)
+        except ValueError:
+            raise InvalidIdList(f"Invalid id: {part!r}") from None
+        if value <= 0:
+            raise InvalidIdList(f"Invalid id: {part!r}")
+        if value not in ids:
+            ids.append(value)
+    if not ids:
+        raise InvalidIdList("ids must list at least one id")
+    if len(ids) > limit:
+        raise InvalidIdList(f"At most {limit} ids can be fetched at once")
+    return ids
@@ -0,0 +1,44 @@
+"""Shared setup for the scripts in this directory.
+
+Run them from ``backend/`` as modules, e.g. ``python -m benchmarks.serialization_memo``.
+Each builds its own throwaway SQLite database (in memory unless a benchmark
+needs real commits), so they never touch app data.
+"""
+
+import os
+import statistics
+import time
+from contextlib import contextmanager
+
+
+@contextmanager
+def benchmark_app(database_url="sqlite:///:memory:", **config):
+    os.environ["DATABASE_URL"] = database_url
+    from app import create_app, db
+
+    app = create_app()
+    app.config.update(TESTING=True, **config)
+    with app.app_context():
+        db.create_all()
+        try:
+            yield app
+        finally:
+            db.session.remove()
+            db.drop_all()
+
+
+def timed(fn, repeat=200):
+    """Median wall time of ``fn()`` in milliseconds over ``repeat`` calls."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def report(title, rows):
+    print(title)
+    width = max(len(label) for label, _ in rows)
+    for label, value in rows:
+        print(f"  {label.ljust(width)}  {value}")
@@ -0,0 +1,109 @@
+"""Latency of posting an answer as the question's follower count grows.
+
+    python -m benchmarks.notification_fanout
+
+Each question is followed by a different number of users. For every size the
+script posts answers through ``SolutionService.create_solution`` (commit
+included) and reports the median latency and the number of SQL statements per
+answer. "per-row" replays the previous fan-out for comparison: load every
+Follow, add one Notification per follower, then COUNT(*) and emit per user.
+The set-based path is one INSERT ... SELECT and one grouped count, so its
+statement count stays flat and latency grows only with the rows the database
+itself writes.
+"""
+
+from sqlalchemy import event, insert
+
+from . import common
+
+FOLLOWER_COUNTS = (0, 10, 100, 1000, 2000)
+ANSWERS = 5
+
+
+def _seed(db, followers):
+    from app.models import Follow, Question, User
+
+    users = [
+        {"name": f"User {i}", "email": f"u{i}@bench.test", "role": "student", "password_hash": "-"}
+        for i in range(max(FOLLOWER_COUNTS) + 2)
+    ]
+    db.session.execute(insert(User.__table__), users)
+    user_ids = [user_id for (user_id,) in db.session.query(User.id).order_by(User.id)]
+    author_id, answerer_id, crowd = user_ids[0], user_ids[1], user_ids[2:]
+
+    questions = {}
+    for size in followers:
+        question = Question(title=f"{size} followers", description="Body", problem_type="technical", user_id=author_id)
+        db.session.add(question)
+        db.session.flush()
+        if size:
+            db.session.execute(
+                insert(Follow.__table__), [{"user_id": user_id, "question_id": question.id} for user_id in crowd[:size]]
+            )
+        questions[size] = question.id
+    db.session.commit()
+    return answerer_id, questions
+
+
+def _per_row(question_id, answerer_id):
+    """The fan-out create_solution used to do, for comparison."""
+    from app import db
+    from app.models import Follow, Notification, Question, Solution
+    from app.services.engagement_counters import EngagementCounters
+    from app.services.notification_service import NotificationService
+    from app.services.websocket_service import WebSocketService
+
+    question = db.session.get(Question, question_id)
+    solution = Solution(question_id=question_id, user_id=answerer_id, content="An answer")
+    db.session.add(solution)
+    db.session.flush()
+    EngagementCounters.solution_created(question_id)
+    notified = set()
+    for follow in Follow.query.filter(Follow.question_id == question_id, Follow.user_id != answerer_id).all():
+        db.session.add(Notification(user_id=follow.user_id, type="new_answer", reference_id=solution.id))
+        notified.add(follow.user_id)
+    if question.user_id != answerer_id:
+        db.session.add(Notification(user_id=question.user_id, type="new_answer", reference_id=solution.id))
+        notified.add(question.user_id)
+    db.session.commit()
+    for user_id in notified:
+        WebSocketService.send_notification_count_update(
+            user_id, NotificationService.get_unread_count(user_id)["unread_count"]
+        )
+
+
+def main():
+    with common.benchmark_app() as app:
+        from app import db
+        from app.services.solution_service import SolutionService
+
+        answerer_id, questions = _seed(db, FOLLOWER_COUNTS)
+        statements = []
+        event.listen(db.engine, "before_cursor_execute", lambda *args: statements.append(1))
+
+        def set_based(question_id):
+            _, status = SolutionService.create_solution(question_id, {"content": "An answer"}, answerer_id)
+            assert status == 201, status
+
+        def per_row(question_id):
+            _per_row(question_id, answerer_id)
+
+        rows = []
+        with app.test_request_context():
+            for size, question_id in questions.items():
+                cells = []
+                for answer in (per_row, set_based):
+                    answer(question_id)  # warm up
+                    statements.clear()
+                    answer(question_id)
+                    per_answer = len(statements)
+                    median = common.timed(lambda: answer(question_id), repeat=ANSWERS)
+                    cells.append(f"{median:8.2f} ms ({per_answer:>5} stmts)")
+                rows.append((f"{size:>5} followers", "   ".join(cells)))
+        common.report(
+            f"ms per answer, median of {ANSWERS} (SQLite in memory): per-row fan-out vs set-based", rows
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Serialize a 50-answer thread with and without the request-scoped memo.
+
+    python -m benchmarks.serialization_memo
+
+The thread has 50 answers from 10 authors and 5 related questions. "without"
+patches the memo off; "with" serializes inside a fresh request context each
+time, as a real request would.
+"""
+
+import tracemalloc
+
+from . import common
+
+
+def _seed(db):
+    from app.models import Question, RelatedQuestion, Solution, Tag, User
+
+    users = [User(name=f"User {i}", email=f"user{i}@bench.test", role="student", password_hash="-") for i in range(11)]
+    tags = [Tag(name=f"bench-{i}") for i in range(4)]
+    db.session.add_all(users + tags)
+    db.session.flush()
+
+    def question(title, author):
+        row = Question(title=title, description="Body " * 40, problem_type="technical", user_id=author.id)
+        row.tags = tags[:3]
+        db.session.add(row)
+        return row
+
+    thread = question("Benchmark thread", users[0])
+    related = [question(f"Related {i}", users[1 + i]) for i in range(5)]
+    db.session.flush()
+    for i in range(50):
+        db.session.add(Solution(question_id=thread.id, user_id=users[1 + i % 10].id, content="Answer " * 30))
+    for other in related:
+        db.session.add(RelatedQuestion(question_id=thread.id, related_question_id=other.id))
+    db.session.commit()
+    return thread.id
+
+
+def _measure(app, serialize, memo_on):
+    from app.services import serialization_memo
+
+    original = serialization_memo._memo
+    if not memo_on:
+        serialization_memo._memo = lambda: None
+
+    def once():
+        with app.test_request_context():
+            return serialize()
+
+    try:
+        once()  # warm up
+        tracemalloc.start()
+        payload = once()
+        retained, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        authors = {id(answer["author"]) for answer in payload["answers"]}
+        return common.timed(once), retained, peak, len(authors)
+    finally:
+        serialization_memo._memo = original
+
+
+def main():
+    from app import db
+    from app.services.loader_profiles import loader_options
+    from app.services.question_service import QuestionService
+    from app.models import Question
+
+    with common.benchmark_app() as app:
+        question_id = _seed(db)
+        question = Question.query.options(*loader_options("detail")).filter_by(id=question_id).one()
+
+        def serialize():
+            return QuestionService._serialize_question(question, include_answers=True, include_related=True)
+
+        for label, memo_on in (("without memo", False), ("with memo", True)):
+            ms, retained, peak, authors = _measure(app, serialize, memo_on)
+            common.report(label, [
+                ("median time", f"{ms:.3f} ms"),
+                ("payload bytes retained", f"{retained:,}"),
+                ("peak bytes", f"{peak:,}"),
+                ("distinct author dicts", authors),
+            ])
+
+
+if __name__ == "__main__":
+    main()
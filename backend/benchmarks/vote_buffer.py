@@ -0,0 +1,99 @@
+"""Sustained votes per second: synchronous upserts vs the write-behind buffer.
+
+    python -m benchmarks.vote_buffer
+
+Simulates a solution shared in a cohort channel: 400 users vote on it, and
+some change their minds, for 2000 votes in all. The database is a SQLite file
+so every commit pays for a real write. "sync" commits each vote on its own;
+"buffered" acknowledges each vote after one indexed read and flushes every
+``FLUSH_MS`` of wall time, plus once at the end. Both totals include every
+flush, so they compare the cost of getting all votes durable.
+"""
+
+import os
+import random
+import tempfile
+import time
+
+from . import common
+
+VOTERS = 400
+VOTES = 2000
+FLUSH_MS = 200
+
+
+def _seed(db):
+    from app.models import Question, Solution, User
+
+    users = [User(name=f"Voter {i}", email=f"voter{i}@bench.test", role="student", password_hash="-") for i in range(VOTERS + 1)]
+    db.session.add_all(users)
+    db.session.flush()
+    question = Question(title="Shared thread", description="Body", problem_type="technical", user_id=users[0].id)
+    db.session.add(question)
+    db.session.flush()
+    solutions = []
+    for label in ("sync", "buffered"):
+        solution = Solution(question_id=question.id, user_id=users[0].id, content=f"{label} answer")
+        db.session.add(solution)
+        solutions.append(solution)
+    db.session.commit()
+    return [user.id for user in users[1:]], [solution.id for solution in solutions]
+
+
+def _stream(voter_ids):
+    rng = random.Random(7)
+    return [(rng.choice(voter_ids), rng.choice(("up", "up", "up", "down"))) for _ in range(VOTES)]
+
+
+def _run(solution_id, votes, buffered):
+    from app import db
+    from app.services.vote_buffer import VoteBuffer
+    from app.services.vote_service import VoteService
+
+    flushes = 0
+    started = last_flush = time.perf_counter()
+    for user_id, vote_type in votes:
+        _, status = VoteService.vote_solution(solution_id, {"vote_type": vote_type}, user_id, buffered=buffered)
+        assert status in (200, 202), status
+        if buffered and (time.perf_counter() - last_flush) * 1000 >= FLUSH_MS:
+            VoteBuffer.flush()
+            flushes += 1
+            last_flush = time.perf_counter()
+    if buffered:
+        VoteBuffer.flush()
+        flushes += 1
+    elapsed = time.perf_counter() - started
+    db.session.expire_all()
+    return elapsed, flushes
+
+
+def main():
+    handle, path = tempfile.mkstemp(suffix=".db")
+    os.close(handle)
+    try:
+        with common.benchmark_app(database_url=f"sqlite:///{path}", VOTE_BUFFER_FLUSH_MS=0) as app:
+            from app import db
+            from app.models import Solution
+
+            voter_ids, (sync_id, buffered_id) = _seed(db)
+            votes = _stream(voter_ids)
+            with app.test_request_context():
+                sync_seconds, _ = _run(sync_id, votes, buffered=False)
+                buffered_seconds, flushes = _run(buffered_id, votes, buffered=True)
+
+            sync_row, buffered_row = db.session.get(Solution, sync_id), db.session.get(Solution, buffered_id)
+            assert (sync_row.upvotes, sync_row.downvotes) == (buffered_row.upvotes, buffered_row.downvotes)
+            common.report(
+                f"{VOTES} votes from {VOTERS} users on one solution (SQLite file, flush every {FLUSH_MS} ms)",
+                [
+                    ("sync", f"{VOTES / sync_seconds:8.0f} votes/s  ({VOTES} commits)"),
+                    ("buffered", f"{VOTES / buffered_seconds:8.0f} votes/s  ({flushes} flushes)"),
+                    ("final tally", f"{buffered_row.upvotes} up / {buffered_row.downvotes} down (identical)"),
+                ],
+            )
+    finally:
+        os.unlink(path)
+
+
+if __name__ == "__main__":
+    main()
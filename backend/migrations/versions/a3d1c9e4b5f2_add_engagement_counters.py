@@ -0,0 +1,70 @@
+"""add denormalized engagement counters
+
+Revision ID: a3d1c9e4b5f2
+Revises: f0a078a7f21d
+Create Date: 2026-10-17 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "a3d1c9e4b5f2"
+down_revision = "f0a078a7f21d"
+branch_labels = None
+depends_on = None
+
+
+QUESTION_COUNTERS = (
+    "solutions_count",
+    "follows_count",
+    "vote_total",
+    "upvotes_total",
+    "downvotes_total",
+)
+SOLUTION_COUNTERS = ("upvotes", "downvotes")
+
+
+def upgrade():
+    with op.batch_alter_table("questions") as batch_op:
+        for name in QUESTION_COUNTERS:
+            batch_op.add_column(sa.Column(name, sa.Integer(), nullable=False, server_default="0"))
+
+    with op.batch_alter_table("solutions") as batch_op:
+        for name in SOLUTION_COUNTERS:
+            batch_op.add_column(sa.Column(name, sa.Integer(), nullable=False, server_default="0"))
+
+    op.execute(
+        """
+        UPDATE solutions SET
+            upvotes = (SELECT COUNT(*) FROM votes
+                       WHERE votes.solution_id = solutions.id AND votes.vote_type = 'up'),
+            downvotes = (SELECT COUNT(*) FROM votes
+                         WHERE votes.solution_id = solutions.id AND votes.vote_type = 'down')
+        """
+    )
+    op.execute(
+        """
+        UPDATE questions SET
+            solutions_count = (SELECT COUNT(*) FROM solutions
+                               WHERE solutions.question_id = questions.id),
+            follows_count = (SELECT COUNT(*) FROM follows
+                             WHERE follows.question_id = questions.id),
+            upvotes_total = (SELECT COALESCE(SUM(upvotes), 0) FROM solutions
+                             WHERE solutions.question_id = questions.id),
+            downvotes_total = (SELECT COALESCE(SUM(downvotes), 0) FROM solutions
+                               WHERE solutions.question_id = questions.id)
+        """
+    )
+    op.execute("UPDATE questions SET vote_total = upvotes_total - downvotes_total")
+
+
+def downgrade():
+    with op.batch_alter_table("solutions") as batch_op:
+        for name in reversed(SOLUTION_COUNTERS):
+            batch_op.drop_column(name)
+
+    with op.batch_alter_table("questions") as batch_op:
+        for name in reversed(QUESTION_COUNTERS):
+            batch_op.drop_column(name)
@@ -0,0 +1,25 @@
+"""add the (question_id, user_id) index on follows
+
+Revision ID: a8d4e2f6b1c7
+Revises: f3c8a1d5e9b2
+Create Date: 2026-10-17 21:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "a8d4e2f6b1c7"
+down_revision = "f3c8a1d5e9b2"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(
+        "ix_follows_question_id_user_id", "follows", ["question_id", "user_id"], unique=False
+    )
+
+
+def downgrade():
+    op.drop_index("ix_follows_question_id_user_id", table_name="follows")
@@ -0,0 +1,42 @@
+"""add the notification_events outbox table
+
+Revision ID: b2f7c3a9d4e8
+Revises: a8d4e2f6b1c7
+Create Date: 2026-10-17 22:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "b2f7c3a9d4e8"
+down_revision = "a8d4e2f6b1c7"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "notification_events",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("kind", sa.String(length=40), nullable=False),
+        sa.Column("payload", sa.JSON(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("available_at", sa.DateTime(), nullable=False),
+        sa.Column("attempts", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("last_error", sa.Text(), nullable=True),
+        sa.Column("failed_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_notification_events_available_at_id",
+        "notification_events",
+        ["available_at", "id"],
+        unique=False,
+    )
+
+
+def downgrade():
+    op.drop_index("ix_notification_events_available_at_id", table_name="notification_events")
+    op.drop_table("notification_events")
@@ -0,0 +1,23 @@
+"""add questions (created_at, id) index for keyset pagination
+
+Revision ID: b7e2d4f8c913
+Revises: a3d1c9e4b5f2
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "b7e2d4f8c913"
+down_revision = "a3d1c9e4b5f2"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index("ix_questions_created_at_id", "questions", ["created_at", "id"], unique=False)
+
+
+def downgrade():
+    op.drop_index("ix_questions_created_at_id", table_name="questions")
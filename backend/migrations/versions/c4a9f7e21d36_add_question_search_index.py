@@ -0,0 +1,50 @@
+"""add full-text search index for questions
+
+Revision ID: c4a9f7e21d36
+Revises: b7e2d4f8c913
+Create Date: 2026-10-17 11:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "c4a9f7e21d36"
+down_revision = "b7e2d4f8c913"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == "postgresql":
+        op.execute(
+            """
+            ALTER TABLE questions ADD COLUMN search_vector tsvector
+            GENERATED ALWAYS AS (
+                setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+                setweight(to_tsvector('english', coalesce(description, '')), 'B')
+            ) STORED
+            """
+        )
+        op.execute(
+            "CREATE INDEX ix_questions_search_vector ON questions USING GIN (search_vector)"
+        )
+    elif dialect == "sqlite":
+        op.execute(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS questions_fts "
+            "USING fts5(title, description, tokenize = 'porter unicode61')"
+        )
+        op.execute(
+            "INSERT INTO questions_fts (rowid, title, description) "
+            "SELECT id, title, description FROM questions"
+        )
+
+
+def downgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == "postgresql":
+        op.execute("DROP INDEX IF EXISTS ix_questions_search_vector")
+        op.execute("ALTER TABLE questions DROP COLUMN IF EXISTS search_vector")
+    elif dialect == "sqlite":
+        op.execute("DROP TABLE IF EXISTS questions_fts")
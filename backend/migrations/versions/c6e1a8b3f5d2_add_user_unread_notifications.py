@@ -0,0 +1,39 @@
+"""add users.unread_notifications
+
+Revision ID: c6e1a8b3f5d2
+Revises: b2f7c3a9d4e8
+Create Date: 2026-10-17 23:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "c6e1a8b3f5d2"
+down_revision = "b2f7c3a9d4e8"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table("users") as batch_op:
+        batch_op.add_column(
+            sa.Column("unread_notifications", sa.Integer(), nullable=False, server_default="0")
+        )
+
+    op.execute(
+        sa.text(
+            """
+            UPDATE users SET unread_notifications = (
+                SELECT COUNT(*) FROM notifications
+                WHERE notifications.user_id = users.id AND notifications.is_read = :false
+            )
+            """
+        ).bindparams(sa.bindparam("false", False, type_=sa.Boolean()))
+    )
+
+
+def downgrade():
+    with op.batch_alter_table("users") as batch_op:
+        batch_op.drop_column("unread_notifications")
@@ -0,0 +1,28 @@
+"""add question_tags (tag_id, question_id) index for tag filters
+
+Revision ID: d3b8e5a1c7f4
+Revises: c4a9f7e21d36
+Create Date: 2026-10-17 16:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "d3b8e5a1c7f4"
+down_revision = "c4a9f7e21d36"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(
+        "ix_question_tags_tag_id_question_id",
+        "question_tags",
+        ["tag_id", "question_id"],
+        unique=False,
+    )
+
+
+def downgrade():
+    op.drop_index("ix_question_tags_tag_id_question_id", table_name="question_tags")
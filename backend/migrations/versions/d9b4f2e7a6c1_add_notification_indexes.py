@@ -0,0 +1,57 @@
+"""add notifications (user_id, is_read) and (user_id, created_at desc, id desc) indexes
+
+Revision ID: d9b4f2e7a6c1
+Revises: c6e1a8b3f5d2
+Create Date: 2026-10-18 09:00:00.000000
+
+On PostgreSQL the indexes are built CONCURRENTLY, outside the migration's
+transaction, so the notifications table stays writable while they build. If a
+concurrent build fails it leaves an INVALID index behind; drop it and rerun.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "d9b4f2e7a6c1"
+down_revision = "c6e1a8b3f5d2"
+branch_labels = None
+depends_on = None
+
+
+INDEXES = (
+    ("ix_notifications_user_id_is_read", ["user_id", "is_read"]),
+    (
+        "ix_notifications_user_id_created_at_id",
+        ["user_id", sa.text("created_at DESC"), sa.text("id DESC")],
+    ),
+)
+
+
+def _concurrently():
+    return op.get_bind().dialect.name == "postgresql"
+
+
+def upgrade():
+    if _concurrently():
+        with op.get_context().autocommit_block():
+            for name, columns in INDEXES:
+                op.create_index(
+                    name, "notifications", columns, unique=False,
+                    postgresql_concurrently=True, if_not_exists=True,
+                )
+        return
+    for name, columns in INDEXES:
+        op.create_index(name, "notifications", columns, unique=False)
+
+
+def downgrade():
+    if _concurrently():
+        with op.get_context().autocommit_block():
+            for name, _ in reversed(INDEXES):
+                op.drop_index(
+                    name, table_name="notifications", postgresql_concurrently=True, if_exists=True
+                )
+        return
+    for name, _ in reversed(INDEXES):
+        op.drop_index(name, table_name="notifications")
@@ -0,0 +1,28 @@
+"""add the (related_question_id, question_id) index on related_questions
+
+Revision ID: e4a7c2b9d5f1
+Revises: d9b4f2e7a6c1
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "e4a7c2b9d5f1"
+down_revision = "d9b4f2e7a6c1"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(
+        "ix_related_questions_related_question_id_question_id",
+        "related_questions",
+        ["related_question_id", "question_id"],
+        unique=False,
+    )
+
+
+def downgrade():
+    op.drop_index("ix_related_questions_related_question_id_question_id", table_name="related_questions")
@@ -0,0 +1,43 @@
+"""add questions.hot_score, its index and the decay log
+
+Revision ID: e7a2c6d9f1b3
+Revises: d3b8e5a1c7f4
+Create Date: 2026-10-17 17:00:00.000000
+
+Existing questions start at 0; run ``flask decay-hot-scores --recompute`` once
+to seed them from their engagement counters.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "e7a2c6d9f1b3"
+down_revision = "d3b8e5a1c7f4"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table("questions") as batch_op:
+        batch_op.add_column(sa.Column("hot_score", sa.Float(), nullable=False, server_default="0"))
+    op.create_index("ix_questions_hot_score_id", "questions", ["hot_score", "id"], unique=False)
+
+    op.create_table(
+        "hot_score_decays",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("ran_at", sa.DateTime(), nullable=False),
+        sa.Column("factor", sa.Float(), nullable=False),
+        sa.Column("questions_updated", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_hot_score_decays_ran_at", "hot_score_decays", ["ran_at"], unique=False)
+
+
+def downgrade():
+    op.drop_index("ix_hot_score_decays_ran_at", table_name="hot_score_decays")
+    op.drop_table("hot_score_decays")
+
+    op.drop_index("ix_questions_hot_score_id", table_name="questions")
+    with op.batch_alter_table("questions") as batch_op:
+        batch_op.drop_column("hot_score")
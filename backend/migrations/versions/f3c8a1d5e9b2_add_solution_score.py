@@ -0,0 +1,40 @@
+"""add solutions.score and the per-question sort indexes
+
+Revision ID: f3c8a1d5e9b2
+Revises: e7a2c6d9f1b3
+Create Date: 2026-10-17 19:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "f3c8a1d5e9b2"
+down_revision = "e7a2c6d9f1b3"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table("solutions") as batch_op:
+        batch_op.add_column(sa.Column("score", sa.Integer(), nullable=False, server_default="0"))
+
+    op.execute("UPDATE solutions SET score = upvotes - downvotes")
+
+    op.create_index(
+        "ix_solutions_question_id_score_id", "solutions", ["question_id", "score", "id"], unique=False
+    )
+    op.create_index(
+        "ix_solutions_question_id_created_at_id",
+        "solutions",
+        ["question_id", "created_at", "id"],
+        unique=False,
+    )
+
+
+def downgrade():
+    op.drop_index("ix_solutions_question_id_created_at_id", table_name="solutions")
+    op.drop_index("ix_solutions_question_id_score_id", table_name="solutions")
+    with op.batch_alter_table("solutions") as batch_op:
+        batch_op.drop_column("score")
@@ -300,6 +300,10 @@ def seed_database():
 
         # --- Commit all changes ---
         db.session.commit()
+
+        # Sample rows are inserted directly, so bring the engagement counters in line
+        from app.services.engagement_counters import EngagementCounters
+        EngagementCounters.reconcile()
         print("\n🎉 Database seeded successfully!")
         print("\nSample accounts created/updated:")
         print("Admin: admin@moringadesk.com / admin123")
@@ -1,6 +1,32 @@
 import os, pytest
+from sqlalchemy import event
 from app import create_app, db
 
+
+class _StatementCounter:
+    """Records what ``engine`` sends: ``statements`` (whitespace collapsed) and their ``parameters``."""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.statements = []
+        self.parameters = []
+
+    @property
+    def count(self):
+        return len(self.statements)
+
+    def _on_execute(self, conn, cursor, statement, parameters, *args):
+        self.statements.append(" ".join(statement.split()))
+        self.parameters.append(parameters)
+
+    def __enter__(self):
+        event.listen(self.engine, "before_cursor_execute", self._on_execute)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(self.engine, "before_cursor_execute", self._on_execute)
+
+
 @pytest.fixture(scope="session")
 def app():
     os.environ["FLASK_ENV"] = "testing"
@@ -13,6 +39,7 @@ def app():
         TESTING=True,
         SQLALCHEMY_TRACK_MODIFICATIONS=False,
         JWT_ACCESS_TOKEN_EXPIRES=False,
+        STRICT_LOADER_PROFILES=True,
     )
     with app.app_context():
         db.create_all()
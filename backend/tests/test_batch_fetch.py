@@ -0,0 +1,73 @@
+import pytest
+
+from app import db
+from app.utils.id_list import MAX_BATCH_IDS
+
+from conftest import _StatementCounter
+from test_problems_and_solutions import _auth_register_and_login, _create_problem
+
+
+@pytest.fixture(scope="module")
+def batch(app):
+    client = app.test_client()
+    headers = _auth_register_and_login(client, email="batch@example.com")
+    question_ids, solution_ids = [], []
+    for i in range(6):
+        question_id = _create_problem(client, headers, title=f"Batch question {i}")["id"]
+        r = client.post(f"/problems/{question_id}/solutions", headers=headers, json={"content": f"Answer {i}"})
+        question_ids.append(question_id)
+        solution_ids.append(r.get_json()["item"]["id"])
+    client.post(f"/solutions/{solution_ids[1]}/vote", headers=headers, json={"vote_type": "down"})
+    return {"headers": headers, "questions": question_ids, "solutions": solution_ids}
+
+
+def _csv(ids):
+    return ",".join(str(i) for i in ids)
+
+
+def test_problems_by_ids_keep_order_and_report_missing(client, batch):
+    wanted = [batch["questions"][3], 999999, batch["questions"][0], batch["questions"][3]]
+    payload = client.get(f"/problems?ids={_csv(wanted)}", headers=batch["headers"]).get_json()
+
+    assert [item["id"] for item in payload["items"]] == [batch["questions"][3], batch["questions"][0]]
+    assert payload["meta"] == {"count": 2, "requested": 3, "missing": [999999]}
+    assert payload["items"][0]["title"] == "Batch question 3"
+    assert payload["items"][0]["is_following"] is False
+
+    sparse = client.get(f"/problems?ids={batch['questions'][1]}&fields=id,title").get_json()
+    assert sparse["items"] == [{"id": batch["questions"][1], "title": "Batch question 1"}]
+
+
+def test_solutions_by_ids_carry_my_vote(client, batch):
+    wanted = [batch["solutions"][1], batch["solutions"][0], 999999]
+    payload = client.get(f"/solutions?ids={_csv(wanted)}", headers=batch["headers"]).get_json()
+
+    assert [item["id"] for item in payload["data"]] == wanted[:2]
+    assert [item["my_vote"] for item in payload["data"]] == [-1, 0]
+    assert payload["meta"]["missing"] == [999999]
+
+
+@pytest.mark.parametrize("url", ["/problems", "/solutions"])
+def test_invalid_id_lists_are_rejected(client, url):
+    assert client.get(f"{url}?ids=1,two").status_code == 400
+    assert client.get(f"{url}?ids=").status_code == 400
+    too_many = _csv(range(1, MAX_BATCH_IDS + 2))
+    assert client.get(f"{url}?ids={too_many}").status_code == 400
+
+
+def test_solutions_without_ids_is_a_bad_request(client):
+    assert client.get("/solutions").status_code == 400
+
+
+@pytest.mark.parametrize("kind", ["questions", "solutions"])
+def test_query_count_does_not_grow_with_batch_size(client, batch, kind):
+    url = "/problems" if kind == "questions" else "/solutions"
+
+    def count_for(ids):
+        db.session.expunge_all()
+        with _StatementCounter(db.engine) as counter:
+            r = client.get(f"{url}?ids={_csv(ids)}", headers=batch["headers"])
+            assert r.status_code == 200
+        return counter.count
+
+    assert count_for(batch[kind][:1]) == count_for(batch[kind])
@@ -0,0 +1,117 @@
+from sqlalchemy import update
+
+from app import db
+from app.models import BlogPost, Question
+
+from conftest import _StatementCounter
+from test_problems_and_solutions import _auth_register_and_login, _create_problem
+
+
+def _revalidate(client, url, etag, headers=None):
+    return client.get(url, headers={**(headers or {}), "If-None-Match": etag})
+
+
+def test_problem_etag_answers_304_until_the_thread_changes(client):
+    headers = _auth_register_and_login(client, email="etag_problem@example.com")
+    problem = _create_problem(client, headers, title="Conditional", description="Body")
+    url = f"/problems/{problem['id']}"
+
+    first = client.get(url)
+    etag = first.headers["ETag"]
+    assert first.headers["Cache-Control"] == "public, no-cache"
+
+    db.session.expunge_all()
+    with _StatementCounter(db.engine) as counter:
+        cached = _revalidate(client, url, etag)
+    assert cached.status_code == 304
+    assert cached.data == b""
+    # One validator read, no serialization.
+    assert [s.split()[0] for s in counter.statements] == ["SELECT"]
+
+    client.post(f"{url}/solutions", headers=headers, json={"content": "New answer"})
+    changed = _revalidate(client, url, etag)
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+
+
+def test_problem_etag_moves_with_writes_from_other_processes(client):
+    headers = _auth_register_and_login(client, email="etag_cli@example.com")
+    problem = _create_problem(client, headers, title="Repaired elsewhere", description="Body")
+    url = f"/problems/{problem['id']}"
+    etag = client.get(url).headers["ETag"]
+    solutions_etag = client.get(f"{url}/solutions").headers["ETag"]
+
+    # A write from another process (a CLI command) moves none of this process's counters.
+    db.session.execute(update(Question).where(Question.id == problem["id"]).values(description="Edited elsewhere"))
+    db.session.commit()
+    changed = _revalidate(client, url, etag)
+    assert changed.status_code == 200
+    assert changed.get_json()["item"]["description"] == "Edited elsewhere"
+    assert _revalidate(client, f"{url}/solutions", solutions_etag).status_code == 200
+
+
+def test_problem_etag_is_per_viewer(client):
+    author = _auth_register_and_login(client, email="etag_viewer_a@example.com")
+    other = _auth_register_and_login(client, email="etag_viewer_b@example.com")
+    problem = _create_problem(client, author, title="Per viewer", description="Body")
+    url = f"/problems/{problem['id']}"
+
+    as_author = client.get(url, headers=author)
+    assert as_author.headers["Cache-Control"] == "private, no-cache"
+    assert "Authorization" in as_author.headers["Vary"]
+    assert _revalidate(client, url, as_author.headers["ETag"], author).status_code == 304
+    assert _revalidate(client, url, as_author.headers["ETag"], other).status_code == 200
+
+
+def test_solution_list_etag_moves_with_votes(client):
+    headers = _auth_register_and_login(client, email="etag_solutions@example.com")
+    problem = _create_problem(client, headers, title="Solutions etag", description="Body")
+    r = client.post(f"/problems/{problem['id']}/solutions", headers=headers, json={"content": "A"})
+    solution_id = r.get_json()["item"]["id"]
+    url = f"/problems/{problem['id']}/solutions"
+
+    etag = client.get(url).headers["ETag"]
+    assert _revalidate(client, url, etag).status_code == 304
+
+    client.post(f"/solutions/{solution_id}/vote", headers=headers, json={"vote_type": "up"})
+    assert _revalidate(client, url, etag).status_code == 200
+
+
+def test_faq_supports_etag_and_last_modified(client):
+    headers = _auth_register_and_login(client, email="etag_faq@example.com")
+    r = client.post("/faqs", headers=headers, json={"question": "Cached FAQ?", "answer": "Yes"})
+    assert r.status_code == 201, r.data
+    url = f"/faqs/{r.get_json()['id']}"
+
+    first = client.get(url)
+    assert first.headers["Last-Modified"]
+    assert _revalidate(client, url, first.headers["ETag"]).status_code == 304
+    since = client.get(url, headers={"If-Modified-Since": first.headers["Last-Modified"]})
+    assert since.status_code == 304
+
+    assert client.get("/faqs/999999", headers={"If-None-Match": "*"}).status_code == 404
+
+
+def test_blog_post_and_tag_list_revalidate(client):
+    headers = _auth_register_and_login(client, email="etag_blog@example.com")
+    me = client.get("/auth/me", headers=headers).get_json()
+    post = BlogPost(
+        slug="etag-post",
+        title="ETags",
+        content="Body",
+        status="published",
+        author_id=(me.get("user") or me)["id"],
+    )
+    db.session.add(post)
+    db.session.commit()
+
+    url = "/blog/posts/etag-post"
+    etag = client.get(url).headers["ETag"]
+    assert _revalidate(client, url, etag).status_code == 304
+    summary = client.get(url, query_string={"include": "summary"}).headers["ETag"]
+    assert summary != etag
+
+    tags_etag = client.get("/tags").headers["ETag"]
+    assert _revalidate(client, "/tags", tags_etag).status_code == 304
+    client.post("/tags", json={"name": "etag-new-tag"})
+    assert _revalidate(client, "/tags", tags_etag).status_code == 200
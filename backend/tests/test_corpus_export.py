@@ -0,0 +1,101 @@
+import gzip
+import io
+import json
+
+from app.services.qa_import import QAImporter
+
+from test_problems_and_solutions import _auth_register_and_login, _create_problem
+
+
+def _records(response):
+    assert response.status_code == 200, response.data
+    return [json.loads(line) for line in response.get_data().splitlines()]
+
+
+def test_export_streams_questions_with_solutions(client):
+    admin = _auth_register_and_login(client, email="export_admin@example.com")
+    tag_id = client.post("/tags", json={"name": "export-tag"}).get_json()["tag"]["id"]
+    question = _create_problem(client, admin, title="Exported question", tag_ids=[tag_id])
+    r = client.post(f"/problems/{question['id']}/solutions", headers=admin, json={"content": "Exported answer"})
+    solution_id = r.get_json()["item"]["id"]
+    client.post(f"/solutions/{solution_id}/vote", headers=admin, json={"vote_type": "up"})
+
+    response = client.get("/admin/export", headers=admin)
+    assert response.is_streamed
+    assert response.mimetype == "application/x-ndjson"
+    records = _records(response)
+    ids = [record["id"] for record in records]
+    assert ids == sorted(ids)
+
+    record = next(record for record in records if record["id"] == question["id"])
+    assert record["tags"] == ["export-tag"]
+    assert record["vote_total"] == 1
+    assert [(s["id"], s["content"], s["upvotes"]) for s in record["solutions"]] == [
+        (solution_id, "Exported answer", 1)
+    ]
+
+
+def test_export_is_incremental_with_updated_since(client):
+    admin = _auth_register_and_login(client, email="export_admin@example.com")
+    quiet = _create_problem(client, admin, title="Quiet export question")
+    busy = _create_problem(client, admin, title="Busy export question")
+
+    since = client.get("/admin/export", headers=admin).headers["X-Export-Started-At"]
+    client.post(f"/problems/{busy['id']}/solutions", headers=admin, json={"content": "Late answer"})
+
+    ids = [record["id"] for record in _records(
+        client.get("/admin/export", headers=admin, query_string={"updated_since": since})
+    )]
+    assert busy["id"] in ids
+    assert quiet["id"] not in ids
+
+    # A follow only moves the question's counters; the export still picks it up.
+    since = client.get("/admin/export", headers=admin).headers["X-Export-Started-At"]
+    client.post(f"/problems/{quiet['id']}/follow", headers=admin)
+    records = _records(client.get("/admin/export", headers=admin, query_string={"updated_since": since}))
+    assert [(record["id"], record["follows_count"]) for record in records] == [(quiet["id"], 1)]
+
+    bad = client.get("/admin/export?updated_since=yesterday", headers=admin)
+    assert bad.status_code == 400
+
+
+def test_export_includes_tag_edits_and_imported_answers(client):
+    admin = _auth_register_and_login(client, email="export_admin@example.com")
+    tag_id = client.post("/tags", json={"name": "export-late-tag"}).get_json()["tag"]["id"]
+    retagged = _create_problem(client, admin, title="Retagged export question")
+    answered = _create_problem(client, admin, title="Import-answered export question")
+
+    since = client.get("/admin/export", headers=admin).headers["X-Export-Started-At"]
+    assert client.put(f"/problems/{retagged['id']}", headers=admin, json={"tag_ids": [tag_id]}).status_code == 200
+    stream = io.StringIO(
+        "kind,question_id,author_email,content,created_at\n"
+        f"solution,{answered['id']},export_admin@example.com,Imported late answer,2020-01-01T00:00:00\n"
+    )
+    assert QAImporter.run(stream, "csv")["solutions"] == 1
+
+    records = _records(client.get("/admin/export", headers=admin, query_string={"updated_since": since}))
+    assert sorted(record["id"] for record in records) == sorted([retagged["id"], answered["id"]])
+    by_id = {record["id"]: record for record in records}
+    assert by_id[retagged["id"]]["tags"] == ["export-late-tag"]
+    assert [s["content"] for s in by_id[answered["id"]]["solutions"]] == ["Imported late answer"]
+
+
+def test_export_gzips_on_request(client):
+    admin = _auth_register_and_login(client, email="export_admin@example.com")
+    _create_problem(client, admin, title="Compressed export question")
+
+    plain = client.get("/admin/export", headers=admin).get_data()
+    zipped = client.get("/admin/export", headers={**admin, "Accept-Encoding": "gzip"})
+    assert zipped.headers["Content-Encoding"] == "gzip"
+    assert gzip.decompress(zipped.get_data()) == plain
+
+
+def test_export_requires_admin(client):
+    client.post(
+        "/auth/register",
+        json={"name": "Student", "email": "export_student@example.com", "password": "secret", "role": "student"},
+    )
+    token = client.post(
+        "/auth/login", json={"email": "export_student@example.com", "password": "secret"}
+    ).get_json()["access_token"]
+    assert client.get("/admin/export", headers={"Authorization": f"Bearer {token}"}).status_code == 403
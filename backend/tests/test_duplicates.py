@@ -0,0 +1,67 @@
+from app.services.duplicate_service import MinHashIndex, signature
+
+from test_problems_and_solutions import _auth_register_and_login, _create_problem
+
+TITLE = "Flask migrate fails with alembic multiple heads error"
+DESCRIPTION = "Running flask db upgrade prints multiple heads and stops the deploy"
+
+
+def _ids(response):
+    assert response.status_code == 200, response.data
+    return [item["id"] for item in response.get_json()["items"]]
+
+
+def test_signature_estimates_jaccard():
+    sig = signature(TITLE, DESCRIPTION)
+    assert (sig == signature(TITLE, DESCRIPTION)).all()
+    assert signature("the and of", "") is None
+
+    index = MinHashIndex()
+    index.add(1, sig)
+    index.add(2, signature("Vue router guard loops forever", "beforeEach redirect"))
+    matches = index.query(signature(TITLE, DESCRIPTION + " again"))
+    assert [question_id for question_id, _ in matches] == [1]
+    assert matches[0][1] > 0.7
+
+    index.remove(1)
+    assert index.query(sig) == []
+    assert all(1 not in bucket for band in index.buckets for bucket in band.values())
+
+
+def test_preview_and_create_report_duplicates(client):
+    headers = _auth_register_and_login(client, email="duplicates@example.com")
+    original = _create_problem(client, headers, title=TITLE, description=DESCRIPTION)
+    assert original["duplicates"] == []
+
+    preview = client.post("/problems/duplicates", json={
+        "title": "Flask migrate fails: alembic multiple heads error",
+        "description": DESCRIPTION,
+    })
+    assert _ids(preview) == [original["id"]]
+    assert preview.get_json()["items"][0]["similarity"] >= 0.5
+
+    unrelated = client.post("/problems/duplicates", json={"title": "Tailwind dark mode toggle flashes"})
+    assert original["id"] not in _ids(unrelated)
+    assert client.post("/problems/duplicates", json={}).status_code == 400
+
+    again = _create_problem(client, headers, title=TITLE, description=DESCRIPTION)
+    assert [item["id"] for item in again["duplicates"]] == [original["id"]]
+
+
+def test_edits_and_deletes_update_the_index(client):
+    headers = _auth_register_and_login(client, email="duplicates_edit@example.com")
+    question = _create_problem(
+        client, headers, title="Pandas merge drops rows unexpectedly", description="Inner join loses keys"
+    )
+    draft = {"title": "Pandas merge drops rows unexpectedly", "description": "Inner join loses keys"}
+    assert question["id"] in _ids(client.post("/problems/duplicates", json=draft))
+
+    client.put(f"/problems/{question['id']}", headers=headers, json={
+        "title": "Numpy broadcasting shape mismatch", "description": "operands could not be broadcast",
+    })
+    assert question["id"] not in _ids(client.post("/problems/duplicates", json=draft))
+    renamed = {"title": "Numpy broadcasting shape mismatch", "description": "operands could not be broadcast"}
+    assert question["id"] in _ids(client.post("/problems/duplicates", json=renamed))
+
+    client.delete(f"/problems/{question['id']}", headers=headers)
+    assert question["id"] not in _ids(client.post("/problems/duplicates", json=renamed))
@@ -0,0 +1,67 @@
+from app import db
+from app.models import Question, Solution
+
+from test_problems_and_solutions import _auth_register_and_login, _create_problem, _unwrap
+
+
+def _counters(question_id):
+    db.session.expire_all()
+    question = db.session.get(Question, question_id)
+    return {
+        "solutions": question.solutions_count,
+        "follows": question.follows_count,
+        "up": question.upvotes_total,
+        "down": question.downvotes_total,
+        "total": question.vote_total,
+    }
+
+
+def test_counters_follow_writes(client):
+    author = _auth_register_and_login(client, email="counter_author@example.com")
+    voter = _auth_register_and_login(client, email="counter_voter@example.com")
+    problem = _create_problem(client, author, title="Counters", description="Count me")
+    qid = problem["id"]
+
+    r = client.post(f"/problems/{qid}/solutions", headers=author, json={"content": "First"})
+    sid = r.get_json()["item"]["id"]
+    client.post(f"/problems/{qid}/follow", headers=voter)
+    client.post(f"/solutions/{sid}/vote", headers=voter, json={"vote_type": "up"})
+    assert _counters(qid) == {"solutions": 1, "follows": 1, "up": 1, "down": 0, "total": 1}
+
+    client.post(f"/solutions/{sid}/vote", headers=voter, json={"vote_type": "down"})
+    assert _counters(qid) == {"solutions": 1, "follows": 1, "up": 0, "down": 1, "total": -1}
+    assert db.session.get(Solution, sid).downvotes == 1
+
+    detail = _unwrap(client.get(f"/problems/{qid}", headers=voter).get_json())
+    assert detail["vote_total"] == -1 and detail["follows_count"] == 1
+    assert detail["is_following"] is True
+    assert detail["answers"][0]["my_vote"] == -1
+
+    client.delete(f"/solutions/{sid}/vote", headers=voter)
+    client.delete(f"/problems/{qid}/follow", headers=voter)
+    assert _counters(qid) == {"solutions": 1, "follows": 0, "up": 0, "down": 0, "total": 0}
+
+    client.post(f"/solutions/{sid}/vote", headers=voter, json={"vote_type": "up"})
+    client.delete(f"/problems/{qid}/solutions/{sid}", headers=author)
+    assert _counters(qid) == {"solutions": 0, "follows": 0, "up": 0, "down": 0, "total": 0}
+
+
+def test_reconcile_command_repairs_drift(app, client):
+    headers = _auth_register_and_login(client, email="counter_drift@example.com")
+    problem = _create_problem(client, headers, title="Drift", description="Drifting")
+    client.post(f"/problems/{problem['id']}/solutions", headers=headers, json={"content": "A"})
+
+    question = db.session.get(Question, problem["id"])
+    question.solutions_count = 42
+    question.follows_count = 7
+    db.session.commit()
+
+    runner = app.test_cli_runner()
+    dry = runner.invoke(args=["reconcile-counters", "--dry-run"])
+    assert "Found drift on 1 question(s)" in dry.output
+    assert _counters(problem["id"])["solutions"] == 42
+
+    result = runner.invoke(args=["reconcile-counters"])
+    assert result.exit_code == 0, result.output
+    assert _counters(problem["id"])["solutions"] == 1
+    assert _counters(problem["id"])["follows"] == 0
@@ -0,0 +1,76 @@
+from app import db
+
+from conftest import _StatementCounter
+from test_problems_and_solutions import _auth_register_and_login, _create_problem
+
+
+def _thread(client, email):
+    headers = _auth_register_and_login(client, email=email)
+    problem = _create_problem(client, headers, title="Sparse thread", description="Body")
+    r = client.post(f"/problems/{problem['id']}/solutions", headers=headers, json={"content": "Answer"})
+    assert r.status_code == 201, r.data
+    return headers, problem
+
+
+def test_sparse_list_returns_only_requested_fields(client):
+    _thread(client, "sparse_list@example.com")
+
+    r = client.get("/problems", query_string={"fields": "id,title,solutions_count"})
+    assert r.status_code == 200, r.data
+    items = r.get_json()["items"]
+    assert items
+    assert all(set(item) == {"id", "title", "solutions_count"} for item in items)
+
+
+def test_sparse_list_skips_unrequested_relations(client):
+    _thread(client, "sparse_queries@example.com")
+
+    def statements(query_string):
+        db.session.expunge_all()
+        with _StatementCounter(db.engine) as counter:
+            assert client.get("/problems", query_string=query_string).status_code == 200
+        return counter.count
+
+    # per_page busts the list cache so both requests reach the database.
+    full = statements({"per_page": 7})
+    sparse = statements({"per_page": 8, "fields": "id,title", "expand": ""})
+    assert sparse < full
+
+
+def test_detail_expand_controls_embedded_relations(client):
+    headers, problem = _thread(client, "sparse_detail@example.com")
+    url = f"/problems/{problem['id']}"
+
+    default = client.get(url).get_json()["item"]
+    assert {"answers", "author", "tags"} <= set(default)
+
+    answers_only = client.get(url, query_string={"expand": "answers"}).get_json()["item"]
+    assert len(answers_only["answers"]) == 1
+    assert "author" not in answers_only
+    assert "related_questions" not in answers_only
+
+    bare = client.get(url, headers=headers, query_string={"expand": "", "fields": "id,title,is_following"})
+    assert bare.get_json()["item"] == {"id": problem["id"], "title": "Sparse thread", "is_following": False}
+    assert bare.headers["ETag"] != client.get(url, headers=headers).headers["ETag"]
+
+
+def test_unknown_expansion_is_rejected(client):
+    _, problem = _thread(client, "sparse_invalid@example.com")
+    r = client.get(f"/problems/{problem['id']}", query_string={"expand": "votes"})
+    assert r.status_code == 400
+    assert "votes" in r.get_json()["error"]
+
+
+def test_solution_payloads_honor_fields_and_expand(client):
+    _, problem = _thread(client, "sparse_solutions@example.com")
+
+    r = client.get(
+        f"/problems/{problem['id']}/solutions", query_string={"fields": "id,content,upvotes"}
+    )
+    assert r.status_code == 200, r.data
+    assert set(r.get_json()["items"][0]) == {"id", "question_id", "content", "upvotes"}
+
+    solution_id = r.get_json()["items"][0]["id"]
+    single = client.get(f"/solutions/{solution_id}", query_string={"expand": ""}).get_json()["data"]
+    assert "author" not in single
+    assert single["authorId"]
@@ -0,0 +1,103 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import text
+
+from app import db
+from app.models import HotScoreDecay, Question
+from app.services.hot_ranking import ANSWER_WEIGHT, FOLLOW_WEIGHT, QUESTION_WEIGHT, VOTE_WEIGHT, HotRanking
+
+from test_problems_and_solutions import _auth_register_and_login, _create_problem
+
+
+def _score(question_id):
+    db.session.expunge_all()
+    return db.session.get(Question, question_id).hot_score
+
+
+def _ids(response):
+    assert response.status_code == 200, response.data
+    return [item["id"] for item in response.get_json()["items"]]
+
+
+@pytest.fixture()
+def feed(client):
+    author = _auth_register_and_login(client, email="hot_author@example.com")
+    fan = _auth_register_and_login(client, email="hot_fan@example.com")
+    old = _create_problem(client, author, title="Old but busy")["id"]
+    new = _create_problem(client, author, title="New and quiet")["id"]
+    return {"author": author, "fan": fan, "old": old, "new": new}
+
+
+def test_activity_heats_questions_incrementally(client, feed):
+    old, fan = feed["old"], feed["fan"]
+    assert _score(old) == QUESTION_WEIGHT
+
+    client.post(f"/problems/{old}/follow", headers=fan)
+    r = client.post(f"/problems/{old}/solutions", headers=feed["author"], json={"content": "Try this"})
+    solution_id = r.get_json()["item"]["id"]
+    client.post(f"/solutions/{solution_id}/vote", headers=fan, json={"vote_type": "up"})
+    assert _score(old) == QUESTION_WEIGHT + FOLLOW_WEIGHT + ANSWER_WEIGHT + VOTE_WEIGHT
+
+    client.post(f"/solutions/{solution_id}/vote", headers=fan, json={"vote_type": "down"})
+    assert _score(old) == QUESTION_WEIGHT + FOLLOW_WEIGHT + ANSWER_WEIGHT - VOTE_WEIGHT
+
+    author_id = db.session.get(Question, old).user_id
+    hot = _ids(client.get(f"/problems?sort=hot&created_by={author_id}"))
+    assert hot.index(old) < hot.index(feed["new"])
+    newest = _ids(client.get(f"/problems?created_by={author_id}"))
+    assert newest.index(feed["new"]) < newest.index(old)
+
+    pages, cursor = [], ""
+    while cursor is not None:
+        payload = client.get(
+            "/problems", query_string={"sort": "hot", "created_by": author_id, "per_page": 1, "cursor": cursor}
+        ).get_json()
+        pages += [item["id"] for item in payload["items"]]
+        cursor = payload["meta"]["next_cursor"]
+    assert pages == hot
+
+    assert client.get("/problems?sort=loudest").status_code == 400
+
+
+def test_decay_halves_scores_per_half_life(app, feed):
+    question = db.session.get(Question, feed["old"])
+    question.hot_score = 8.0
+    db.session.commit()
+    updated_at = question.updated_at
+
+    now = datetime.utcnow()
+    db.session.add(HotScoreDecay(ran_at=now - timedelta(hours=48), factor=1.0, questions_updated=0))
+    db.session.commit()
+    run = HotRanking.decay(now=now)
+
+    assert run.factor == pytest.approx(0.25)
+    question = db.session.get(Question, feed["old"])
+    db.session.refresh(question)
+    assert question.hot_score == pytest.approx(2.0)
+    assert question.updated_at == updated_at
+
+    # Back-to-back runs decay by (almost) nothing.
+    assert HotRanking.decay(now=now + timedelta(seconds=1)).factor == pytest.approx(1.0, abs=1e-4)
+
+
+def test_recompute_seeds_scores_from_counters(app, feed):
+    question = db.session.get(Question, feed["new"])
+    question.hot_score = 0.0
+    question.follows_count = 3
+    db.session.commit()
+
+    HotRanking.recompute(now=question.created_at + timedelta(hours=24))
+    assert _score(feed["new"]) == pytest.approx((QUESTION_WEIGHT + 3 * FOLLOW_WEIGHT) / 2)
+
+    db.session.get(Question, feed["new"]).follows_count = 0
+    db.session.commit()
+
+
+def test_hot_feed_is_an_index_scan(app):
+    plan = db.session.execute(
+        text("EXPLAIN QUERY PLAN SELECT id FROM questions ORDER BY hot_score DESC, id DESC LIMIT 20")
+    ).all()
+    details = " ".join(row[-1] for row in plan)
+    assert "ix_questions_hot_score_id" in details
+    assert "TEMP B-TREE" not in details
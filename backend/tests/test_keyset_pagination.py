@@ -0,0 +1,39 @@
+from test_problems_and_solutions import _auth_register_and_login, _create_problem
+
+
+def _user_id(client, headers):
+    return client.get("/auth/me", headers=headers).get_json()["user"]["id"]
+
+
+def test_cursor_walks_feed_without_counts(client):
+    headers = _auth_register_and_login(client, email="cursor@example.com")
+    created = [
+        _create_problem(client, headers, title=f"Cursor {i}", description="Scroll")["id"]
+        for i in range(5)
+    ]
+    params = {"created_by": _user_id(client, headers), "per_page": 2, "cursor": ""}
+
+    seen = []
+    while True:
+        r = client.get("/problems", query_string=params)
+        assert r.status_code == 200, r.data
+        body = r.get_json()
+        assert "total" not in body["meta"] and "pages" not in body["meta"]
+        seen += [item["id"] for item in body["items"]]
+        if not body["meta"]["has_more"]:
+            assert body["meta"]["next_cursor"] is None
+            break
+        params["cursor"] = body["meta"]["next_cursor"]
+
+    assert seen == sorted(created, reverse=True)
+
+
+def test_offset_mode_still_reports_totals(client):
+    r = client.get("/problems", query_string={"page": 1, "per_page": 2})
+    assert r.status_code == 200
+    assert r.get_json()["meta"]["total"] is not None
+
+
+def test_invalid_cursor_is_rejected(client):
+    r = client.get("/problems", query_string={"cursor": "not-a-cursor"})
+    assert r.status_code == 400
@@ -0,0 +1,75 @@
+import pytest
+from sqlalchemy.exc import InvalidRequestError
+
+from app import db
+from app.services import QuestionService
+
+from conftest import _StatementCounter
+from test_problems_and_solutions import _auth_register_and_login, _create_problem, _unwrap
+
+
+def _seed_thread(client, headers, title):
+    problem = _create_problem(client, headers, title=title, description="Loader body", problem_type="technical")
+    r = client.post(f"/problems/{problem['id']}/solutions", headers=headers, json={"content": "An answer"})
+    assert r.status_code == 201, r.data
+    solution_id = r.get_json()["item"]["id"]
+    client.post(f"/solutions/{solution_id}/vote", headers=headers, json={"vote_type": "up"})
+    client.post(f"/problems/{problem['id']}/follow", headers=headers)
+    return problem
+
+
+@pytest.fixture()
+def seeded(client):
+    headers = _auth_register_and_login(client, email="loader@example.com")
+    first = _seed_thread(client, headers, "Loader A")
+    second = _seed_thread(client, headers, "Loader B")
+    client.post(f"/problems/{first['id']}/related/{second['id']}", headers=headers)
+    db.session.expunge_all()
+    return headers, first, second
+
+
+def test_read_endpoints_stay_within_their_profiles(client, seeded):
+    headers, first, _ = seeded
+    me = client.get("/auth/me", headers=headers).get_json()
+    user_id = (me.get("user") or me).get("id")
+
+    for url in (
+        "/problems",
+        f"/problems/{first['id']}",
+        f"/profile/{user_id}",
+        "/admin/dashboard",
+    ):
+        db.session.expunge_all()
+        r = client.get(url, headers=headers)
+        assert r.status_code == 200, (url, r.data)
+
+    detail = _unwrap(client.get(f"/problems/{first['id']}").get_json())
+    assert detail["answers"] and detail["related_questions"]
+
+
+def test_list_profile_forbids_relations_it_does_not_load(app, seeded):
+    db.session.expunge_all()
+    question = QuestionService._base_query("list").first()
+    with pytest.raises(InvalidRequestError):
+        question.related_questions
+
+
+def test_list_query_count_does_not_grow_with_rows(client, seeded):
+    headers = seeded[0]
+
+    def count_for(per_page):
+        db.session.expunge_all()
+        with _StatementCounter(db.engine) as counter:
+            r = client.get("/problems", query_string={"per_page": per_page})
+            assert r.status_code == 200
+        return counter.count
+
+    for i in range(3):
+        _seed_thread(client, headers, f"Loader extra {i}")
+
+    assert count_for(2) == count_for(5)
+
+
+def test_unknown_profile_is_rejected():
+    with pytest.raises(ValueError):
+        QuestionService._base_query("nope")
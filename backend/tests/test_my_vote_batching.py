@@ -0,0 +1,76 @@
+import pytest
+
+from app import db
+from app.models import User, Vote
+
+from conftest import _StatementCounter
+from test_problems_and_solutions import _auth_register_and_login, _create_problem, _unwrap
+
+
+@pytest.fixture(scope="module")
+def thread(app):
+    client = app.test_client()
+    author = _auth_register_and_login(client, email="myvote_author@example.com")
+    viewer = _auth_register_and_login(client, email="myvote_viewer@example.com")
+    question_id = _create_problem(client, author, title="My vote batching")["id"]
+    solution_ids = [
+        client.post(f"/problems/{question_id}/solutions", headers=author, json={"content": f"Answer {i}"})
+        .get_json()["item"]["id"]
+        for i in range(3)
+    ]
+    client.post(f"/solutions/{solution_ids[0]}/vote", headers=viewer, json={"vote_type": "up"})
+    client.post(f"/solutions/{solution_ids[2]}/vote", headers=viewer, json={"vote_type": "down"})
+
+    # A crowd of other voters: reads must not pull their votes into memory.
+    crowd = [User(name=f"Crowd {i}", email=f"myvote_crowd_{i}@example.com", role="student", password_hash="-") for i in range(40)]
+    db.session.add_all(crowd)
+    db.session.flush()
+    db.session.add_all(Vote(solution_id=solution_ids[1], user_id=user.id, vote_type="up") for user in crowd)
+    db.session.commit()
+    author_id = db.session.query(User.id).filter_by(email="myvote_author@example.com").scalar()
+    return {"viewer": viewer, "question": question_id, "solutions": solution_ids, "author_id": author_id}
+
+
+def _vote_reads(counter):
+    """The SELECTs that read the votes table."""
+    return [s for s in counter.statements if s.startswith("SELECT") and "FROM votes" in s]
+
+
+def _my_votes(items, solution_ids):
+    by_id = {item["id"]: item["my_vote"] for item in items}
+    return [by_id[solution_id] for solution_id in solution_ids]
+
+
+@pytest.mark.parametrize(
+    "path",
+    ["/problems/{question}/solutions", "/solutions/user/{author_id}", "/solutions?ids={ids}"],
+)
+def test_solution_reads_resolve_my_vote_in_one_query(client, thread, path):
+    url = path.format(
+        question=thread["question"], author_id=thread["author_id"], ids=",".join(map(str, thread["solutions"]))
+    )
+    db.session.expunge_all()
+    with _StatementCounter(db.engine) as counter:
+        r = client.get(url, headers=thread["viewer"])
+    assert r.status_code == 200, r.data
+    body = r.get_json()
+    items = _unwrap(body)
+    items = items.get("items") if isinstance(items, dict) else items
+
+    assert _my_votes(items, thread["solutions"]) == [1, 0, -1]
+    [read] = _vote_reads(counter)
+    assert "votes.user_id = ?" in read and "IN" in read
+
+
+def test_question_reads_overlay_my_vote_per_page(client, thread):
+    db.session.expunge_all()
+    with _StatementCounter(db.engine) as counter:
+        detail = _unwrap(client.get(f"/problems/{thread['question']}", headers=thread["viewer"]).get_json())
+        listed = client.get(
+            "/problems",
+            headers=thread["viewer"],
+            query_string={"created_by": thread["author_id"], "expand": "answers"},
+        ).get_json()["items"]
+    assert _my_votes(detail["answers"], thread["solutions"]) == [1, 0, -1]
+    assert _my_votes(listed[0]["answers"], thread["solutions"]) == [1, 0, -1]
+    assert len(_vote_reads(counter)) == 2
@@ -0,0 +1,69 @@
+import pytest
+
+from app import db
+from app.models import Follow, Notification, User
+from app.services import websocket_service
+
+from conftest import _StatementCounter
+from test_problems_and_solutions import _auth_register_and_login, _create_problem
+
+
+@pytest.fixture()
+def emits(monkeypatch):
+    sent = []
+    monkeypatch.setattr(
+        websocket_service.socketio, "emit", lambda event, data, to=None, **kw: sent.append((event, data, to))
+    )
+    return sent
+
+
+def _thread(client, suffix, followers):
+    author = _auth_register_and_login(client, email=f"fanout_author_{suffix}@example.com")
+    answerer = _auth_register_and_login(client, email=f"fanout_answerer_{suffix}@example.com")
+    question_id = _create_problem(client, author, title=f"Fan-out {suffix}")["id"]
+    users = [
+        User(name=f"Follower {i}", email=f"fanout_{suffix}_{i}@example.com", role="student", password_hash="-")
+        for i in range(followers)
+    ]
+    db.session.add_all(users)
+    db.session.flush()
+    author_id = db.session.query(User.id).filter_by(email=f"fanout_author_{suffix}@example.com").scalar()
+    answerer_id = db.session.query(User.id).filter_by(email=f"fanout_answerer_{suffix}@example.com").scalar()
+    # The question author and the answerer follow too.
+    follower_ids = [user.id for user in users] + [author_id, answerer_id]
+    db.session.add_all(Follow(user_id=user_id, question_id=question_id) for user_id in follower_ids)
+    db.session.commit()
+    return answerer, question_id, author_id, answerer_id, [user.id for user in users]
+
+
+def _answer(client, headers, question_id):
+    with _StatementCounter(db.engine) as counter:
+        r = client.post(f"/problems/{question_id}/solutions", headers=headers, json={"content": "An answer"})
+    assert r.status_code == 201, r.data
+    return r.get_json()["item"]["id"], counter.count
+
+
+def test_new_answer_notifies_each_recipient_once(client, emits):
+    answerer, question_id, author_id, answerer_id, follower_ids = _thread(client, "once", 6)
+    solution_id, _ = _answer(client, answerer, question_id)
+
+    recipients = [
+        user_id
+        for (user_id,) in db.session.query(Notification.user_id).filter_by(type="new_answer", reference_id=solution_id)
+    ]
+    assert sorted(recipients) == sorted(follower_ids + [author_id])
+    assert answerer_id not in recipients
+
+    # Everyone has exactly one unread notification: one emit covers them all.
+    [(event, data, rooms)] = emits
+    assert (event, data) == ("notification_count_update", {"unread_count": 1})
+    assert sorted(rooms) == sorted(f"user_{user_id}" for user_id in recipients)
+
+
+def test_fanout_statements_do_not_grow_with_followers(client, emits):
+    small_answerer, small_question, *_ = _thread(client, "small", 3)
+    large_answerer, large_question, *_ = _thread(client, "large", 60)
+
+    _, small = _answer(client, small_answerer, small_question)
+    _, large = _answer(client, large_answerer, large_question)
+    assert small == large
@@ -0,0 +1,48 @@
+import pytest
+
+from app import db
+from app.services.notification_service import NotificationService
+from app.services.unread_counters import UnreadCounters
+
+from conftest import _StatementCounter
+
+
+def _plans(call):
+    """Run ``call`` and EXPLAIN every statement it sent that reads or writes notifications."""
+    with _StatementCounter(db.engine) as counter:
+        call()
+    connection = db.session.connection()
+    plans = []
+    for statement, parameters in zip(counter.statements, counter.parameters):
+        if "FROM notifications" in statement or statement.startswith("UPDATE notifications"):
+            rows = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).all()
+            plans.append(" ".join(row[-1] for row in rows))
+    db.session.rollback()
+    return plans
+
+
+@pytest.mark.parametrize(
+    "call, index",
+    [
+        # The inbox page, newest first, and its total
+        (lambda: NotificationService.get_user_notifications(1, per_page=10), "ix_notifications_user_id_created_at_id"),
+        # The unread-only page and its total
+        (
+            lambda: NotificationService.get_user_notifications(1, per_page=10, unread_only=True),
+            "ix_notifications_user_id_created_at_id",
+        ),
+        # Mark all read
+        (lambda: NotificationService.mark_all_notifications_read(1), "ix_notifications_user_id_is_read"),
+        # Unread counts recomputed per user by reconcile-counters
+        (lambda: UnreadCounters.reconcile(dry_run=True), "ix_notifications_user_id_is_read"),
+    ],
+    ids=["inbox", "unread-only", "mark-all-read", "reconcile"],
+)
+def test_notification_queries_use_an_index(app, call, index):
+    plans = _plans(call)
+    assert plans
+    assert any(index in plan for plan in plans), plans
+    for plan in plans:
+        assert "SEARCH notifications USING" in plan, plan
+        assert "SCAN notifications" not in plan
+        assert "TEMP B-TREE" not in plan
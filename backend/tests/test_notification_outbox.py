@@ -0,0 +1,127 @@
+from datetime import datetime
+
+import pytest
+
+from app import db
+from app.models import Follow, Notification, NotificationEvent, User
+from app.services import notification_outbox, websocket_service
+from app.services.notification_outbox import NotificationOutbox
+
+from test_problems_and_solutions import _auth_register_and_login, _create_problem
+
+
+@pytest.fixture()
+def outbox(app, monkeypatch):
+    monkeypatch.setitem(app.config, "NOTIFICATION_OUTBOX_ENABLED", True)
+    sent = []
+    monkeypatch.setattr(
+        websocket_service.socketio, "emit", lambda event, data, to=None, **kw: sent.append((data, sorted(to)))
+    )
+    # Drain events left by other tests so each test sees only its own.
+    db.session.execute(db.delete(NotificationEvent))
+    db.session.commit()
+    return sent
+
+
+def _user_id(email):
+    return db.session.query(User.id).filter_by(email=email).scalar()
+
+
+def _notifications(**filters):
+    return sorted(user_id for (user_id,) in db.session.query(Notification.user_id).filter_by(**filters))
+
+
+def test_answer_and_vote_are_notified_by_the_worker(client, outbox):
+    author = _auth_register_and_login(client, email="outbox_author@example.com")
+    answerer = _auth_register_and_login(client, email="outbox_answerer@example.com")
+    voter = _auth_register_and_login(client, email="outbox_voter@example.com")
+    question_id = _create_problem(client, author, title="Outbox question")["id"]
+    db.session.add(Follow(user_id=_user_id("outbox_voter@example.com"), question_id=question_id))
+    db.session.commit()
+
+    r = client.post(f"/problems/{question_id}/solutions", headers=answerer, json={"content": "Answer"})
+    assert r.status_code == 201
+    solution_id = r.get_json()["item"]["id"]
+    assert client.post(f"/solutions/{solution_id}/vote", headers=voter, json={"vote_type": "up"}).status_code == 200
+
+    # The requests only queued events.
+    assert _notifications(reference_id=solution_id, type="new_answer") == []
+    assert outbox == []
+    assert [event.kind for event in NotificationEvent.query.order_by(NotificationEvent.id)] == [
+        "answer_created", "vote_cast",
+    ]
+    assert NotificationOutbox.metrics()["pending"] == 2
+
+    stats = NotificationOutbox.process_batch()
+    assert (stats["claimed"], stats["processed"], stats["failed"]) == (2, 2, 0)
+    assert stats["max_lag_seconds"] >= 0
+
+    author_id, answerer_id, voter_id = map(
+        _user_id, ("outbox_author@example.com", "outbox_answerer@example.com", "outbox_voter@example.com")
+    )
+    assert _notifications(reference_id=solution_id, type="new_answer") == sorted([author_id, voter_id])
+    assert _notifications(type="vote", user_id=answerer_id) == [answerer_id]
+    assert NotificationEvent.query.count() == 0
+    # One push for the whole batch: the voter and answerer have 1 unread, the author 2.
+    assert sorted(outbox, key=lambda sent: sent[0]["unread_count"]) == [
+        ({"unread_count": 1}, sorted([f"user_{voter_id}", f"user_{answerer_id}"])),
+        ({"unread_count": 2}, [f"user_{author_id}"]),
+    ]
+
+
+def test_failing_event_is_retried_then_set_aside(app, outbox, monkeypatch):
+    monkeypatch.setitem(app.config, "NOTIFICATION_MAX_ATTEMPTS", 2)
+
+    def broken(payload):
+        raise RuntimeError("renderer exploded")
+
+    monkeypatch.setitem(notification_outbox.HANDLERS, "broken", broken)
+    monkeypatch.setitem(notification_outbox.HANDLERS, "noop", lambda payload: set())
+    NotificationOutbox.publish("broken", n=1)
+    NotificationOutbox.publish("noop", n=2)
+    db.session.commit()
+
+    stats = NotificationOutbox.process_batch()
+    # The batch is retried event by event, so the healthy event still goes through.
+    assert (stats["processed"], stats["failed"]) == (1, 1)
+    event = NotificationEvent.query.one()
+    assert (event.kind, event.attempts, event.failed_at) == ("broken", 1, None)
+    assert event.available_at > datetime.utcnow()
+    assert "renderer exploded" in event.last_error
+
+    # Not due yet: backoff keeps it out of the next batch.
+    assert NotificationOutbox.process_batch()["claimed"] == 0
+
+    event.available_at = datetime.utcnow()
+    db.session.commit()
+    NotificationOutbox.process_batch()
+    event = NotificationEvent.query.one()
+    assert event.attempts == 2 and event.failed_at is not None
+    assert NotificationOutbox.process_batch()["claimed"] == 0
+    assert NotificationOutbox.metrics() == {"pending": 0, "failed": 1, "oldest_pending_seconds": 0.0}
+
+
+def test_retry_skips_events_another_worker_took(app, outbox, monkeypatch):
+    monkeypatch.setitem(notification_outbox.HANDLERS, "broken", lambda payload: 1 / 0)
+    monkeypatch.setitem(notification_outbox.HANDLERS, "noop", lambda payload: set())
+    NotificationOutbox.publish("noop", n=1)
+    NotificationOutbox.publish("broken", n=2)
+    db.session.commit()
+    noop_id, broken_id = [event.id for event in NotificationEvent.query.order_by(NotificationEvent.id)]
+
+    # Once the failed batch releases its locks, another worker finishes the
+    # healthy event, then the broken one, before this worker re-claims them.
+    reclaim, calls = NotificationOutbox._reclaim, []
+
+    def other_worker_first(event_id):
+        calls.append(event_id)
+        if event_id == noop_id or calls.count(broken_id) == 2:
+            db.session.execute(db.delete(NotificationEvent).where(NotificationEvent.id == event_id))
+            db.session.commit()
+        return reclaim(event_id)
+
+    monkeypatch.setattr(NotificationOutbox, "_reclaim", staticmethod(other_worker_first))
+    stats = NotificationOutbox.process_batch()
+    assert (stats["claimed"], stats["processed"], stats["failed"], stats["skipped"]) == (2, 0, 0, 2)
+    assert calls == [noop_id, broken_id, broken_id]
+    assert NotificationEvent.query.count() == 0
@@ -0,0 +1,73 @@
+import pytest
+
+from app import db
+from app.models import Notification, User
+from app.services import notification_renderers
+from app.services.notification_renderers import register_renderer
+from app.services.unread_counters import UnreadCounters
+
+from conftest import _StatementCounter
+from test_problems_and_solutions import _auth_register_and_login, _create_problem
+
+
+@pytest.fixture(scope="module")
+def inbox(app):
+    client = app.test_client()
+    author = _auth_register_and_login(client, email="render_author@example.com")
+    crowd = [_auth_register_and_login(client, email=f"render_crowd_{i}@example.com") for i in range(4)]
+    question_id = _create_problem(client, author, title="Rendered question")["id"]
+    for headers in crowd:
+        solution_id = (
+            client.post(f"/problems/{question_id}/solutions", headers=headers, json={"content": "Answer"})
+            .get_json()["item"]["id"]
+        )
+        # The author upvotes each answer, notifying the answerer, not themselves.
+        client.post(f"/solutions/{solution_id}/vote", headers=author, json={"vote_type": "up"})
+    return {"client": client, "author": author, "crowd": crowd, "question": question_id}
+
+
+def _page(inbox, headers, per_page):
+    with _StatementCounter(db.engine) as counter:
+        r = inbox["client"].get("/notifications", headers=headers, query_string={"per_page": per_page})
+    assert r.status_code == 200
+    return r.get_json()["items"], counter.count
+
+
+def test_page_costs_one_query_per_type(inbox):
+    one, small = _page(inbox, inbox["author"], 1)
+    answers, large = _page(inbox, inbox["author"], 10)
+    assert len(one) == 1 and len(answers) == 4
+    assert small == large
+    assert {(item["message"], item["actionUrl"]) for item in answers} == {
+        ("New answer on Rendered question", f"/questions/{inbox['question']}")
+    }
+
+    [vote] = _page(inbox, inbox["crowd"][0], 10)[0]
+    assert (vote["message"], vote["actionUrl"]) == ("Your answer received a new vote", f"/questions/{inbox['question']}")
+
+
+def test_custom_renderer_and_missing_reference(inbox, monkeypatch):
+    monkeypatch.setattr(notification_renderers, "RENDERERS", dict(notification_renderers.RENDERERS))
+    monkeypatch.setattr("app.services.notification_service.RENDERERS", notification_renderers.RENDERERS)
+    loads = []
+
+    class MentionRenderer:
+        types = ("mention",)
+
+        def load(self, reference_ids):
+            loads.append(sorted(reference_ids))
+            return {reference_id: reference_id for reference_id in reference_ids if reference_id != 404}
+
+        def render(self, payload, reference_id):
+            payload["message"] = f"You were mentioned in #{reference_id}"
+
+    register_renderer(MentionRenderer())
+    user_id = db.session.query(User.id).filter_by(email="render_crowd_3@example.com").scalar()
+    db.session.add_all(Notification(user_id=user_id, type="mention", reference_id=ref) for ref in (7, 8, 404))
+    UnreadCounters.added([user_id], 3)
+    db.session.commit()
+
+    items, _ = _page(inbox, inbox["crowd"][3], 10)
+    messages = sorted(item["message"] for item in items if item["type"] == "mention")
+    assert messages == ["Mention", "You were mentioned in #7", "You were mentioned in #8"]
+    assert loads == [[7, 8, 404]]
@@ -0,0 +1,122 @@
+import io
+import json
+
+from app import db
+from app.models import Notification, Question, Solution, Tag
+from app.services.qa_import import QAImporter
+
+from test_problems_and_solutions import _auth_register_and_login, _create_problem
+
+
+def _question(title):
+    return db.session.query(Question).filter_by(title=title).one()
+
+
+def test_ndjson_import_creates_questions_solutions_and_tags(app):
+    client = app.test_client()
+    _auth_register_and_login(client, email="import_author@example.com")
+    records = [
+        {
+            "title": "Imported ndjson question",
+            "description": "From the 2023 cohort",
+            "problem_type": "technical",
+            "author_email": "import_author@example.com",
+            "tags": ["Import-Tag", "python"],
+            "created_at": "2023-04-01T09:30:00+03:00",
+            "solutions": [{"content": "Historical answer", "author_email": "import_author@example.com"}],
+        },
+        {"title": "", "description": "x", "problem_type": "technical"},
+    ]
+    stream = io.StringIO("\n".join(json.dumps(record) for record in records) + "\nnot json\n")
+    report = QAImporter.run(stream, "ndjson", chunk_size=1)
+
+    assert (report["questions"], report["solutions"]) == (1, 1), report
+    assert report["error_count"] == 2
+    assert [error["line"] for error in report["errors"]] == [2, 3]
+
+    db.session.expunge_all()
+    question = _question("Imported ndjson question")
+    assert sorted(tag.name for tag in question.tags) == ["import-tag", "python"]
+    assert question.created_at.isoformat() == "2023-04-01T06:30:00"
+    assert question.solutions_count == 1
+    assert question.hot_score == 0
+    assert [solution.content for solution in question.solutions] == ["Historical answer"]
+    assert db.session.query(Tag).filter_by(name="import-tag").count() == 1
+
+
+def test_csv_rows_link_solutions_by_ref_and_to_existing_questions(app):
+    client = app.test_client()
+    headers = _auth_register_and_login(client, email="import_csv@example.com")
+    existing = _create_problem(client, headers, title="Existing before CSV import")
+    notifications = db.session.query(Notification).count()
+
+    stream = io.StringIO(
+        "kind,ref,question_ref,question_id,title,description,problem_type,tags,author_email,content\n"
+        "question,q1,,,CSV imported question,Body,logical,csv-a|csv-b,import_csv@example.com,\n"
+        "solution,,q1,,,,,,import_csv@example.com,First CSV answer\n"
+        "question,q1,,,CSV duplicate ref,Body,logical,,import_csv@example.com,\n"
+        f"solution,,,{existing['id']},,,,,import_csv@example.com,Late CSV answer\n"
+        "solution,,q9,,,,,,import_csv@example.com,Orphan\n"
+        "solution,,q1,,,,,,import_csv@example.com,Second CSV answer\n"
+    )
+    report = QAImporter.run(stream, "csv", chunk_size=3)
+
+    assert (report["questions"], report["solutions"]) == (1, 3)
+    assert report["errors"] == [
+        {"line": 4, "error": "duplicate ref q1"},
+        {"line": 6, "error": "unknown question q9"},
+    ]
+    db.session.expunge_all()
+    imported = _question("CSV imported question")
+    assert sorted(tag.name for tag in imported.tags) == ["csv-a", "csv-b"]
+    assert sorted(s.content for s in imported.solutions) == ["First CSV answer", "Second CSV answer"]
+    # Answers in their own rows count, whether or not they share the question's chunk.
+    assert imported.solutions_count == 2
+    assert db.session.get(Question, existing["id"]).solutions_count == 1
+    assert db.session.query(Question).filter_by(title="CSV duplicate ref").count() == 0
+    # Imports never notify followers or authors.
+    assert db.session.query(Notification).count() == notifications
+
+    searched = client.get("/problems", query_string={"search": "CSV imported"}).get_json()
+    assert imported.id in [item["id"] for item in searched["items"]]
+
+
+def test_default_author_covers_unknown_users(app):
+    client = app.test_client()
+    _auth_register_and_login(client, email="import_default@example.com")
+    author_id = db.session.query(Question.user_id).limit(1).scalar()
+    stream = io.StringIO(json.dumps({"items": [
+        {"title": "Imported with default author", "description": "d", "problem_type": "stage", "user_id": 987654},
+    ]}))
+
+    assert QAImporter.run(stream, "json")["error_count"] == 1
+    stream.seek(0)
+    report = QAImporter.run(stream, "json", default_author_id=author_id)
+    assert report["questions"] == 1 and report["error_count"] == 0
+    db.session.expunge_all()
+    assert _question("Imported with default author").user_id == author_id
+
+
+def test_admin_import_endpoint_streams_the_body(client):
+    admin = _auth_register_and_login(client, email="import_admin@example.com")
+    body = json.dumps([
+        {"title": "Imported over HTTP", "description": "d", "problem_type": "language",
+         "author_email": "import_admin@example.com", "solutions": [{"content": "HTTP answer"}]},
+    ])
+    r = client.post(
+        "/admin/import?default_author=import_admin@example.com",
+        headers=admin, data=body, content_type="application/json",
+    )
+    assert r.status_code == 200, r.data
+    report = r.get_json()
+    assert (report["questions"], report["solutions"], report["error_count"]) == (1, 1, 0)
+    assert report["rows_per_second"] is not None
+
+    db.session.expunge_all()
+    question = _question("Imported over HTTP")
+    assert db.session.query(Solution).filter_by(question_id=question.id).count() == 1
+    listed = client.get("/problems", query_string={"search": "Imported over HTTP"}).get_json()
+    assert question.id in [item["id"] for item in listed["items"]]
+
+    bad = client.post("/admin/import", headers=admin, data="x", content_type="text/plain")
+    assert bad.status_code == 400
@@ -0,0 +1,131 @@
+import pytest
+
+from app import create_app, db
+from app.services.question_cache import LocalCacheStore, RedisCacheStore
+
+from conftest import _StatementCounter
+from test_problems_and_solutions import _auth_register_and_login, _create_problem
+
+
+def _get(client, question_id, headers=None):
+    r = client.get(f"/problems/{question_id}", headers=headers)
+    assert r.status_code == 200, r.data
+    return r.get_json()["item"]
+
+
+def _answer(client, headers, question_id):
+    r = client.post(f"/problems/{question_id}/solutions", headers=headers, json={"content": "Cached?"})
+    assert r.status_code == 201, r.data
+    return r.get_json()["item"]["id"]
+
+
+def test_repeat_reads_are_served_from_cache(client):
+    headers = _auth_register_and_login(client, email="cache_reads@example.com")
+    problem = _create_problem(client, headers, title="Cache me", description="Body")
+    _answer(client, headers, problem["id"])
+
+    _get(client, problem["id"])
+    db.session.expunge_all()
+    with _StatementCounter(db.engine) as counter:
+        item = _get(client, problem["id"])
+    # Only the validator read: the local store keys entries on database state.
+    assert [s.split()[0] for s in counter.statements] == ["SELECT"]
+    assert item["solutions_count"] == 1
+
+
+def test_writes_invalidate_question_and_lists(client):
+    author = _auth_register_and_login(client, email="cache_author@example.com")
+    voter = _auth_register_and_login(client, email="cache_voter@example.com")
+    problem = _create_problem(client, author, title="Invalidate me", description="Body")
+    assert _get(client, problem["id"])["solutions_count"] == 0
+
+    solution_id = _answer(client, author, problem["id"])
+    assert _get(client, problem["id"])["solutions_count"] == 1
+
+    client.post(f"/solutions/{solution_id}/vote", headers=voter, json={"vote_type": "up"})
+    assert _get(client, problem["id"])["vote_total"] == 1
+
+    client.post(f"/problems/{problem['id']}/follow", headers=voter)
+    assert _get(client, problem["id"])["follows_count"] == 1
+
+    client.put(f"/problems/{problem['id']}", headers=author, json={"title": "Renamed"})
+    listed = client.get("/problems", query_string={"search": "Renamed"}).get_json()["items"]
+    assert [item["title"] for item in listed if item["id"] == problem["id"]] == ["Renamed"]
+
+
+def test_viewer_fields_are_overlaid_per_user(client):
+    author = _auth_register_and_login(client, email="cache_overlay_a@example.com")
+    voter = _auth_register_and_login(client, email="cache_overlay_b@example.com")
+    problem = _create_problem(client, author, title="Overlay", description="Body")
+    solution_id = _answer(client, author, problem["id"])
+    client.post(f"/solutions/{solution_id}/vote", headers=voter, json={"vote_type": "down"})
+    client.post(f"/problems/{problem['id']}/follow", headers=voter)
+
+    as_voter = _get(client, problem["id"], voter)
+    as_author = _get(client, problem["id"], author)
+    anonymous = _get(client, problem["id"])
+
+    assert as_voter["is_following"] is True
+    assert as_voter["answers"][0]["my_vote"] == -1
+    assert as_author["is_following"] is False
+    assert as_author["answers"][0]["my_vote"] == 0
+    assert "is_following" not in anonymous
+
+
+def test_related_cards_follow_linked_question_changes(client):
+    headers = _auth_register_and_login(client, email="cache_related@example.com")
+    first = _create_problem(client, headers, title="Cache first", description="Body")
+    second = _create_problem(client, headers, title="Cache second", description="Body")
+    client.post(f"/problems/{first['id']}/related/{second['id']}", headers=headers)
+    _get(client, first["id"])
+
+    _answer(client, headers, second["id"])
+    related = _get(client, first["id"])["related_questions"]
+    assert related[0]["id"] == second["id"]
+    assert related[0]["solutions_count"] == 1
+
+
+def test_local_store_evicts_least_recently_used():
+    store = LocalCacheStore(max_entries=2, ttl=60)
+    store.set("a", "1")
+    store.set("b", "2")
+    store.get("a")
+    store.set("c", "3")
+    assert store.get("a") == "1"
+    assert store.get("b") is None
+
+    before = store.versions(["v"])[0]
+    store.bump(["v"])
+    store.clear()
+    assert store.versions(["v"])[0] == before + 1
+
+
+@pytest.mark.parametrize(
+    "env, backend",
+    [
+        ({}, "local"),
+        ({"WEB_CONCURRENCY": "4"}, "none"),
+        ({"WEB_CONCURRENCY": "4", "QUESTION_CACHE_BACKEND": "local"}, "local"),
+    ],
+    ids=["single-worker", "several-workers", "explicit"],
+)
+def test_local_cache_is_off_by_default_with_several_workers(app, monkeypatch, env, backend):
+    monkeypatch.delenv("WEB_CONCURRENCY", raising=False)
+    monkeypatch.delenv("QUESTION_CACHE_BACKEND", raising=False)
+    for name, value in env.items():
+        monkeypatch.setenv(name, value)
+    assert create_app().config["QUESTION_CACHE_BACKEND"] == backend
+
+
+def test_unreachable_redis_falls_back_to_the_database(app, client, monkeypatch):
+    pytest.importorskip("redis")
+    # Nothing listens on port 1; the client only fails once it is used.
+    monkeypatch.setitem(app.extensions, "question_cache", RedisCacheStore("redis://127.0.0.1:1/0"))
+    headers = _auth_register_and_login(client, email="cache_down@example.com")
+    problem = _create_problem(client, headers, title="Redis is down", description="Body")
+
+    _answer(client, headers, problem["id"])
+    assert _get(client, problem["id"])["solutions_count"] == 1
+    first = client.get(f"/problems/{problem['id']}").headers["ETag"]
+    assert client.get(f"/problems/{problem['id']}").headers["ETag"] != first
+    assert client.get("/problems").status_code == 200
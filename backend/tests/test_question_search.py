@@ -0,0 +1,49 @@
+from test_problems_and_solutions import _auth_register_and_login, _create_problem
+
+
+def test_search_ranks_title_matches_and_highlights(client):
+    headers = _auth_register_and_login(client, email="search@example.com")
+    body_hit = _create_problem(
+        client, headers, title="Deploying apps", description="Use gunicorn with websockets behind nginx"
+    )
+    title_hit = _create_problem(
+        client, headers, title="Websockets in Flask", description="How do I push events?"
+    )
+
+    r = client.get("/problems", query_string={"search": "websocket"})
+    assert r.status_code == 200, r.data
+    items = r.get_json()["items"]
+    ids = [item["id"] for item in items]
+    assert ids.index(title_hit["id"]) < ids.index(body_hit["id"])
+
+    top = items[ids.index(title_hit["id"])]
+    assert "<mark>" in top["highlight"]["title"]
+
+
+def test_search_index_follows_edits_and_deletes(client):
+    headers = _auth_register_and_login(client, email="search_edit@example.com")
+    problem = _create_problem(client, headers, title="Quokka question", description="Original")
+
+    def hits(term):
+        r = client.get("/problems", query_string={"search": term})
+        return [item["id"] for item in r.get_json()["items"]]
+
+    assert problem["id"] in hits("quokka")
+
+    client.put(f"/problems/{problem['id']}", headers=headers, json={"title": "Wombat question"})
+    assert problem["id"] not in hits("quokka")
+    assert problem["id"] in hits("wombat")
+
+    client.delete(f"/problems/{problem['id']}", headers=headers)
+    assert problem["id"] not in hits("wombat")
+
+
+def test_search_input_cannot_inject_fts_syntax(client):
+    r = client.get("/problems", query_string={"search": 'NEAR( "unbalanced * OR -'})
+    assert r.status_code == 200, r.data
+
+
+def test_search_rebuild_command(app):
+    result = app.test_cli_runner().invoke(args=["search-rebuild"])
+    assert result.exit_code == 0, result.output
+    assert "sqlite backend" in result.output
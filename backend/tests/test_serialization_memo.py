@@ -0,0 +1,30 @@
+from app import db
+from app.models import Question
+from app.services.loader_profiles import loader_options
+from app.services.question_service import QuestionService
+from app.services.serialization_memo import SerializationMemo
+
+from test_problems_and_solutions import _auth_register_and_login, _create_problem
+
+
+def test_authors_are_serialized_once_per_request(app, client):
+    headers = _auth_register_and_login(client, email="memo@example.com")
+    question_id = _create_problem(client, headers, title="Memo thread")["id"]
+    for content in ("First", "Second"):
+        client.post(f"/problems/{question_id}/solutions", headers=headers, json={"content": content})
+    db.session.expunge_all()
+    question = Question.query.options(*loader_options("detail")).filter_by(id=question_id).one()
+
+    with app.test_request_context():
+        payload = QuestionService._serialize_question(question, include_answers=True)
+        authors = [payload["author"]] + [answer["author"] for answer in payload["answers"]]
+        assert len({id(author) for author in authors}) == 1
+        assert SerializationMemo.tag_names(question) is SerializationMemo.tag_names(question)
+
+    with app.test_request_context():
+        again = QuestionService._serialize_question(question, include_answers=True)
+        assert again["author"] == payload["author"]
+        assert again["author"] is not payload["author"]
+
+    # Outside a request there is nothing to share.
+    assert SerializationMemo.user(question.author) is not SerializationMemo.user(question.author)
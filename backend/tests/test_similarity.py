@@ -0,0 +1,88 @@
+import os
+
+from app.services import similarity_service
+from app.services.similarity_service import SimilarityIndex, _terms
+
+from test_problems_and_solutions import _auth_register_and_login, _create_problem
+
+
+def _ids(response):
+    assert response.status_code == 200, response.data
+    return [item["id"] for item in response.get_json()["items"]]
+
+
+def test_similar_endpoints_rank_by_shared_terms(client):
+    headers = _auth_register_and_login(client, email="similar@example.com")
+    base = _create_problem(
+        client, headers, title="Zebrafish websocket reconnect", description="Socket drops under gunicorn"
+    )
+    twin = _create_problem(
+        client, headers, title="Zebrafish websocket keeps reconnecting", description="gunicorn eventlet"
+    )
+    other = _create_problem(client, headers, title="Zebrafish CSS grid", description="Layout columns")
+
+    r = client.get(f"/problems/{base['id']}/similar")
+    ids = _ids(r)
+    assert base["id"] not in ids
+    assert ids.index(twin["id"]) < ids.index(other["id"])
+    assert r.get_json()["items"][0]["similarity"] > 0
+
+    ids = _ids(client.get("/problems/similar", query_string={"title": "websocket reconnect zebrafish"}))
+    assert ids[:2] == [base["id"], twin["id"]] or ids[:2] == [twin["id"], base["id"]]
+
+    assert client.get("/problems/similar").status_code == 400
+    assert client.get("/problems/999999/similar").status_code == 404
+
+
+def test_index_follows_creates_and_deletes(client):
+    headers = _auth_register_and_login(client, email="similar_live@example.com")
+    _create_problem(client, headers, title="Quasar tooltip flicker", description="Tooltip flickers")
+    assert _ids(client.get("/problems/similar", query_string={"title": "quasar tooltip"}))
+
+    late = _create_problem(client, headers, title="Quasar tooltip position", description="Offset")
+    assert late["id"] in _ids(client.get("/problems/similar", query_string={"title": "quasar tooltip"}))
+
+    client.delete(f"/problems/{late['id']}", headers=headers)
+    assert late["id"] not in _ids(client.get("/problems/similar", query_string={"title": "quasar tooltip"}))
+
+
+def test_incremental_adds_merge_into_postings(monkeypatch):
+    monkeypatch.setattr(similarity_service, "MERGE_THRESHOLD", 2)
+    index = SimilarityIndex.build([(1, _terms("python decorators explained"))])
+    index.add(2, _terms("python generators explained"))
+    index.add(3, _terms("rust lifetimes"))
+    assert not index.delta
+    assert index.postings.shape[1] == 3
+
+    index.add(2, _terms("rust borrow checker lifetimes"))
+    matches = index.query(_terms("rust lifetimes"), k=3)
+    assert [question_id for question_id, _ in matches][:2] in ([3, 2], [2, 3])
+    assert 1 not in dict(matches)
+
+
+def test_saved_index_is_memory_mapped(tmp_path):
+    index = SimilarityIndex.build(
+        [(1, _terms("docker compose volumes")), (2, _terms("docker networking bridge"))]
+    )
+    index.add(3, _terms("docker compose healthcheck"))
+    index.remove(2)
+    index.save(str(tmp_path), "db-a")
+
+    loaded = SimilarityIndex.load(str(tmp_path), "db-a")
+    # mmap_mode="r" hands back read-only views onto the files, not private copies.
+    assert not loaded.question_ids.flags.writeable
+    assert not loaded.postings.data.flags.writeable
+    assert sorted(loaded.question_ids.tolist()) == [1, 3]
+    assert sorted(question_id for question_id, _ in loaded.query(_terms("docker compose"))) == [1, 3]
+    assert SimilarityIndex.load(str(tmp_path), "db-b") is None
+
+
+def test_similarity_rebuild_command(app, tmp_path):
+    previous = app.config["SIMILARITY_INDEX_PATH"]
+    app.config["SIMILARITY_INDEX_PATH"] = str(tmp_path)
+    try:
+        result = app.test_cli_runner().invoke(args=["similarity-rebuild"])
+    finally:
+        app.config["SIMILARITY_INDEX_PATH"] = previous
+    assert result.exit_code == 0, result.output
+    assert os.path.exists(tmp_path / "meta.json")
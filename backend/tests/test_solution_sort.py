@@ -0,0 +1,91 @@
+import pytest
+from sqlalchemy import text
+
+from app import db
+
+from test_problems_and_solutions import _auth_register_and_login, _create_problem, _unwrap
+
+
+@pytest.fixture(scope="module")
+def thread(app):
+    client = app.test_client()
+    author = _auth_register_and_login(client, email="sort_author@example.com")
+    voters = [_auth_register_and_login(client, email=f"sort_voter_{i}@example.com") for i in range(3)]
+    question_id = _create_problem(client, author, title="Solution sort orders")["id"]
+    solution_ids = [
+        client.post(f"/problems/{question_id}/solutions", headers=author, json={"content": f"Answer {i}"})
+        .get_json()["item"]["id"]
+        for i in range(5)
+    ]
+    # Net scores: answer 2 -> +3, answer 4 -> +1, answer 0 -> -1, the rest 0.
+    for headers in voters:
+        client.post(f"/solutions/{solution_ids[2]}/vote", headers=headers, json={"vote_type": "up"})
+    client.post(f"/solutions/{solution_ids[4]}/vote", headers=voters[0], json={"vote_type": "up"})
+    client.post(f"/solutions/{solution_ids[0]}/vote", headers=voters[1], json={"vote_type": "down"})
+    return {"question": question_id, "solutions": solution_ids}
+
+
+def _ids(response):
+    assert response.status_code == 200, response.data
+    items = _unwrap(response.get_json())
+    items = items.get("items") if isinstance(items, dict) else items
+    return [item["id"] for item in items]
+
+
+def _expected(thread, sort):
+    a, b, c, d, e = thread["solutions"]
+    return {"oldest": [a, b, c, d, e], "newest": [e, d, c, b, a], "score": [c, e, d, b, a]}[sort]
+
+
+@pytest.mark.parametrize("sort", ["oldest", "newest", "score"])
+def test_sort_orders_with_page_and_cursor(client, thread, sort):
+    url = f"/problems/{thread['question']}/solutions"
+    assert _ids(client.get(url, query_string={"sort": sort})) == _expected(thread, sort)
+
+    pages, cursor = [], ""
+    while cursor is not None:
+        r = client.get(url, query_string={"sort": sort, "per_page": 2, "cursor": cursor})
+        assert r.status_code == 200
+        body = r.get_json()
+        pages += _ids(r)
+        cursor = body["next_cursor"]
+        assert body["has_more"] is (cursor is not None)
+    assert pages == _expected(thread, sort)
+
+
+def test_default_order_and_score_follow_votes(client, thread):
+    url = f"/problems/{thread['question']}/solutions"
+    assert _ids(client.get(url)) == _expected(thread, "oldest")
+
+    a, b, c, d, e = thread["solutions"]
+    newcomer = _auth_register_and_login(client, email="sort_newcomer@example.com")
+    # b: 0 -> +1 (ties with e, higher id first) -> -1 (ties with a) -> 0.
+    client.post(f"/solutions/{b}/vote", headers=newcomer, json={"vote_type": "up"})
+    assert _ids(client.get(url, query_string={"sort": "score"})) == [c, e, b, d, a]
+    client.post(f"/solutions/{b}/vote", headers=newcomer, json={"vote_type": "down"})
+    assert _ids(client.get(url, query_string={"sort": "score"})) == [c, e, d, b, a]
+    client.delete(f"/solutions/{b}/vote", headers=newcomer)
+    assert _ids(client.get(url, query_string={"sort": "score"})) == _expected(thread, "score")
+
+
+def test_bad_sort_or_cursor_is_rejected(client, thread):
+    url = f"/problems/{thread['question']}/solutions"
+    assert client.get(url, query_string={"sort": "best"}).status_code == 400
+    assert client.get(url, query_string={"sort": "score", "cursor": "not-a-cursor"}).status_code == 400
+
+
+@pytest.mark.parametrize(
+    "order, index",
+    [
+        ("score DESC, id DESC", "ix_solutions_question_id_score_id"),
+        ("created_at DESC, id DESC", "ix_solutions_question_id_created_at_id"),
+        ("created_at ASC, id ASC", "ix_solutions_question_id_created_at_id"),
+    ],
+)
+def test_thread_page_is_an_index_scan(app, order, index):
+    plan = db.session.execute(
+        text(f"EXPLAIN QUERY PLAN SELECT id FROM solutions WHERE question_id = 1 ORDER BY {order} LIMIT 20")
+    ).all()
+    details = " ".join(row[-1] for row in plan)
+    assert index in details
+    assert "TEMP B-TREE" not in details
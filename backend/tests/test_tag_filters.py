@@ -0,0 +1,75 @@
+import pytest
+from sqlalchemy import text
+
+from app import db
+
+from test_problems_and_solutions import _auth_register_and_login, _create_problem
+
+
+def _ids(response):
+    assert response.status_code == 200, response.data
+    return [item["id"] for item in response.get_json()["items"]]
+
+
+@pytest.fixture(scope="module")
+def tagged(app):
+    client = app.test_client()
+    headers = _auth_register_and_login(client, email="tag_filters@example.com")
+    tag_ids = {
+        name: client.post("/tags", json={"name": name}).get_json()["tag"]["id"]
+        for name in ("tf-python", "tf-flask", "tf-react")
+    }
+    questions = {
+        "both": _create_problem(
+            client, headers, title="Flask app factory", tag_ids=[tag_ids["tf-python"], tag_ids["tf-flask"]]
+        )["id"],
+        "python": _create_problem(client, headers, title="List comprehensions", tag_ids=[tag_ids["tf-python"]])["id"],
+        "react": _create_problem(client, headers, title="useEffect cleanup", tag_ids=[tag_ids["tf-react"]])["id"],
+    }
+    db.session.expunge_all()
+    return questions
+
+
+def test_tags_filter_with_any_and_all(client, tagged):
+    assert _ids(client.get("/problems?tags=tf-python,TF-Flask")) == [tagged["python"], tagged["both"]]
+    assert _ids(client.get("/problems?tags=tf-python,tf-flask&tag_match=all")) == [tagged["both"]]
+    assert _ids(client.get("/problems?tags=tf-flask,tf-react&tag_match=all")) == []
+    assert _ids(client.get("/problems?tags=tf-react,tf-unknown")) == [tagged["react"]]
+    assert _ids(client.get("/problems?tags=tf-react,tf-unknown&tag_match=all")) == []
+
+    cursor_page = client.get("/problems?tags=tf-python&cursor=").get_json()
+    assert [item["id"] for item in cursor_page["items"]] == [tagged["python"], tagged["both"]]
+
+    assert client.get("/problems?tags=tf-python&tag_match=some").status_code == 400
+    many = ",".join(f"t{i}" for i in range(11))
+    assert client.get(f"/problems?tags={many}").status_code == 400
+
+
+def test_tag_questions_keyset_pages(client, tagged):
+    first = client.get("/tags/tf-python/questions?per_page=1")
+    assert _ids(first) == [tagged["python"]]
+    meta = first.get_json()["meta"]
+    assert meta["has_more"] and meta["tag"] == "tf-python"
+
+    second = client.get("/tags/tf-python/questions", query_string={"per_page": 1, "cursor": meta["next_cursor"]})
+    assert _ids(second) == [tagged["both"]]
+    assert second.get_json()["meta"]["next_cursor"] is None
+
+    v2 = client.get("/v2/tags/tf-python/questions").get_json()
+    assert [item["id"] for item in v2["data"]] == [tagged["python"], tagged["both"]]
+
+    assert client.get("/tags/tf-missing/questions").status_code == 404
+    assert client.get("/tags/tf-python/questions?cursor=garbage").status_code == 400
+
+
+def test_tag_semi_join_uses_the_composite_index(app, tagged):
+    tag_id = db.session.execute(text("SELECT id FROM tags WHERE name = 'tf-python'")).scalar()
+    plan = db.session.execute(
+        text(
+            "EXPLAIN QUERY PLAN SELECT question_id FROM question_tags WHERE tag_id IN (:tag_id)"
+        ),
+        {"tag_id": tag_id},
+    ).all()
+    details = " ".join(row[-1] for row in plan)
+    assert "ix_question_tags_tag_id_question_id" in details
+    assert "COVERING INDEX" in details
@@ -0,0 +1,89 @@
+from app import db
+from app.models import Follow, Notification, User
+from app.services.unread_counters import UnreadCounters
+
+from conftest import _StatementCounter
+from test_problems_and_solutions import _auth_register_and_login, _create_problem
+
+
+def _user_id(email):
+    return db.session.query(User.id).filter_by(email=email).scalar()
+
+
+def _counter(user_id):
+    db.session.expire_all()
+    return db.session.get(User, user_id).unread_notifications
+
+
+def _unread(client, headers):
+    with _StatementCounter(db.engine) as counter:
+        r = client.get("/notifications/unread-count", headers=headers)
+    assert r.status_code == 200
+    assert not [s for s in counter.statements if "FROM notifications" in s]
+    return r.get_json()["unread_count"]
+
+
+def test_counter_follows_notifications_and_reads(client):
+    author = _auth_register_and_login(client, email="unread_author@example.com")
+    answerer = _auth_register_and_login(client, email="unread_answerer@example.com")
+    author_id = _user_id("unread_author@example.com")
+    question_id = _create_problem(client, author, title="Unread counter")["id"]
+
+    solution_ids = [
+        client.post(f"/problems/{question_id}/solutions", headers=answerer, json={"content": f"Answer {i}"})
+        .get_json()["item"]["id"]
+        for i in range(2)
+    ]
+    client.post(f"/solutions/{solution_ids[0]}/vote", headers=answerer, json={"vote_type": "up"})
+    assert _counter(author_id) == 3
+    assert _unread(client, author) == 3
+
+    notification_id = (
+        db.session.query(Notification.id).filter_by(user_id=author_id).order_by(Notification.id).first()[0]
+    )
+    for _ in range(2):
+        r = client.put(f"/notifications/{notification_id}/read", headers=author)
+        assert r.status_code == 200, r.data
+    assert _unread(client, author) == 2
+
+    assert client.put("/notifications/999999/read", headers=author).status_code == 404
+    client.put("/notifications/read-all", headers=author)
+    assert _unread(client, author) == 0
+
+
+def test_reconcile_repairs_drift(client):
+    _auth_register_and_login(client, email="unread_drift@example.com")
+    user_id = _user_id("unread_drift@example.com")
+    UnreadCounters.reconcile()
+    db.session.add(Notification(user_id=user_id, type="new_answer", reference_id=1))
+    db.session.commit()  # bypasses the counter
+    assert _counter(user_id) == 0
+
+    assert UnreadCounters.reconcile(dry_run=True) == 1
+    assert _counter(user_id) == 0
+    assert UnreadCounters.reconcile() == 1
+    assert _counter(user_id) == 1
+    assert UnreadCounters.reconcile(dry_run=True) == 0
+
+
+def test_follow_during_fanout_does_not_move_its_counter(client, monkeypatch):
+    author = _auth_register_and_login(client, email="unread_race_author@example.com")
+    answerer = _auth_register_and_login(client, email="unread_race_answerer@example.com")
+    _auth_register_and_login(client, email="unread_race_late@example.com")
+    late_id = _user_id("unread_race_late@example.com")
+    question_id = _create_problem(client, author, title="Followed mid fan-out")["id"]
+
+    # A follow lands after the notifications are inserted, before the counters move.
+    added = UnreadCounters.added
+
+    def follow_then_add(user_ids, amount=1):
+        db.session.add(Follow(user_id=late_id, question_id=question_id))
+        db.session.flush()
+        added(user_ids, amount)
+
+    monkeypatch.setattr(UnreadCounters, "added", staticmethod(follow_then_add))
+    r = client.post(f"/problems/{question_id}/solutions", headers=answerer, json={"content": "Answer"})
+    assert r.status_code == 201, r.data
+    assert _counter(late_id) == 0
+    assert _counter(_user_id("unread_race_author@example.com")) == 1
+    assert not db.session.query(Notification).filter_by(user_id=late_id).count()
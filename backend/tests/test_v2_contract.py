@@ -0,0 +1,106 @@
+"""Contract tests: every v2 response carries exactly the data of its v1 twin.
+
+Each case names a v1 URL and how to read the canonical data and meta out of
+the v1 payload; the v2 response (via the /v2 prefix and via the Accept header)
+must be ``{"data": <same>, "meta": <same>}`` and nothing else.
+"""
+
+import pytest
+
+from app import db
+from app.utils.envelope import V2_MEDIA_TYPE
+
+from test_problems_and_solutions import _auth_register_and_login, _create_problem
+
+V2_ACCEPT = {"Accept": V2_MEDIA_TYPE}
+
+
+def _pages(payload):
+    return payload["meta"]
+
+
+@pytest.fixture()
+def thread(client):
+    headers = _auth_register_and_login(client, email="contract@example.com")
+    follower = _auth_register_and_login(client, email="contract_follower@example.com")
+    problem = _create_problem(client, headers, title="Contract thread", description="Body")
+    client.post(f"/problems/{problem['id']}/follow", headers=follower)
+    r = client.post(f"/problems/{problem['id']}/solutions", headers=headers, json={"content": "Answer"})
+    solution_id = r.get_json()["item"]["id"]
+    client.post("/tags", json={"name": "contract-tag"})
+    db.session.expunge_all()
+    return {"headers": headers, "follower": follower, "question": problem["id"], "solution": solution_id}
+
+
+CASES = [
+    # (v1 url template, auth key, v1 data extractor, v1 meta extractor)
+    ("/problems", "headers", lambda p: p["items"], _pages),
+    ("/problems?cursor=", "headers", lambda p: p["items"], _pages),
+    ("/problems/{question}", "headers", lambda p: p["item"], None),
+    ("/problems/{question}/solutions", "headers", lambda p: p["items"], lambda p: {
+        key: p[key] for key in ("current_page", "pages", "per_page", "total")
+    }),
+    ("/problems/{question}/solutions/{solution}", "headers", lambda p: p["item"], None),
+    ("/solutions/{solution}", "headers", lambda p: p["data"], None),
+    ("/tags", None, lambda p: p["items"], _pages),
+    ("/notifications", "follower", lambda p: p["items"], _pages),
+    ("/notifications/unread-count", "follower", lambda p: p, None),
+]
+
+
+@pytest.mark.parametrize("url, auth, data_of, meta_of", CASES)
+def test_v2_matches_v1(client, thread, url, auth, data_of, meta_of):
+    url = url.format(**thread)
+    headers = thread[auth] if auth else {}
+
+    v1 = client.get(url, headers=headers)
+    assert v1.status_code == 200, v1.data
+    v1_payload = v1.get_json()
+    expected = {"data": data_of(v1_payload)}
+    if meta_of is not None:
+        expected["meta"] = meta_of(v1_payload)
+
+    prefixed = client.get(f"/v2{url}", headers=headers)
+    negotiated = client.get(url, headers={**headers, **V2_ACCEPT})
+    for response in (prefixed, negotiated):
+        assert response.status_code == 200, response.data
+        assert response.get_json() == expected
+
+
+def test_v2_writes_use_the_envelope(client, thread):
+    headers = thread["headers"]
+
+    created = client.post("/v2/problems", headers=headers, json={
+        "title": "Made via v2", "description": "Body", "problem_type": "technical",
+    })
+    assert created.status_code == 201, created.data
+    assert set(created.get_json()) == {"data"}
+    question_id = created.get_json()["data"]["id"]
+
+    answered = client.post(
+        f"/v2/problems/{question_id}/solutions", headers=headers, json={"content": "v2 answer"}
+    )
+    assert answered.status_code == 201
+    assert answered.get_json()["data"]["question_id"] == question_id
+
+    followed = client.post(f"/v2/problems/{question_id}/follow", headers=thread["follower"])
+    assert followed.get_json() == {"data": {"message": "Followed"}}
+
+    tag = client.post("/v2/tags", json={"name": "contract-tag"})
+    assert tag.get_json()["data"]["name"] == "contract-tag"
+
+
+def test_errors_keep_their_shape(client):
+    v1 = client.get("/problems/999999")
+    v2 = client.get("/v2/problems/999999")
+    assert v1.status_code == v2.status_code == 404
+    assert v1.get_json() == v2.get_json() == {"error": "Problem not found"}
+
+
+def test_v1_and_v2_never_share_an_etag(client, thread):
+    url = f"/problems/{thread['question']}"
+    v1 = client.get(url)
+    v2 = client.get(url, headers=V2_ACCEPT)
+    assert v1.headers["ETag"] != v2.headers["ETag"]
+    assert "Accept" in v2.headers["Vary"]
+    assert client.get(url, headers={**V2_ACCEPT, "If-None-Match": v1.headers["ETag"]}).status_code == 200
@@ -0,0 +1,132 @@
+import threading
+
+import pytest
+
+from app import db
+from app.models import Notification, Solution, Vote
+from app.services.solution_service import SolutionService
+from app.services.vote_buffer import VoteBuffer
+
+from conftest import _StatementCounter
+from test_problems_and_solutions import _auth_register_and_login, _create_problem, _unwrap
+
+
+@pytest.fixture()
+def buffered(app):
+    app.config.update(VOTE_BUFFER_ENABLED=True, VOTE_BUFFER_FLUSH_MS=0)
+    yield
+    VoteBuffer.flush()
+    app.config["VOTE_BUFFER_ENABLED"] = False
+    app.extensions.pop("vote_buffer", None)
+
+
+def _thread(client, suffix):
+    author = _auth_register_and_login(client, email=f"buffer_author_{suffix}@example.com")
+    question = _create_problem(client, author, title=f"Buffered votes {suffix}")
+    r = client.post(f"/problems/{question['id']}/solutions", headers=author, json={"content": "Answer"})
+    return author, question["id"], r.get_json()["item"]["id"]
+
+
+def _counts(solution_id):
+    db.session.expunge_all()
+    solution = db.session.get(Solution, solution_id)
+    return solution.upvotes, solution.downvotes
+
+
+def test_buffered_votes_read_back_for_the_voter(client, buffered):
+    author, question_id, solution_id = _thread(client, "ryw")
+    voter = _auth_register_and_login(client, email="buffer_voter_ryw@example.com")
+
+    r = client.post(f"/solutions/{solution_id}/vote", headers=voter, json={"vote_type": "up"})
+    assert r.status_code == 202
+    assert r.get_json()["data"]["item"]["upvotes"] == 1
+    r = client.post(f"/solutions/{solution_id}/vote", headers=voter, json={"vote_type": "down"})
+    assert (r.get_json()["data"]["item"]["upvotes"], r.get_json()["data"]["item"]["downvotes"]) == (0, 1)
+    assert _counts(solution_id) == (0, 0)
+
+    mine = client.get(f"/solutions?ids={solution_id}", headers=voter).get_json()["data"][0]
+    assert (mine["my_vote"], mine["downvotes"], mine["votes"]) == (-1, 1, -1)
+    answer = _unwrap(client.get(f"/problems/{question_id}", headers=voter).get_json())["answers"][0]
+    assert (answer["my_vote"], answer["downvotes"]) == (-1, 1)
+    theirs = client.get(f"/solutions?ids={solution_id}", headers=author).get_json()["data"][0]
+    assert (theirs["my_vote"], theirs["downvotes"]) == (0, 0)
+
+    assert VoteBuffer.flush() == 1
+    assert _counts(solution_id) == (0, 1)
+    assert db.session.query(Vote).filter_by(solution_id=solution_id).one().vote_type == "down"
+    # After the flush the overlay has nothing left to add.
+    mine = client.get(f"/solutions?ids={solution_id}", headers=voter).get_json()["data"][0]
+    assert (mine["my_vote"], mine["downvotes"]) == (-1, 1)
+
+
+def test_flush_between_snapshot_and_read_keeps_the_vote(client, buffered, monkeypatch):
+    _, question_id, solution_id = _thread(client, "race")
+    voter = _auth_register_and_login(client, email="buffer_voter_race@example.com")
+    client.post(f"/solutions/{solution_id}/vote", headers=voter, json={"vote_type": "up"})
+
+    # The flush thread commits right after the voter's persisted vote is read.
+    my_votes = SolutionService._my_votes
+
+    def read_then_flush(solution_ids, user_id):
+        votes = my_votes(solution_ids, user_id)
+        flusher = threading.Thread(target=VoteBuffer.buffer()._flush_in_app)
+        flusher.start()
+        flusher.join()
+        return votes
+
+    monkeypatch.setattr(SolutionService, "_my_votes", staticmethod(read_then_flush))
+    mine = client.get(f"/solutions?ids={solution_id}", headers=voter).get_json()["data"][0]
+    assert (mine["my_vote"], mine["upvotes"]) == (1, 1)
+    assert _counts(solution_id) == (1, 0)
+
+
+def test_conditional_get_sees_the_voters_buffered_vote(client, buffered):
+    _, question_id, solution_id = _thread(client, "etag")
+    voter = _auth_register_and_login(client, email="buffer_voter_etag@example.com")
+    urls = [f"/problems/{question_id}", f"/problems/{question_id}/solutions"]
+    etags = [client.get(url, headers=voter).headers["ETag"] for url in urls]
+
+    assert client.post(f"/solutions/{solution_id}/vote", headers=voter, json={"vote_type": "up"}).status_code == 202
+    detail, listed = (client.get(url, headers={**voter, "If-None-Match": etag}) for url, etag in zip(urls, etags))
+    assert (detail.status_code, listed.status_code) == (200, 200)
+    assert _unwrap(detail.get_json())["answers"][0]["my_vote"] == 1
+    assert listed.get_json()["items"][0]["my_vote"] == 1
+
+
+def test_flush_batches_a_burst_into_constant_statements(client, buffered):
+    _, _, solution_id = _thread(client, "burst")
+    voters = [_auth_register_and_login(client, email=f"buffer_burst_{i}@example.com") for i in range(12)]
+    notifications = db.session.query(Notification).filter_by(type="vote").count()
+
+    def burst(crowd, vote_type):
+        for headers in crowd:
+            r = client.post(f"/solutions/{solution_id}/vote", headers=headers, json={"vote_type": vote_type})
+            assert r.status_code == 202
+        with _StatementCounter(db.engine) as counter:
+            VoteBuffer.flush()
+        return counter.count
+
+    small = burst(voters[:2], "up")
+    large = burst(voters[2:], "up")
+    assert small == large
+    assert _counts(solution_id) == (12, 0)
+    assert db.session.query(Notification).filter_by(type="vote").count() == notifications + 12
+
+    for headers in voters[:3]:
+        assert client.delete(f"/solutions/{solution_id}/vote", headers=headers).status_code == 202
+    VoteBuffer.flush()
+    assert _counts(solution_id) == (9, 0)
+    assert client.delete(f"/solutions/{solution_id}/vote", headers=voters[0]).status_code == 404
+
+
+def test_failed_batch_is_replayed_synchronously(client, buffered, monkeypatch):
+    _, _, solution_id = _thread(client, "replay")
+    voter = _auth_register_and_login(client, email="buffer_voter_replay@example.com")
+    client.post(f"/solutions/{solution_id}/vote", headers=voter, json={"vote_type": "up"})
+
+    def broken(batch):
+        raise RuntimeError("lost connection")
+
+    monkeypatch.setattr(VoteBuffer, "_write", staticmethod(broken))
+    assert VoteBuffer.flush() == 1
+    assert _counts(solution_id) == (1, 0)
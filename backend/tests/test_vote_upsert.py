@@ -0,0 +1,72 @@
+from app import db
+from app.models import Notification, Solution
+
+from conftest import _StatementCounter
+from test_problems_and_solutions import _auth_register_and_login, _create_problem
+
+
+def _thread(client, suffix):
+    author = _auth_register_and_login(client, email=f"upsert_author_{suffix}@example.com")
+    voter = _auth_register_and_login(client, email=f"upsert_voter_{suffix}@example.com")
+    question = _create_problem(client, author, title=f"Upsert question {suffix}")
+    r = client.post(f"/problems/{question['id']}/solutions", headers=author, json={"content": "Answer"})
+    return author, voter, r.get_json()["item"]["id"]
+
+
+def _vote(client, headers, solution_id, vote_type):
+    r = client.post(f"/solutions/{solution_id}/vote", headers=headers, json={"vote_type": vote_type})
+    assert r.status_code == 200, r.data
+    return r.get_json()["data"]
+
+
+def test_vote_returns_the_new_tally(client):
+    _, voter, solution_id = _thread(client, "tally")
+
+    payload = _vote(client, voter, solution_id, "up")
+    assert payload["message"] == "Vote recorded successfully"
+    assert payload["item"] == {
+        "id": solution_id, "solution_id": solution_id, "upvotes": 1, "downvotes": 0, "votes": 1, "my_vote": 1,
+    }
+
+    payload = _vote(client, voter, solution_id, "down")
+    assert payload["message"] == "Vote updated successfully"
+    assert (payload["item"]["upvotes"], payload["item"]["downvotes"], payload["item"]["my_vote"]) == (0, 1, -1)
+
+    payload = _vote(client, voter, solution_id, "down")
+    assert payload["message"] == "Vote unchanged"
+    assert (payload["item"]["upvotes"], payload["item"]["downvotes"]) == (0, 1)
+
+    removed = client.delete(f"/solutions/{solution_id}/vote", headers=voter).get_json()["data"]
+    assert (removed["item"]["downvotes"], removed["item"]["my_vote"]) == (0, 0)
+    assert client.delete(f"/solutions/{solution_id}/vote", headers=voter).status_code == 404
+
+    db.session.expunge_all()
+    solution = db.session.get(Solution, solution_id)
+    assert (solution.upvotes, solution.downvotes) == (0, 0)
+
+
+def test_upvote_notifies_without_loading_votes(client):
+    author, voter, solution_id = _thread(client, "fast")
+    for i in range(3):
+        _vote(client, _auth_register_and_login(client, email=f"upsert_crowd_{i}@example.com"), solution_id, "up")
+    before = db.session.query(Notification).filter_by(type="vote").count()
+
+    db.session.expunge_all()
+    with _StatementCounter(db.engine) as log:
+        payload = _vote(client, voter, solution_id, "up")
+
+    assert payload["item"]["upvotes"] == 4
+    assert not [s for s in log.statements if s.startswith("SELECT") and "FROM votes" in s]
+    writes = [s.split()[0] for s in log.statements if not s.startswith("SELECT")]
+    # Vote upsert, solution and question counters, notification, recipient's unread counter.
+    assert writes == ["INSERT", "UPDATE", "UPDATE", "INSERT", "UPDATE"], log.statements
+    # The question author also wrote the solution, so only one notification.
+    assert db.session.query(Notification).filter_by(type="vote").count() == before + 1
+
+
+def test_vote_validation_and_missing_solution(client):
+    _, voter, solution_id = _thread(client, "errors")
+    r = client.post(f"/solutions/{solution_id}/vote", headers=voter, json={"vote_type": "sideways"})
+    assert r.status_code == 400
+    r = client.post("/solutions/999999/vote", headers=voter, json={"vote_type": "up"})
+    assert r.status_code == 404
@@ -18,6 +18,7 @@ export function AskQuestionDialog({ currentUser }) {
   const [loadingTags, setLoadingTags] = useState(false);
   const [posting, setPosting] = useState(false);
   const [error, setError] = useState("");
+  const [duplicates, setDuplicates] = useState([]);
   const navigate = useNavigate();
 
   useEffect(() => {
@@ -51,9 +52,33 @@ export function AskQuestionDialog({ currentUser }) {
       setType("technical");
       setSelectedTagIds([]);
       setError("");
+      setDuplicates([]);
     }
   }, [open]);
 
+  useEffect(() => {
+    if (!open || title.trim().length < 10) {
+      setDuplicates([]);
+      return;
+    }
+    let active = true;
+    const timer = setTimeout(() => {
+      problemsApi
+        .duplicates({ title: title.trim(), description: description.trim() })
+        .then((items) => {
+          if (active) setDuplicates(items);
+        })
+        .catch(() => {
+          if (active) setDuplicates([]);
+        });
+    }, 400);
+
+    return () => {
+      active = false;
+      clearTimeout(timer);
+    };
+  }, [open, title, description]);
+
   const toggleTag = (tagId) => {
     setSelectedTagIds((prev) =>
       prev.includes(tagId)
@@ -113,6 +138,25 @@ export function AskQuestionDialog({ currentUser }) {
             <label className="block text-sm font-medium mb-1">Title</label>
             <Input placeholder="Brief, descriptive title" value={title} onChange={(e) => setTitle(e.target.value)} required />
           </div>
+          {duplicates.length > 0 && (
+            <div className="rounded border border-amber-300 bg-amber-50 p-2 text-sm">
+              <div className="font-medium text-amber-800 mb-1">This may already have been asked:</div>
+              <ul className="space-y-1">
+                {duplicates.map((question) => (
+                  <li key={question.id}>
+                    <a
+                      href={`/questions/${question.id}`}
+                      target="_blank"
+                      rel="noreferrer"
+                      className="text-amber-900 underline hover:no-underline"
+                    >
+                      {question.title}
+                    </a>
+                  </li>
+                ))}
+              </ul>
+            </div>
+          )}
           <div>
             <label className="block text-sm font-medium mb-1">Description</label>
             <Textarea
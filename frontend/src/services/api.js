@@ -116,14 +116,28 @@ export const authApi = {
 };
 
 export const problemsApi = {
-  list: ({ page = 1, per_page = 10, problem_type, search, sort } = {}) =>
+  list: ({ page = 1, per_page = 10, problem_type, search, sort, cursor, tags, tag_match } = {}) =>
     api
-      .get("/problems", { params: { page, per_page, problem_type, search, sort } })
+      .get("/problems", {
+        params: {
+          page,
+          per_page,
+          problem_type,
+          search,
+          sort,
+          cursor,
+          tags: Array.isArray(tags) ? tags.join(",") : tags,
+          tag_match,
+        },
+      })
       .then((r) => r.data),
 
   get: (id) =>
     api.get(`/problems/${id}`).then((r) => r.data?.item ?? r.data),
 
+  getMany: (ids) =>
+    api.get("/problems", { params: { ids: ids.join(",") } }).then((r) => r.data),
+
   create: ({ title, description, problem_type, tag_ids = [] }) =>
     api
       .post("/problems", { title, description, problem_type, tag_ids })
@@ -135,12 +149,28 @@ export const problemsApi = {
       .then((r) => r.data?.item ?? r.data),
 
   delete: (id) => api.delete(`/problems/${id}`).then((r) => r.data),
+
+  similar: (id, { limit = 5 } = {}) =>
+    api.get(`/problems/${id}/similar`, { params: { limit } }).then((r) => r.data?.items ?? []),
+
+  similarToDraft: ({ title, description, limit = 5 } = {}) =>
+    api
+      .get("/problems/similar", { params: { title, description, limit } })
+      .then((r) => r.data?.items ?? []),
+
+  duplicates: ({ title, description, limit = 5 } = {}) =>
+    api
+      .post("/problems/duplicates", { title, description, limit })
+      .then((r) => r.data?.items ?? []),
 };
 
 export const solutionsApi = {
-  list: (problemId, { page = 1, per_page = 10 } = {}) =>
+  getMany: (ids) =>
+    api.get("/solutions", { params: { ids: ids.join(",") } }).then((r) => r.data),
+
+  list: (problemId, { page = 1, per_page = 10, sort, cursor } = {}) =>
     api
-      .get(`/problems/${problemId}/solutions`, { params: { page, per_page } })
+      .get(`/problems/${problemId}/solutions`, { params: { page, per_page, sort, cursor } })
       .then((r) => r.data),
 
   get: (problemId, solutionId) =>
@@ -199,6 +229,11 @@ export const tagsApi = {
     api.get("/tags", { params: { q, page, per_page } }).then((r) => r.data),
 
   create: (name) => api.post("/tags", { name }).then((r) => r.data),
+
+  questions: (name, { cursor, per_page = 20 } = {}) =>
+    api
+      .get(`/tags/${encodeURIComponent(name)}/questions`, { params: { cursor, per_page } })
+      .then((r) => r.data),
 };
 
 export const profileApi = {